@@ -0,0 +1,88 @@
+"""Async variants of the sync API routers (enabled with ASYNC_ROUTES). Experimental.
+
+Each endpoint that depends on `get_session` or `get_read_session` is re-registered as an
+`async def` that receives an AsyncSession (aiosqlite) instead, read-only
+(`query_only`) for `get_read_session`, and runs the
+original endpoint through `AsyncSession.run_sync`.
+
+Only the sqlite calls leave the event loop. Everything else in the sync
+endpoint (services, serialization, catalog version polls, upload reads) runs
+on the loop thread, so requests are effectively handled one at a time: the
+`async` benchmark suite shows lower throughput and a higher p99 than the
+default threadpool mode under load. Kept as a base for moving hot read paths
+to native async queries; do not enable it for capacity.
+"""
+
+import inspect
+import logging
+from typing import Callable, Optional, Tuple
+from fastapi import APIRouter, Depends
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.db import get_session, get_read_session, get_async_session, get_async_read_session
+
+logger = logging.getLogger(__name__)
+
+# Sync session dependency -> the async one that replaces it
+SYNC_SESSION_DEPENDENCIES = {get_session: get_async_session, get_read_session: get_async_read_session}
+
+
+def _session_param(endpoint) -> Tuple[str, Optional[Callable]]:
+    """Name of the endpoint's session parameter and its async dependency."""
+    for name, param in inspect.signature(endpoint).parameters.items():
+        if isinstance(param.default, DependsParam) and param.default.dependency in SYNC_SESSION_DEPENDENCIES:
+            return name, SYNC_SESSION_DEPENDENCIES[param.default.dependency]
+    return "", None
+
+
+def _to_async_endpoint(endpoint):
+    """Wrap a sync endpoint so it runs on an AsyncSession via run_sync."""
+    session_name, async_dependency = _session_param(endpoint)
+    if not session_name:
+        return endpoint
+
+    signature = inspect.signature(endpoint)
+    parameters = [
+        p.replace(default=Depends(async_dependency), annotation=AsyncSession) if p.name == session_name else p
+        for p in signature.parameters.values()
+    ]
+
+    async def async_endpoint(**kwargs):
+        async_session: AsyncSession = kwargs.pop(session_name)
+        return await async_session.run_sync(lambda session: endpoint(**kwargs, **{session_name: session}))
+
+    async_endpoint.__name__ = endpoint.__name__
+    async_endpoint.__doc__ = endpoint.__doc__
+    async_endpoint.__signature__ = signature.replace(parameters=parameters)
+    return async_endpoint
+
+
+def warn_experimental() -> None:
+    logger.warning("ASYNC_ROUTES is experimental: sync endpoints run on the event loop and throughput is lower than the threadpool mode")
+
+
+def to_async_router(router: APIRouter) -> APIRouter:
+    """Build a router with the same routes served by async endpoints (experimental, see module docstring)."""
+    async_router = APIRouter()
+
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+
+        async_router.add_api_route(
+            route.path,
+            _to_async_endpoint(route.endpoint),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            summary=route.summary,
+            description=route.description,
+            name=route.name,
+            responses=route.responses,
+            response_class=route.response_class,
+        )
+
+    return async_router
@@ -0,0 +1,110 @@
+"""Conditional GET support driven by catalog version stamps.
+
+The ETag is derived from in-memory version counters only, so a request whose
+`If-None-Match` still matches is answered with 304 before touching the DB.
+Stamps are read before the response is built; a write racing with the build
+can only make the ETag older than the body, never newer.
+"""
+
+import hashlib
+from typing import List, Optional
+from fastapi import Request, Response, status
+from app.core import catalog_version
+from app.repositories import count_repository
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version components."""
+    return '"' + "-".join([catalog_version.BOOT_ID, *(str(p) for p in parts)]) + '"'
+
+
+def _filters_digest(signature) -> str:
+    """Short stable digest of a listing filter signature."""
+    return hashlib.sha1(repr(signature).encode()).hexdigest()[:12]
+
+
+def _matches(if_none_match: str, etag: str, wildcard: bool) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (wildcard and candidate == "*") or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, etag: str, wildcard: bool = True) -> Optional[Response]:
+    """
+    Set the ETag on the response and return a 304 response if the client
+    already has this version, else None.
+
+    Single-item routes check before loading the item, so they pass
+    `wildcard=False`: `If-None-Match: *` only matches a representation that
+    exists, and is answered by `exists_not_modified` once the item is loaded.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match and _matches(if_none_match, etag, wildcard):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def exists_not_modified(request: Request, response: Response) -> Optional[Response]:
+    """After `not_modified(..., wildcard=False)` and a successful load: a 304 for `If-None-Match: *`, else None."""
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match and any(candidate.strip() == "*" for candidate in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
+
+
+def resource_etag(resource_id) -> str:
+    return make_etag("r", resource_id.hex, catalog_version.item_version(catalog_version.RESOURCES, resource_id))
+
+
+def track_etag(track_id) -> str:
+    return make_etag("t", track_id.hex, catalog_version.item_version(catalog_version.TRACKS, track_id))
+
+
+def track_details_etag(track_id) -> str:
+    # Details embed member resources, so any resource write invalidates them
+    return make_etag(
+        "td", track_id.hex,
+        catalog_version.item_version(catalog_version.TRACKS, track_id),
+        catalog_version.current(catalog_version.RESOURCES),
+    )
+
+
+def track_names_etag() -> str:
+    # Names take no filters: the body is the whole collection
+    return make_etag("tn", catalog_version.current(catalog_version.TRACKS))
+
+
+def resource_facets_etag(
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> str:
+    # Facets cover the whole filtered set, so any resource write invalidates them
+    signature = count_repository.filter_signature(
+        catalog_version.RESOURCES, search, skill=skill, level=level, resource_type=resource_type
+    )
+    return make_etag("rf", _filters_digest((signature, skill_limit)), catalog_version.current(catalog_version.RESOURCES))
+
+
+def track_facets_etag(
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> str:
+    signature = count_repository.filter_signature(catalog_version.TRACKS, search, skill=skill, level=level)
+    return make_etag("tf", _filters_digest((signature, skill_limit)), catalog_version.current(catalog_version.TRACKS))
+
+
+def skills_etag(query: str, limit: int, offset: int) -> str:
+    # Typeahead results depend only on the skill names, so only skill inserts invalidate them
+    return make_etag("s", _filters_digest((query, limit, offset)), catalog_version.current(catalog_version.SKILLS))
@@ -0,0 +1,26 @@
+"""Change feed API routes."""
+
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.services import change_service
+
+router = APIRouter(prefix="/api/changes", tags=["changes"])
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+def list_changes(
+    since: Optional[str] = Query(None, description="Token from a previous feed; omit to get the current token only"),
+    collection: Optional[List[Literal["resources", "tracks", "skills"]]] = Query(None),
+    limit: int = Query(10000, ge=1, le=100000, description="Maximum number of changed items per response")
+):
+    """Stream the catalog items changed since a token as NDJSON, ending with the next token."""
+    return StreamingResponse(
+        change_service.stream_changes(since, collection, limit),
+        media_type="application/x-ndjson",
+    )
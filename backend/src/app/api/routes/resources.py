@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from uuid import UUID
-from typing import List, Optional
-from app.core.db import get_session
+from typing import List, Literal, Optional
+from app.api import etag
+from app.core.db import get_session, get_read_session
 from app.schemas.resource import ResourceCreate, ResourceRead, ResourceUpdate, ResourceLookupResponse
-from app.schemas.resource_list import ResourceListResponse
-from app.services import resource_service
+from app.schemas.resource_list import ResourceListPage, ResourceListResponse, resource_list_adapter
+from app.schemas.resource_import import ResourceImportResponse
+from app.schemas.facet import ResourceFacetsResponse
+from app.services import export_service, resource_service, resource_import_service
 
 router = APIRouter(prefix="/api/resources", tags=["resources"])
 
 
+def _list_response(page: ResourceListPage) -> Response:
+    # Rows are built from typed DB columns; serialize without re-validating them
+    return Response(content=resource_list_adapter.dump_json(page), media_type="application/json")
+
+
+def _total_pages(total: Optional[int], page_size: int) -> Optional[int]:
+    return None if total is None else (total + page_size - 1) // page_size
+
+
 @router.post(
     "/",
     response_model=ResourceRead,
@@ -25,21 +38,60 @@ def create_resource(
     return resource
 
 
+@router.post(
+    "/import",
+    response_model=ResourceImportResponse,
+    status_code=status.HTTP_200_OK
+)
+def import_resources(
+    file: UploadFile = File(..., description="NDJSON, one resource object per line"),
+    session: Session = Depends(get_session)
+):
+    """Bulk import learning resources; per-line errors are reported in the response."""
+    return resource_import_service.import_resources(file.file, session)
+
+
 @router.get(
     "/",
     response_model=ResourceListResponse,
     status_code=status.HTTP_200_OK
 )
 def list_resources(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     search: Optional[str] = Query(None),
     skill: Optional[List[str]] = Query(None),
     level: Optional[List[str]] = Query(None),
     resource_type: Optional[List[str]] = Query(None),
     page: int = Query(1, ge=1),
-    page_size: int = Query(12, ge=1, le=100)
+    page_size: int = Query(12, ge=1, le=100),
+    highlight: bool = Query(False, description="Include highlighted search snippets"),
+    cursor: Optional[str] = Query(None, description="Opt into cursor pagination; empty for the first page"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute the total count")
 ):
     """List learning resources with filtering and pagination."""
+    if cursor is not None:
+        resources, total, next_cursor, prev_cursor = resource_service.list_resources_keyset(
+            session=session,
+            search=search,
+            skill=skill,
+            level=level,
+            resource_type=resource_type,
+            cursor=cursor,
+            page_size=page_size,
+            highlight=highlight,
+            count=count
+        )
+
+        return _list_response({
+            "items": resources,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": _total_pages(total, page_size),
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        })
+
     # Get filtered and paginated resources with total count
     resources, total = resource_service.list_resources(
         session=session,
@@ -48,15 +100,76 @@ def list_resources(
         level=level,
         resource_type=resource_type,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        highlight=highlight,
+        count=count
     )
     
-    return ResourceListResponse(
-        items=resources,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size
+    return _list_response({
+        "items": resources,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": _total_pages(total, page_size),
+        "next_cursor": None,
+        "prev_cursor": None,
+    })
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+def export_resources(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    search: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None),
+    level: Optional[List[str]] = Query(None),
+    resource_type: Optional[List[str]] = Query(None)
+):
+    """Stream the resource catalog (optionally filtered) as NDJSON or CSV."""
+    body = export_service.export_resources(
+        format,
+        search=search,
+        skill=skill,
+        level=level,
+        resource_type=resource_type
+    )
+    return StreamingResponse(
+        body,
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="resources.{format}"'},
+    )
+
+
+@router.get(
+    "/facets",
+    response_model=ResourceFacetsResponse,
+    status_code=status.HTTP_200_OK
+)
+def get_resource_facets(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    search: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None),
+    level: Optional[List[str]] = Query(None),
+    resource_type: Optional[List[str]] = Query(None),
+    skill_limit: int = Query(50, ge=1, le=500, description="Number of top skills to return")
+):
+    """Count the filtered resources per skill, level and resource type (filter sidebar)."""
+    cached = etag.not_modified(request, response, etag.resource_facets_etag(search, skill, level, resource_type, skill_limit))
+    if cached:
+        return cached
+
+    return resource_service.get_facets(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        resource_type=resource_type,
+        skill_limit=skill_limit
     )
 
 
@@ -67,7 +180,7 @@ def list_resources(
 )
 def lookup_resource(
     url: str = Query(..., description="URL to lookup for duplicate resources"),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """Lookup a resource by URL to check for duplicates."""
     return resource_service.lookup_resource_by_url(url, session)
@@ -80,12 +193,18 @@ def lookup_resource(
 )
 def get_resource(
     resource_id: UUID,
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session)
 ):
     """Get a learning resource by ID."""
+    cached = etag.not_modified(request, response, etag.resource_etag(resource_id), wildcard=False)
+    if cached:
+        return cached
+
     resource = resource_service.get_resource(resource_id, session)
     
-    return resource
+    return etag.exists_not_modified(request, response) or resource
 
 
 @router.patch(
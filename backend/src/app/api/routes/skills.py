@@ -1,11 +1,12 @@
 """Skills API routes."""
 
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Request, Response
 from typing import List
 from sqlmodel import Session
 
+from app.api import etag
 from app.repositories import skill_repository
-from app.core.db import get_session
+from app.core.db import get_read_session
 
 
 router = APIRouter(prefix="/api/skills", tags=["skills"])
@@ -13,14 +14,20 @@ router = APIRouter(prefix="/api/skills", tags=["skills"])
 
 @router.get("/", response_model=List[str])
 def search_skills(
+    request: Request,
+    response: Response,
     query: str = Query("", description="Search query for skills (empty returns all)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ) -> List[str]:
     """
     Search for skills by name with typeahead functionality.
     Empty query returns top skills (alphabetically).
     """
+    cached = etag.not_modified(request, response, etag.skills_etag(query, limit, offset))
+    if cached:
+        return cached
+
     skills = skill_repository.search_skills(session, query, limit, offset)
     return [s.name for s in skills]
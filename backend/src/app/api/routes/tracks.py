@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from uuid import UUID
-from typing import List, Optional
-from app.core.db import get_session
+from typing import List, Literal, Optional
+from app.api import etag
+from app.core.db import get_session, get_read_session
 from app.schemas.track import TrackCreate, TrackRead, TrackReadWithResources, TrackUpdate, TrackNameItem
-from app.schemas.track_list import TrackListResponse
-from app.services import track_service
+from app.schemas.track_list import TrackListPage, TrackListResponse, track_list_adapter
+from app.schemas.facet import TrackFacetsResponse
+from app.services import export_service, track_service, track_document_service
 
 router = APIRouter(prefix="/api/tracks", tags=["tracks"])
 
 
+def _list_response(page: TrackListPage) -> Response:
+    # Rows are built from typed DB columns; serialize without re-validating them
+    return Response(content=track_list_adapter.dump_json(page), media_type="application/json")
+
+
+def _total_pages(total: Optional[int], page_size: int) -> Optional[int]:
+    return None if total is None else (total + page_size - 1) // page_size
+
+
 @router.post(
     "/",
     response_model=TrackRead,
@@ -31,29 +43,111 @@ def create_track(
     status_code=status.HTTP_200_OK
 )
 def list_tracks(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     search: Optional[str] = Query(None),
     skill: Optional[List[str]] = Query(None),
     level: Optional[List[str]] = Query(None),
     page: int = Query(1, ge=1),
-    page_size: int = Query(12, ge=1, le=100)
+    page_size: int = Query(12, ge=1, le=100),
+    highlight: bool = Query(False, description="Include highlighted search snippets"),
+    cursor: Optional[str] = Query(None, description="Opt into cursor pagination; empty for the first page"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute the total count")
 ):
     """List learning tracks with filtering and pagination."""
+    if cursor is not None:
+        tracks, total, next_cursor, prev_cursor = track_service.list_tracks_keyset(
+            session=session,
+            search=search,
+            skill=skill,
+            level=level,
+            cursor=cursor,
+            page_size=page_size,
+            highlight=highlight,
+            count=count
+        )
+
+        return _list_response({
+            "items": tracks,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": _total_pages(total, page_size),
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        })
+
     tracks, total = track_service.list_tracks(
         session=session,
         search=search,
         skill=skill,
         level=level,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        highlight=highlight,
+        count=count
     )
     
-    return TrackListResponse(
-        items=tracks,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size
+    return _list_response({
+        "items": tracks,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": _total_pages(total, page_size),
+        "next_cursor": None,
+        "prev_cursor": None,
+    })
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK
+)
+def export_tracks(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    search: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None),
+    level: Optional[List[str]] = Query(None)
+):
+    """Stream the track catalog (optionally filtered) as NDJSON or CSV."""
+    body = export_service.export_tracks(
+        format,
+        search=search,
+        skill=skill,
+        level=level
+    )
+    return StreamingResponse(
+        body,
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tracks.{format}"'},
+    )
+
+
+@router.get(
+    "/facets",
+    response_model=TrackFacetsResponse,
+    status_code=status.HTTP_200_OK
+)
+def get_track_facets(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    search: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None),
+    level: Optional[List[str]] = Query(None),
+    skill_limit: int = Query(50, ge=1, le=500, description="Number of top skills to return")
+):
+    """Count the filtered tracks per skill and level (filter sidebar)."""
+    cached = etag.not_modified(request, response, etag.track_facets_etag(search, skill, level, skill_limit))
+    if cached:
+        return cached
+
+    return track_service.get_facets(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        skill_limit=skill_limit
     )
 
 
@@ -63,9 +157,15 @@ def list_tracks(
     status_code=status.HTTP_200_OK
 )
 def list_track_names(
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session)
 ):
     """Get all tracks with just id and title (for dropdowns/autocomplete)."""
+    cached = etag.not_modified(request, response, etag.track_names_etag())
+    if cached:
+        return cached
+
     track_names = track_service.get_tracks_names(session)
     
     return track_names
@@ -77,12 +177,18 @@ def list_track_names(
 )
 def get_track(
     track_id: UUID,
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session)
 ):
     """Get a learning track by ID."""
+    cached = etag.not_modified(request, response, etag.track_etag(track_id), wildcard=False)
+    if cached:
+        return cached
+
     track = track_service.get_track(track_id, session)
     
-    return track
+    return etag.exists_not_modified(request, response) or track
 
 
 @router.get(
@@ -92,12 +198,24 @@ def get_track(
 )
 def get_track_with_resources(
     track_id: UUID,
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session)
 ):
     """Get a learning track with full details including resources."""
+    cached = etag.not_modified(request, response, etag.track_details_etag(track_id), wildcard=False)
+    if cached:
+        return cached
+
+    document = track_document_service.get_document(track_id, session)
+    if document is not None:
+        return etag.exists_not_modified(request, response) or Response(
+            content=document, media_type="application/json", headers=dict(response.headers)
+        )
+
     track = track_service.get_track_with_resources(track_id, session)
     
-    return track
+    return etag.exists_not_modified(request, response) or track
 
 
 @router.patch(
@@ -111,10 +229,6 @@ def update_track(
     session: Session = Depends(get_session)
 ):
     """Update a learning track."""
-    # Note: update_track service function needs to be implemented
-    # track = track_service.update_track(track_id, data, session)
-    # return track
+    track = track_service.update_track(track_id, data, session)
     
-    # Placeholder - return existing track for now
-    track = track_service.get_track(track_id, session)
     return track
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Admission control: per-route-class concurrency budgets with bounded queues.
+
+Expensive requests (free-text listing and facet searches, track details, streaming
+exports, writes) each get a class with a concurrency limit
+and a bounded FIFO queue. A request over the limit waits in its class's
+queue for at most `ADMISSION_QUEUE_TIMEOUT_SECONDS`; when the queue is full,
+or the deadline passes, it is rejected at once with 503 and `Retry-After`
+instead of piling onto the threadpool. Cheap routes (the default class,
+unlimited unless configured) and /health are never held up behind them.
+Change-feed polls are short and frequent, so they have their own class
+rather than queueing behind long exports.
+
+Slots are held until the response has been fully sent, so streams count
+for their whole duration. Every decision is counted per class (see
+`snapshot()`, served at /health/admission) and reported per request in a
+`Server-Timing` entry with the time spent queued.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Optional
+from urllib.parse import parse_qs
+from app.core.config import get_settings
+
+SEARCH = "search"
+DETAILS = "details"
+STREAM = "stream"
+FEED = "feed"
+WRITE = "write"
+DEFAULT = "default"
+
+QUEUE_FULL = "queue_full"
+DEADLINE = "deadline"
+
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# Listings and facets both run the FTS/LIKE scan when given `search`
+_SEARCHABLE = {"/api/resources/", "/api/tracks/", "/api/resources/facets", "/api/tracks/facets"}
+_STREAMS = {"/api/resources/export", "/api/tracks/export"}
+_FEEDS = {"/api/changes/"}
+_EXEMPT = {"/health", "/health/admission"}
+
+
+def classify(method: str, path: str, query_string: bytes) -> Optional[str]:
+    """Route class of a request (None for routes that are never limited)."""
+    if path in _EXEMPT:
+        return None
+    if method in _WRITE_METHODS:
+        return WRITE
+    if path in _STREAMS:
+        return STREAM
+    if path in _FEEDS:
+        return FEED
+    if path.startswith("/api/tracks/") and path.endswith("/details"):
+        return DETAILS
+    if path in _SEARCHABLE and any(parse_qs(query_string.decode("latin-1")).get("search", [])):
+        return SEARCH
+    return DEFAULT
+
+
+@dataclass
+class BudgetStats:
+    """Counters for one route class."""
+    admitted: int = 0  # Admitted without waiting
+    queued: int = 0  # Admitted after waiting in the queue
+    rejected_queue_full: int = 0
+    rejected_deadline: int = 0
+    active: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class Budget:
+    """Concurrency slots plus a bounded FIFO of waiters for one route class (limit 0 = unlimited)."""
+
+    def __init__(self, limit: int, queue_size: int):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.stats = BudgetStats()
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """Take a slot; returns None once admitted, else the rejection reason."""
+        stats = self.stats
+        if not self.limit or (stats.active < self.limit and not self._waiters):
+            stats.active += 1
+            stats.admitted += 1
+            return None
+        if len(self._waiters) >= self.queue_size:
+            stats.rejected_queue_full += 1
+            return QUEUE_FULL
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        stats.waiting = len(self._waiters)
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            stats.rejected_deadline += 1
+            return DEADLINE
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over as the request went away
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            stats.waiting = len(self._waiters)
+            waited = time.perf_counter() - started
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+        stats.queued += 1
+        return None
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the oldest live waiter if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot changes hands; active is unchanged
+                self.stats.waiting = len(self._waiters)
+                return
+        self.stats.active -= 1
+
+
+def _budgets_from_settings() -> Dict[str, Budget]:
+    settings = get_settings()
+    return {
+        SEARCH: Budget(settings.ADMISSION_SEARCH_LIMIT, settings.ADMISSION_SEARCH_QUEUE),
+        DETAILS: Budget(settings.ADMISSION_DETAILS_LIMIT, settings.ADMISSION_DETAILS_QUEUE),
+        STREAM: Budget(settings.ADMISSION_STREAM_LIMIT, settings.ADMISSION_STREAM_QUEUE),
+        FEED: Budget(settings.ADMISSION_FEED_LIMIT, settings.ADMISSION_FEED_QUEUE),
+        WRITE: Budget(settings.ADMISSION_WRITE_LIMIT, settings.ADMISSION_WRITE_QUEUE),
+        DEFAULT: Budget(settings.ADMISSION_DEFAULT_LIMIT, settings.ADMISSION_DEFAULT_QUEUE),
+    }
+
+
+budgets = _budgets_from_settings()
+
+
+def snapshot() -> Dict[str, Dict]:
+    """Current counters and limits per route class."""
+    return {
+        name: {"limit": budget.limit, "queue_size": budget.queue_size, **asdict(budget.stats)}
+        for name, budget in budgets.items()
+    }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that admits, queues or sheds each HTTP request by route class."""
+
+    def __init__(self, app, queue_timeout_seconds: float = 2.0, retry_after_seconds: int = 1):
+        self.app = app
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+    async def __call__(self, scope, receive, send):
+        route_class = classify(scope["method"], scope["path"], scope.get("query_string", b"")) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        budget = budgets[route_class]
+        started = time.perf_counter()
+        rejected = await budget.acquire(self.queue_timeout_seconds)
+        timing = f'admission;dur={(time.perf_counter() - started) * 1000:.2f};desc="{route_class}"'
+
+        if rejected:
+            await self._reject(send, f'{timing}, admission-rejected;desc="{rejected}"')
+            return
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            budget.release()
+
+    async def _reject(self, send, timing: str) -> None:
+        body = json.dumps({"detail": "Server is busy, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after_seconds).encode()),
+                (b"server-timing", timing.encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
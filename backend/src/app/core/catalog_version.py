@@ -0,0 +1,261 @@
+"""In-process version counters for catalog collections and their items.
+
+Repositories call `mark_changed(session, ...)` / `mark_item_changed(...)` when
+they write. The counters are bumped only once the session commits, so a cache
+entry computed from uncommitted data can never look fresh. Caches store the
+version they were built against and treat any other version as stale.
+
+An item's version is a per-collection stamp taken by the commit that last
+touched it, so item versions are unique within a collection and never go
+backwards. Writes that change only an item's own body, not anything
+listings, counts or facets are computed from (e.g. provider metadata), use
+`mark_item_touched`: the item gets a new stamp but the collection version,
+which those caches key on, stays put.
+
+Several worker processes can serve the same database, so the counters are
+also kept coherent across processes: every committing session appends its
+changes to the `catalog_changes` log in the same transaction, and `sync()`
+(run before any version is read) polls `PRAGMA data_version` on a private
+connection. Only when another connection has committed does it read the
+new log rows; changes from other processes bump the same counters, and
+subscribers (e.g. the skill index) refresh just the affected items.
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from sqlalchemy import event, insert
+from sqlalchemy.engine import make_url
+from sqlmodel import Session
+from app.core.config import get_settings
+from app.models.catalog_change import CatalogChange
+from app.utils.model_helpers import as_uuid
+
+RESOURCES = "resources"
+TRACKS = "tracks"
+SKILLS = "skills"
+
+_PENDING_KEY = "catalog_changed"
+_PENDING_ITEMS_KEY = "catalog_items_changed"
+_PENDING_CREATED_KEY = "catalog_items_created"
+_PENDING_TOUCHED_KEY = "catalog_items_touched"
+
+# Distinguishes version numbers issued by this process from earlier runs
+BOOT_ID = uuid.uuid4().hex[:8]
+
+_lock = threading.Lock()
+_versions: Dict[str, int] = {RESOURCES: 0, TRACKS: 0, SKILLS: 0}
+_stamps: Dict[str, int] = {RESOURCES: 0, TRACKS: 0, SKILLS: 0}  # Last item version issued per collection
+_item_versions: Dict[Tuple[str, uuid.UUID], int] = {}
+
+
+def current(collection: str) -> int:
+    """Get the committed version of a collection."""
+    sync()
+    return _versions[collection]
+
+
+def item_version(collection: str, item_id: Union[uuid.UUID, str]) -> int:
+    """Get the committed version of one item (0 if untouched since startup)."""
+    sync()
+    return _item_versions.get((collection, as_uuid(item_id)), 0)
+
+
+def bump(
+    *collections: str,
+    items: Tuple[Tuple[str, uuid.UUID], ...] = (),
+    touched: Tuple[Tuple[str, uuid.UUID], ...] = ()
+) -> None:
+    """
+    Advance the version of the given collections and stamp changed items;
+    `items` also advance their collection, `touched` items only get a stamp.
+    """
+    with _lock:
+        for c in set(collections) | {c for c, _ in items}:
+            _versions[c] += 1
+        for c in {c for c, _ in items} | {c for c, _ in touched}:
+            _stamps[c] += 1
+        for key in (*items, *touched):
+            _item_versions[key] = _stamps[key[0]]
+
+
+def mark_changed(session: Session, *collections: str) -> None:
+    """Record that the session wrote to these collections (applied on commit)."""
+    session.info.setdefault(_PENDING_KEY, set()).update(collections)
+
+
+def mark_item_changed(session: Session, collection: str, item_id: Union[uuid.UUID, str]) -> None:
+    """Record that the session wrote to one item of a collection (applied on commit)."""
+    session.info.setdefault(_PENDING_ITEMS_KEY, set()).add((collection, as_uuid(item_id)))
+
+
+def mark_item_touched(session: Session, collection: str, item_id: Union[uuid.UUID, str]) -> None:
+    """
+    Record a write to an item's own body only (applied on commit): the item
+    gets a new version, the collection version does not move.
+    """
+    session.info.setdefault(_PENDING_TOUCHED_KEY, set()).add((collection, as_uuid(item_id)))
+
+
+def mark_items_created(session: Session, collection: str, item_ids: Iterable[Union[uuid.UUID, str]]) -> None:
+    """
+    Record items the session inserted (applied on commit). The collection
+    changes, but no process can hold a version of the new items, so they are
+    only written to the change log, not stamped.
+    """
+    mark_changed(session, collection)
+    session.info.setdefault(_PENDING_CREATED_KEY, set()).update((collection, as_uuid(i)) for i in item_ids)
+
+
+def pending_items(session: Session) -> Set[Tuple[str, uuid.UUID]]:
+    """Get the (collection, id) items this session has changed but not committed."""
+    return set(session.info.get(_PENDING_ITEMS_KEY, ()))
+
+
+@event.listens_for(Session, "before_commit")
+def _log_pending(session) -> None:
+    """Append the session's changes to catalog_changes inside the committing transaction."""
+    collections = session.info.get(_PENDING_KEY, ())
+    items = session.info.get(_PENDING_ITEMS_KEY, set()) | session.info.get(_PENDING_CREATED_KEY, set())
+    touched = session.info.get(_PENDING_TOUCHED_KEY, set()) - items
+    # Always written, whether or not this process follows other processes: /api/changes reads it too
+    if not (collections or items or touched):
+        return
+
+    # Item rows already advance their collection elsewhere; a collection-wide row is only needed without them
+    with_items = {c for c, _ in items}
+    rows = [{"collection": c, "item_id": None, "item_only": False} for c in sorted(collections) if c not in with_items]
+    rows += [{"collection": c, "item_id": item_id, "item_only": False} for c, item_id in sorted(items, key=str)]
+    rows += [{"collection": c, "item_id": item_id, "item_only": True} for c, item_id in sorted(touched, key=str)]
+    now = datetime.utcnow()
+    session.execute(insert(CatalogChange.__table__), [{**row, "origin": BOOT_ID, "created_at": now} for row in rows])
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    items = session.info.pop(_PENDING_ITEMS_KEY, None) or set()
+    touched = session.info.pop(_PENDING_TOUCHED_KEY, None) or set()
+    session.info.pop(_PENDING_CREATED_KEY, None)
+    if pending or items or touched:
+        bump(*(pending or ()), items=tuple(items), touched=tuple(touched - items))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_PENDING_ITEMS_KEY, None)
+    session.info.pop(_PENDING_CREATED_KEY, None)
+    session.info.pop(_PENDING_TOUCHED_KEY, None)
+
+
+# Called with (watcher connection, collection, item ids or None for collection-wide) per foreign change
+Subscriber = Callable[[sqlite3.Connection, str, Optional[Set[uuid.UUID]]], None]
+
+
+class _Watcher:
+    """Polls the database for commits made by other processes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._last_seq = 0
+        self._next_poll = 0.0
+        self._subscribers: List[Subscriber] = []
+        self.enabled = False
+
+    def start(self, database_url: str) -> None:
+        """Begin following the log from its current end (file databases only)."""
+        path = make_url(database_url).database
+        if not get_settings().CATALOG_SYNC_ENABLED or not path or path == ":memory:":
+            return
+        with self._lock:
+            self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            self._last_seq = self._connection.execute("SELECT coalesce(max(seq), 0) FROM catalog_changes").fetchone()[0]
+            self.enabled = True
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+            self.enabled = False
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def poll(self) -> None:
+        if not self.enabled:
+            return
+        interval = get_settings().CATALOG_SYNC_INTERVAL_SECONDS
+        with self._lock:
+            if self._connection is None:
+                return
+            if interval:
+                now = time.monotonic()
+                if now < self._next_poll:
+                    return
+                self._next_poll = now + interval
+
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+
+            rows = self._connection.execute(
+                "SELECT seq, collection, item_id, item_only, origin FROM catalog_changes WHERE seq > ? ORDER BY seq",
+                (self._last_seq,),
+            ).fetchall()
+            if rows:
+                self._last_seq = rows[-1][0]
+
+            # Own changes were applied when their session committed
+            wide: Set[str] = set()
+            items: Dict[str, Set[uuid.UUID]] = {}
+            touched: Dict[str, Set[uuid.UUID]] = {}
+            for _, collection, item_id, item_only, origin in rows:
+                if origin == BOOT_ID:
+                    continue
+                if item_id is None:
+                    wide.add(collection)
+                else:
+                    (touched if item_only else items).setdefault(collection, set()).add(uuid.UUID(bytes=item_id))
+
+            if not (wide or items or touched):
+                return
+            bump(
+                *wide,
+                items=tuple((c, i) for c, ids in items.items() for i in ids),
+                touched=tuple((c, i) for c, ids in touched.items() for i in ids - items.get(c, set())),
+            )
+            for collection in wide | set(items) | set(touched):
+                item_ids = None if collection in wide else items.get(collection, set()) | touched.get(collection, set())
+                for subscriber in self._subscribers:
+                    subscriber(self._connection, collection, item_ids)
+
+
+_watcher = _Watcher()
+
+
+def start_sync(database_url: str) -> None:
+    """Start following other processes' commits (call once the tables exist)."""
+    _watcher.start(database_url)
+
+
+def stop_sync() -> None:
+    _watcher.stop()
+
+
+def sync() -> None:
+    """Apply changes committed by other processes since the last call."""
+    _watcher.poll()
+
+
+def subscribe(subscriber: Subscriber) -> None:
+    """Register a callback for changes committed by other processes."""
+    _watcher.subscribe(subscriber)
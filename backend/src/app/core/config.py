@@ -1,10 +1,80 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./xlp.db"
     CORS_ORIGINS: str
+    SEARCH_BACKEND: str = "fts"  # 'fts' (FTS5 index) or 'like' (substring scan)
+    COUNT_CACHE_SIZE: int = 1024
+    COUNT_CACHE_TTL_SECONDS: float = 60.0
+    FACET_CACHE_SIZE: int = 256
+    FACET_CACHE_TTL_SECONDS: float = 300.0
+    SKILL_INDEX_ENABLED: bool = True  # Serve skill typeahead from memory
+    SKILL_ID_CACHE_SIZE: int = 10000  # Skill name -> id entries kept for upserts (0 disables)
+    CATALOG_SYNC_ENABLED: bool = True  # Follow other processes' writes (the catalog_changes log itself is always written)
+    CATALOG_SYNC_INTERVAL_SECONDS: float = 0.0  # Min time between PRAGMA data_version polls (0 = every read)
+    CHANGE_LOG_RETENTION_SECONDS: float = 3600.0  # Superseded catalog_changes entries older than this are compacted
+    CHANGE_LOG_COMPACT_INTERVAL_SECONDS: float = 600.0  # 0 disables the background compaction task
+    ASYNC_ROUTES: bool = False  # Experimental, slower under load: sync routes run on the event loop over aiosqlite (see async_routes)
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the aiosqlite driver
+
+    # Engine profile
+    DB_ECHO: bool = False  # Log every SQL statement (debugging only)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_READ_POOL_SIZE: int = 10  # Separate query_only pool for GET routes
+
+    # Per-request SQL profiling (Server-Timing header, debug log, N+1 warnings)
+    SQL_PROFILER_ENABLED: bool = False  # Debugging: exposes query counts and N+1 markers in Server-Timing and hooks every statement
+    SQL_PROFILER_SLOW_STATEMENTS: int = 3  # Slowest statements kept per request
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5  # Same statement shape this often in one request
+
+    # Admission control: concurrency limit and queue size per route class (limit 0 = unlimited)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0  # Longest a request waits for a slot before a 503
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_SEARCH_LIMIT: int = 4  # Listings with a free-text search
+    ADMISSION_SEARCH_QUEUE: int = 32
+    ADMISSION_DETAILS_LIMIT: int = 8  # Track details
+    ADMISSION_DETAILS_QUEUE: int = 64
+    ADMISSION_STREAM_LIMIT: int = 2  # Exports (held while streaming)
+    ADMISSION_STREAM_QUEUE: int = 4
+    ADMISSION_FEED_LIMIT: int = 8  # /api/changes polls: short, frequent, kept apart from exports
+    ADMISSION_FEED_QUEUE: int = 64
+    ADMISSION_WRITE_LIMIT: int = 4
+    ADMISSION_WRITE_QUEUE: int = 64
+    ADMISSION_DEFAULT_LIMIT: int = 0  # Everything else (/health is never limited)
+    ADMISSION_DEFAULT_QUEUE: int = 0
+
+    # Background provider-metadata enrichment (fetches each new resource's URL; off by default)
+    ENRICHMENT_ENABLED: bool = False
+    ENRICHMENT_WORKERS: int = 8
+    ENRICHMENT_PER_HOST_LIMIT: int = 2  # Concurrent fetches per provider host
+    ENRICHMENT_MAX_ATTEMPTS: int = 3  # Network errors, 429 and 5xx are retried with exponential backoff
+    ENRICHMENT_BACKOFF_SECONDS: float = 0.5
+    ENRICHMENT_FETCH_TIMEOUT_SECONDS: float = 10.0
+    ENRICHMENT_ALLOWED_HOSTS: str = ""  # Comma-separated hostnames exempt from the public-address check (e.g. local stubs)
+    ENRICHMENT_QUEUE_SIZE: int = 10000  # Jobs beyond this are dropped and picked up by the next backfill
+    ENRICHMENT_CACHE_SIZE: int = 10000  # Parsed pages kept per normalized_url
+    ENRICHMENT_CACHE_TTL_SECONDS: float = 86400.0
+    ENRICHMENT_BATCH_SIZE: int = 100  # Rows per UPDATE batch
+    ENRICHMENT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Longest a fetched result waits to be written
+    ENRICHMENT_BACKFILL_ON_STARTUP: bool = True  # Queue resources that have no metadata yet
+    ENRICHMENT_BACKFILL_INTERVAL_SECONDS: float = 600.0  # Re-run the backfill (transient failures due a retry); 0 = never
+    ENRICHMENT_RETRY_FAILED_AFTER_SECONDS: float = 3600.0  # First delay before refetching a transient failure; doubles each time
+    ENRICHMENT_MAX_FAILURES: int = 5  # Transient failures before a resource is given up on
+
+    # Per-connection SQLite pragmas
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64 * 1024  # Negative = KiB, i.e. 64 MiB per connection
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_FOREIGN_KEYS: bool = True
     
     class Config:
         env_file = ".env"
@@ -1,25 +1,147 @@
 from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import Engine, event, inspect
+from sqlalchemy.schema import CreateColumn
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from app.core.config import get_settings
+from app.core.search_index import create_search_index, rebuild_search_index
+from app.core.id_migration import migrate_text_ids
+from app.core import sql_profiler
 # Import models to ensure they are registered with SQLModel
 from app.models.resource import LearningResource  # noqa: F401
 from app.models.track import LearningTrack  # noqa: F401
 from app.models.track_resource import TrackResource  # noqa: F401
+from app.models.track_document import TrackDetailDocument  # noqa: F401
+from app.models.skill import Skill, ResourceSkill, TrackSkill  # noqa: F401
+from app.models.catalog_change import CatalogChange  # noqa: F401
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=True  # Log SQL queries
-)
+
+
+def _sqlite_pragmas(query_only: bool = False) -> dict:
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF",
+    }
+    if query_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def _install_pragmas(target: Engine, query_only: bool = False) -> None:
+    """Apply the SQLite pragma profile to every new DBAPI connection."""
+    pragmas = _sqlite_pragmas(query_only)
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def _pool_args(pool_size: int) -> dict:
+    # In-memory databases use a single-connection pool that takes no sizing
+    if ":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.endswith("://"):
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+
+def _create_sqlite_engine(pool_size: int, query_only: bool = False) -> Engine:
+    new_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        echo=settings.DB_ECHO,
+        **_pool_args(pool_size),
+    )
+    _install_pragmas(new_engine, query_only)
+    if settings.SQL_PROFILER_ENABLED:
+        sql_profiler.install(new_engine)
+    return new_engine
+
+
+engine = _create_sqlite_engine(settings.DB_POOL_SIZE)
+
+# Read-only engine for GET routes: PRAGMA query_only rejects any write
+read_engine = _create_sqlite_engine(settings.DB_READ_POOL_SIZE, query_only=True)
+
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+def _create_async_sqlite_engine(query_only: bool = False) -> AsyncEngine:
+    new_engine = create_async_engine(_async_database_url(), echo=settings.DB_ECHO)
+    _install_pragmas(new_engine.sync_engine, query_only)
+    if settings.SQL_PROFILER_ENABLED:
+        sql_profiler.install(new_engine.sync_engine)
+    return new_engine
+
+
+# Only built when async routes are enabled, so aiosqlite stays optional
+async_engine = _create_async_sqlite_engine() if settings.ASYNC_ROUTES else None
+async_read_engine = _create_async_sqlite_engine(query_only=True) if settings.ASYNC_ROUTES else None
+
+
+def _add_missing_columns() -> None:
+    """Add model columns missing from existing tables (new columns must be nullable or have a server default)."""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
 
 
 def create_db_and_tables():
     """Create all tables in the database."""
+    # Databases from before BLOB ids are rebuilt first; their indexes are recreated below
+    migrated = migrate_text_ids(engine)
     SQLModel.metadata.create_all(engine)
+    # create_all skips columns and indexes on tables that already exist; add any new ones
+    _add_missing_columns()
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    if migrated:
+        rebuild_search_index(engine)
+    else:
+        create_search_index(engine)
 
 
 def get_session():
     """Dependency to get DB session."""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+def get_read_session():
+    """Dependency to get a read-only DB session (GET routes)."""
+    with Session(read_engine) as session:
+        yield session
+
+
+async def get_async_session():
+    """Dependency to get an async DB session (ASYNC_ROUTES mode)."""
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
+async def get_async_read_session():
+    """Dependency to get a read-only async DB session (GET routes, ASYNC_ROUTES mode)."""
+    async with AsyncSession(async_read_engine) as session:
+        yield session
@@ -0,0 +1,101 @@
+"""One-off migration of catalog ids from 32-char hex TEXT to 16-byte BLOBs.
+
+Databases created before ids were stored as BLOBs (see `UUIDBlob`) are
+converted in place by `create_db_and_tables`, or explicitly with
+``python -m app.core.id_migration``. Each affected table is rebuilt from its
+current model definition in a single transaction, with foreign key checks
+off while tables are swapped; indexes and the search index are recreated
+afterwards by the caller.
+"""
+
+import uuid
+from typing import Dict, List
+from sqlalchemy import Engine
+from sqlalchemy.schema import CreateTable
+from sqlmodel import SQLModel
+
+# table -> columns holding catalog ids
+ID_COLUMNS: Dict[str, List[str]] = {
+    "learning_resources": ["id"],
+    "learning_tracks": ["id"],
+    "skills": ["id"],
+    "resource_skills": ["resource_id", "skill_id"],
+    "track_skills": ["track_id", "skill_id"],
+    "track_resources": ["id", "track_id", "resource_id"],
+    "track_detail_documents": ["track_id"],
+}
+
+
+def _uuid_blob(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid.UUID(value).bytes
+
+
+def _text_id_tables(dbapi_conn) -> List[str]:
+    tables = []
+    for table, columns in ID_COLUMNS.items():
+        declared = {row[1]: (row[2] or "").upper() for row in dbapi_conn.execute(f"PRAGMA table_info({table})")}
+        if declared and any(declared.get(c) != "BLOB" for c in columns):
+            tables.append(table)
+    return tables
+
+
+def migrate_text_ids(engine: Engine) -> List[str]:
+    """Convert hex TEXT id columns to BLOBs. Returns the tables that were rebuilt."""
+    raw = engine.raw_connection()
+    try:
+        dbapi_conn = raw.driver_connection
+        tables = _text_id_tables(dbapi_conn)
+        if not tables:
+            return []
+
+        dbapi_conn.create_function("uuid_blob", 1, _uuid_blob, deterministic=True)
+        isolation_level = dbapi_conn.isolation_level
+        dbapi_conn.isolation_level = None  # manage the transaction explicitly
+        dbapi_conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            dbapi_conn.execute("BEGIN")
+            for table_name in tables:
+                _rebuild_table(dbapi_conn, engine, table_name)
+            dbapi_conn.execute("COMMIT")
+        except Exception:
+            dbapi_conn.execute("ROLLBACK")
+            raise
+        finally:
+            dbapi_conn.execute("PRAGMA foreign_keys = ON")
+            dbapi_conn.isolation_level = isolation_level
+        return tables
+    finally:
+        raw.close()
+
+
+def _rebuild_table(dbapi_conn, engine: Engine, table_name: str) -> None:
+    table = SQLModel.metadata.tables[table_name]
+    staging = f"{table_name}__blob_ids"
+
+    ddl = str(CreateTable(table).compile(engine)).replace(f"CREATE TABLE {table_name} ", f"CREATE TABLE {staging} ", 1)
+    dbapi_conn.execute(ddl)
+
+    existing = {row[1] for row in dbapi_conn.execute(f"PRAGMA table_info({table_name})")}
+    columns = [c.name for c in table.columns if c.name in existing]
+    values = [f"uuid_blob({c})" if c in ID_COLUMNS[table_name] else c for c in columns]
+
+    # Keep rowids so the FTS index (keyed by rowid) stays aligned
+    dbapi_conn.execute(
+        f"INSERT INTO {staging} (rowid, {', '.join(columns)}) "
+        f"SELECT rowid, {', '.join(values)} FROM {table_name}"
+    )
+    dbapi_conn.execute(f"DROP TABLE {table_name}")
+    dbapi_conn.execute(f"ALTER TABLE {staging} RENAME TO {table_name}")
+
+
+if __name__ == "__main__":
+    from app.core.db import engine, create_db_and_tables
+    from app.core.search_index import rebuild_search_index
+
+    migrated = migrate_text_ids(engine)
+    create_db_and_tables()
+    if migrated:
+        rebuild_search_index(engine)
+    print("Converted to BLOB ids: " + (", ".join(migrated) or "nothing to do"))
@@ -0,0 +1,94 @@
+"""SQLite FTS5 full-text index for learning resources and tracks.
+
+Each indexed table gets a companion ``<table>_fts`` virtual table whose rowid
+mirrors the base row's rowid, plus triggers that keep it in sync on insert,
+update and delete. Run ``python -m app.core.search_index`` to (re)build the
+index for an existing database, e.g. after upgrading or after a VACUUM.
+"""
+
+from typing import Dict, List
+from sqlalchemy import Engine, text
+
+# base table -> searchable columns (first column is always the id)
+INDEXED_TABLES: Dict[str, List[str]] = {
+    "learning_resources": ["title", "short_description", "author", "platform"],
+    "learning_tracks": ["title", "short_description", "created_by_user_id", "level"],
+}
+
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+FTS_PREFIX_LENGTHS = "2 3"
+
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _ddl(table: str, columns: List[str]) -> List[str]:
+    fts = fts_table_name(table)
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            id UNINDEXED, {cols},
+            tokenize = '{FTS_TOKENIZER}', prefix = '{FTS_PREFIX_LENGTHS}'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, id, {cols}) VALUES (new.rowid, new.id, {new_vals});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = old.rowid;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF id, {cols} ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = old.rowid;
+            INSERT INTO {fts} (rowid, id, {cols}) VALUES (new.rowid, new.id, {new_vals});
+        END
+        """,
+    ]
+
+
+def _rebuild_table(conn, table: str, columns: List[str]) -> None:
+    fts = fts_table_name(table)
+    cols = ", ".join(columns)
+    conn.execute(text(f"DELETE FROM {fts}"))
+    conn.execute(text(f"INSERT INTO {fts} (rowid, id, {cols}) SELECT rowid, id, {cols} FROM {table}"))
+    conn.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('optimize')"))
+
+
+def create_search_index(engine: Engine) -> None:
+    """Create FTS tables and sync triggers, backfilling tables that are new."""
+    with engine.begin() as conn:
+        for table, columns in INDEXED_TABLES.items():
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts_table_name(table)},
+            ).first()
+
+            for stmt in _ddl(table, columns):
+                conn.execute(text(stmt))
+
+            if not exists:
+                _rebuild_table(conn, table, columns)
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Drop and repopulate every FTS table from its base table."""
+    create_search_index(engine)
+    with engine.begin() as conn:
+        for table, columns in INDEXED_TABLES.items():
+            _rebuild_table(conn, table, columns)
+
+
+if __name__ == "__main__":
+    from app.core.db import engine, create_db_and_tables
+
+    create_db_and_tables()
+    rebuild_search_index(engine)
+    print("Search index rebuilt for: " + ", ".join(INDEXED_TABLES))
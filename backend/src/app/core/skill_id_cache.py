@@ -0,0 +1,78 @@
+"""Bounded in-process cache of skill name -> id for `upsert_skills_by_names`.
+
+Skills are insert-only and their names unique, so a name's id never changes
+once committed. Entries are written through on commit only: ids learned in
+a session (whether it inserted them or read them back) are queued on the
+session and dropped if it rolls back, so an id from an insert that never
+committed cannot be served. Concurrent inserts of the same name are settled
+by the database (INSERT OR IGNORE under SQLite's single writer); every
+session caches the id it read back, which is the one that won.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+from uuid import UUID
+from sqlalchemy import event
+from sqlmodel import Session
+from app.core.config import get_settings
+
+_PENDING_KEY = "skill_ids_pending"
+
+
+class SkillIdCache:
+    """Thread-safe LRU of skill name -> id."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._ids: "OrderedDict[str, UUID]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, UUID]:
+        """Get the cached ids of the given names (misses are left out)."""
+        found = {}
+        with self._lock:
+            for name in names:
+                skill_id = self._ids.get(name)
+                if skill_id is not None:
+                    self._ids.move_to_end(name)
+                    found[name] = skill_id
+        return found
+
+    def put_many(self, pairs: Iterable[Tuple[str, UUID]]) -> None:
+        if not self.max_size:
+            return
+        with self._lock:
+            for name, skill_id in pairs:
+                self._ids[name] = skill_id
+                self._ids.move_to_end(name)
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+skill_id_cache = SkillIdCache(get_settings().SKILL_ID_CACHE_SIZE)
+
+
+def put_on_commit(session: Session, pairs: Iterable[Tuple[str, UUID]]) -> None:
+    """Queue (name, id) pairs to be cached once the session commits."""
+    if skill_id_cache.max_size:
+        session.info.setdefault(_PENDING_KEY, []).extend(pairs)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        skill_id_cache.put_many(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,167 @@
+"""In-process index of skill names for typeahead search.
+
+Loaded once at startup and kept current by `skill_repository.upsert_skills_by_names`
+(new skills are added when the inserting session commits) and, for skills
+added by other processes, by the catalog_version change log. Ordering matches the
+SQL fallback: exact match, then prefix, then contains, each by length then name.
+
+Structures:
+- names sorted alphabetically (empty-query listing)
+- lower-cased 1..3 character grams -> names containing them, sorted by (length, name)
+- lower-cased name -> names (exact matches)
+"""
+
+import sqlite3
+import threading
+from bisect import insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import event
+from sqlmodel import Session
+from app.core import catalog_version
+from app.utils.model_helpers import as_uuid, exec_sql
+
+MAX_GRAM = 3
+
+_PENDING_KEY = "skill_index_pending"
+
+
+def _rank_key(name: str) -> Tuple[int, str]:
+    return (len(name), name)
+
+
+def _grams(lowered: str) -> set:
+    return {
+        lowered[i:i + k]
+        for k in range(1, MAX_GRAM + 1)
+        for i in range(len(lowered) - k + 1)
+    }
+
+
+class SkillIndex:
+    """Sorted-array plus n-gram index over skill names."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, UUID] = {}
+        self._by_name: List[str] = []
+        self._by_gram: Dict[str, List[str]] = {}
+        self._by_lower: Dict[str, List[str]] = {}
+        self.loaded = False
+
+    def load(self, rows: Iterable[Tuple[UUID, str]]) -> None:
+        """Replace the index contents with (id, name) rows."""
+        ids: Dict[str, UUID] = {}
+        by_gram: Dict[str, List[str]] = {}
+        by_lower: Dict[str, List[str]] = {}
+
+        for skill_id, name in rows:
+            ids[name] = skill_id
+            lowered = name.lower()
+            by_lower.setdefault(lowered, []).append(name)
+            for gram in _grams(lowered):
+                by_gram.setdefault(gram, []).append(name)
+
+        for names in by_gram.values():
+            names.sort(key=_rank_key)
+        for names in by_lower.values():
+            names.sort()
+
+        with self._lock:
+            self._ids = ids
+            self._by_name = sorted(ids)
+            self._by_gram = by_gram
+            self._by_lower = by_lower
+            self.loaded = True
+
+    def add(self, skill_id: UUID, name: str) -> None:
+        """Add one skill; a no-op if the name is already indexed."""
+        with self._lock:
+            if name in self._ids:
+                return
+            self._ids[name] = skill_id
+            insort(self._by_name, name)
+            lowered = name.lower()
+            insort(self._by_lower.setdefault(lowered, []), name)
+            for gram in _grams(lowered):
+                insort(self._by_gram.setdefault(gram, []), name, key=_rank_key)
+
+    def get_id(self, name: str) -> Optional[UUID]:
+        return self._ids.get(name)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Tuple[UUID, str]]:
+        """Return (id, name) pairs ranked like `skill_repository.search_skills`."""
+        q = (query or "").strip()
+        needed = offset + limit
+
+        with self._lock:
+            if not q:
+                names = self._by_name[offset:needed]
+                return [(self._ids[n], n) for n in names]
+
+            ql = q.lower()
+            exact = self._by_lower.get(ql, [])
+            prefix: List[str] = []
+            contains: List[str] = []
+
+            # Walk the rarest gram's list; it is already in (length, name) order
+            grams = [ql] if len(ql) <= MAX_GRAM else [ql[i:i + MAX_GRAM] for i in range(len(ql) - MAX_GRAM + 1)]
+            candidates = min((self._by_gram.get(g, []) for g in grams), key=len)
+
+            for name in candidates:
+                if len(exact) + len(prefix) >= needed:
+                    break
+                lowered = name.lower()
+                if lowered == ql:
+                    continue
+                if lowered.startswith(ql):
+                    prefix.append(name)
+                elif len(contains) < needed and ql in lowered:
+                    contains.append(name)
+
+            names = (exact + prefix + contains)[offset:needed]
+            return [(self._ids[n], n) for n in names]
+
+
+skill_index = SkillIndex()
+
+
+def load_from_db(session: Session) -> None:
+    """Populate the process-wide index from the skills table."""
+    rows = exec_sql(session, "SELECT id, name FROM skills").all()
+    skill_index.load((as_uuid(r[0]), r[1]) for r in rows)
+
+
+def add_on_commit(session: Session, pairs: Iterable[Tuple[UUID, str]]) -> None:
+    """Queue (id, name) pairs to be indexed once the session commits."""
+    session.info.setdefault(_PENDING_KEY, []).extend(pairs)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and skill_index.loaded:
+        for skill_id, name in pending:
+            skill_index.add(skill_id, name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _refresh_foreign(connection: sqlite3.Connection, collection: str, skill_ids: Optional[Set[UUID]]) -> None:
+    """Index skills another process added (reload fully for collection-wide changes)."""
+    if collection != catalog_version.SKILLS or not skill_index.loaded:
+        return
+    if skill_ids is None:
+        skill_index.load((UUID(bytes=r[0]), r[1]) for r in connection.execute("SELECT id, name FROM skills"))
+        return
+
+    ids = [skill_id.bytes for skill_id in skill_ids]
+    rows = connection.execute(f"SELECT id, name FROM skills WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+    for skill_id, name in rows:
+        skill_index.add(UUID(bytes=skill_id), name)
+
+
+catalog_version.subscribe(_refresh_foreign)
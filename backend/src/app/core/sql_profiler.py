@@ -0,0 +1,147 @@
+"""Per-request SQL profiling.
+
+Engine event hooks time every statement and attribute it to the profile of
+the request being served (held in a context variable, so it follows the
+request into the threadpool and into `AsyncSession.run_sync`).
+`SQLProfilerMiddleware` starts a profile per request, reports it in a
+`Server-Timing` header and logs a summary at DEBUG level.
+
+Statements are grouped by shape: the SQL text with expanded IN-lists
+collapsed. A shape executed `SQL_PROFILER_N_PLUS_ONE_THRESHOLD` or more
+times in one request is flagged as a likely N+1 and logged at WARNING.
+"""
+
+import heapq
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_START_KEY = "sql_profiler_start"
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize SQL so executions differing only in IN-list length compare equal."""
+    return _IN_LIST_RE.sub("(?...)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+class RequestProfile:
+    """Query count, DB time and statement shapes for one request."""
+
+    def __init__(self, slow_statements: int = 3):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.shapes: Dict[str, List[float]] = {}  # shape -> [count, total seconds]
+        self._slow_statements = slow_statements
+        self._slowest: List[Tuple[float, int, str]] = []  # min-heap of (seconds, seq, statement)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+
+        stats = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+        entry = (seconds, self.query_count, statement)
+        if len(self._slowest) < self._slow_statements:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        """Slowest statements, slowest first."""
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes executed at least `threshold` times, most frequent first."""
+        repeated = [(shape, int(stats[0])) for shape, stats in self.shapes.items() if stats[0] >= threshold]
+        return sorted(repeated, key=lambda item: -item[1])
+
+
+def start(slow_statements: int = 3) -> RequestProfile:
+    """Begin profiling the current request (context)."""
+    profile = RequestProfile(slow_statements)
+    _current.set(profile)
+    return profile
+
+
+def current() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    starts = conn.info.get(_START_KEY)
+    if profile is not None and starts:
+        profile.record(statement, time.perf_counter() - starts.pop())
+
+
+def install(engine: Engine) -> None:
+    """Attach the timing hooks to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLProfilerMiddleware:
+    """ASGI middleware that profiles each HTTP request's SQL."""
+
+    def __init__(self, app, slow_statements: int = 3, n_plus_one_threshold: int = 5):
+        self.app = app
+        self.slow_statements = slow_statements
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = start(self.slow_statements)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(profile).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.set(None)
+            self._log(scope, profile, time.perf_counter() - started)
+
+    def _server_timing(self, profile: RequestProfile) -> str:
+        timing = f'db;dur={profile.db_seconds * 1000:.2f};desc="{profile.query_count} queries"'
+        repeated = profile.repeated_shapes(self.n_plus_one_threshold)
+        if repeated:
+            timing += f', db-n1;desc="{len(repeated)} repeated statement shapes"'
+        return timing
+
+    def _log(self, scope, profile: RequestProfile, elapsed: float) -> None:
+        request = f"{scope['method']} {scope['path']}"
+
+        for shape, count in profile.repeated_shapes(self.n_plus_one_threshold):
+            logger.warning("Possible N+1 in %s: %d executions of %s", request, count, shape)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            slowest = "; ".join(f"{seconds * 1000:.2f}ms {statement_shape(s)[:200]}" for seconds, s in profile.slowest())
+            logger.debug(
+                "%s: %d queries, %.2fms DB of %.2fms total; slowest: %s",
+                request, profile.query_count, profile.db_seconds * 1000, elapsed * 1000, slowest or "-",
+            )
@@ -1,7 +1,14 @@
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from app.core.db import create_db_and_tables
-from app.api.routes import resources, skills, tracks
+from sqlmodel import Session
+from app.core.config import get_settings
+from app.core.db import create_db_and_tables, engine
+from app.core import admission, catalog_version, skill_index
+from app.core.sql_profiler import SQLProfilerMiddleware
+from app.services import change_service, enrichment_service, track_document_service
+from app.api.routes import changes, resources, skills, tracks
+from app.api.async_routes import to_async_router, warn_experimental
 from fastapi.middleware.cors import CORSMiddleware 
 
 
@@ -9,11 +16,41 @@ from fastapi.middleware.cors import CORSMiddleware
 async def lifespan(app: FastAPI):
     # Startup: Create database tables
     create_db_and_tables()
+    # Follow writes made by other worker processes (before the caches below are filled)
+    catalog_version.start_sync(get_settings().DATABASE_URL)
+    # Load skill typeahead index
+    if get_settings().SKILL_INDEX_ENABLED:
+        with Session(engine) as session:
+            skill_index.load_from_db(session)
+    # Materialize track detail documents missing since the last run
+    with Session(engine) as session:
+        track_document_service.backfill_documents(session)
+    # Drop superseded change log entries in the background
+    compactor = asyncio.create_task(change_service.compact_periodically())
+    # Fill provider metadata in the background, starting with resources that have none yet
+    backfill = None
+    if get_settings().ENRICHMENT_ENABLED:
+        pool = enrichment_service.start()
+        backfill = asyncio.create_task(enrichment_service.backfill_periodically(
+            pool, get_settings().ENRICHMENT_BACKFILL_INTERVAL_SECONDS, get_settings().ENRICHMENT_BACKFILL_ON_STARTUP
+        ))
     yield
     # Shutdown: cleanup if needed
+    compactor.cancel()
+    if backfill is not None:
+        backfill.cancel()
+    await enrichment_service.stop()
+    catalog_version.stop_sync()
 
 
 app = FastAPI(title="WebAcademy API", lifespan=lifespan)
+if get_settings().ADMISSION_CONTROL_ENABLED:
+    # Innermost, so CORS and SQL profiling still decorate 503 responses
+    app.add_middleware(
+        admission.AdmissionControlMiddleware,
+        queue_timeout_seconds=get_settings().ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        retry_after_seconds=get_settings().ADMISSION_RETRY_AFTER_SECONDS,
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -21,13 +58,26 @@ app.add_middleware(
     allow_methods=["*"],   # or ["GET", "POST", "OPTIONS"]
     allow_headers=["*"],
 )
+if get_settings().SQL_PROFILER_ENABLED:
+    app.add_middleware(
+        SQLProfilerMiddleware,
+        slow_statements=get_settings().SQL_PROFILER_SLOW_STATEMENTS,
+        n_plus_one_threshold=get_settings().SQL_PROFILER_N_PLUS_ONE_THRESHOLD,
+    )
 
 # Include routers
-app.include_router(resources.router)
-app.include_router(skills.router)
-app.include_router(tracks.router)
+if get_settings().ASYNC_ROUTES:
+    warn_experimental()
+for router in (resources.router, skills.router, tracks.router, changes.router):
+    app.include_router(to_async_router(router) if get_settings().ASYNC_ROUTES else router)
 
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/admission")
+def admission_metrics():
+    """Admission control counters per route class."""
+    return admission.snapshot()
@@ -0,0 +1,23 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Boolean, Column, Index, Integer, false
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from app.utils.model_helpers import UUIDBlob
+
+
+class CatalogChange(SQLModel, table=True):
+    """One committed write to a catalog collection (item_id NULL = collection-wide)."""
+    __tablename__ = "catalog_changes"
+    __table_args__ = (
+        Index("ix_catalog_changes_item", "collection", "item_id", "seq"),  # latest entry per item
+        {"sqlite_autoincrement": True},  # seq values are never reused, even after compaction
+    )
+
+    seq: Optional[int] = Field(default=None, sa_column=Column(Integer, primary_key=True, autoincrement=True))
+    collection: str = Field(nullable=False)
+    item_id: Optional[UUID] = Field(default=None, sa_column=Column(UUIDBlob, nullable=True))
+    # The item's own body changed; its collection version did not move (see catalog_version.mark_item_touched)
+    item_only: bool = Field(default=False, sa_column=Column(Boolean, nullable=False, server_default=false()))
+    origin: str = Field(nullable=False)  # BOOT_ID of the writing process
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -1,13 +1,18 @@
 from sqlmodel import SQLModel, Field, Column, JSON, Index
 from datetime import datetime
+from uuid import UUID
 from typing import Optional, Dict
 
-from app.utils.model_helpers import generate_id
+from app.utils.model_helpers import generate_id, UUIDBlob
 
 class LearningResource(SQLModel, table=True):
     __tablename__ = "learning_resources"
+    __table_args__ = (
+        Index("ix_learning_resources_created_at_id", "created_at", "id"),
+        Index("ix_learning_resources_normalized_url", "normalized_url"),
+    )
     
-    id: str = Field(default_factory=generate_id, primary_key=True)
+    id: UUID = Field(default_factory=generate_id, sa_column=Column(UUIDBlob, primary_key=True))
     title: str = Field(nullable=False)
     short_description: str = Field(nullable=False)
     url: str = Field(nullable=False)
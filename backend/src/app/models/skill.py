@@ -1,7 +1,8 @@
 """Skill model for the learning platform."""
 
 from datetime import datetime
-from app.utils.model_helpers import generate_id
+from uuid import UUID
+from app.utils.model_helpers import generate_id, UUIDBlob
 
 from sqlmodel import SQLModel, Field
 from sqlalchemy import Column, DateTime, String, ForeignKey, Index, UniqueConstraint, func
@@ -10,7 +11,7 @@ class Skill(SQLModel, table=True):
     """Skill table model."""
     __tablename__ = "skills"
     
-    id: str = Field(default_factory=generate_id, primary_key=True, max_length=32)
+    id: UUID = Field(default_factory=generate_id, sa_column=Column(UUIDBlob, primary_key=True))
     name: str = Field(sa_column=Column(String(255), nullable=False, unique=True, index=True))
     created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False, server_default=func.current_timestamp()))
     
@@ -28,12 +29,12 @@ class ResourceSkill(SQLModel, table=True):
         Index("idx_resource_skills_skill_id", "skill_id"),
     )
     
-    resource_id: str = Field(
-        sa_column=Column(String(32), ForeignKey("learning_resources.id", ondelete="CASCADE"), primary_key=True)
+    resource_id: UUID = Field(
+        sa_column=Column(UUIDBlob, ForeignKey("learning_resources.id", ondelete="CASCADE"), primary_key=True)
     )
 
-    skill_id: str = Field(
-        sa_column=Column(String(32), ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    skill_id: UUID = Field(
+        sa_column=Column(UUIDBlob, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
     )
 
 class TrackSkill(SQLModel, table=True):
@@ -46,10 +47,10 @@ class TrackSkill(SQLModel, table=True):
         Index("ix_track_skills_track_id", "track_id"),
     )
 
-    track_id: str = Field(
-        sa_column=Column(String(32), ForeignKey("learning_tracks.id", ondelete="CASCADE"), primary_key=True)
+    track_id: UUID = Field(
+        sa_column=Column(UUIDBlob, ForeignKey("learning_tracks.id", ondelete="CASCADE"), primary_key=True)
     )
 
-    skill_id: str = Field(
-        sa_column=Column(String(32), ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    skill_id: UUID = Field(
+        sa_column=Column(UUIDBlob, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
     )
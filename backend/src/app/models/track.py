@@ -1,13 +1,17 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Column, Index
 from datetime import datetime
+from uuid import UUID
 from typing import Optional
 
-from app.utils.model_helpers import generate_id
+from app.utils.model_helpers import generate_id, UUIDBlob
 
 class LearningTrack(SQLModel, table=True):
     __tablename__ = "learning_tracks"
+    __table_args__ = (
+        Index("ix_learning_tracks_created_at_id", "created_at", "id"),
+    )
     
-    id: str = Field(default_factory=generate_id, primary_key=True)
+    id: UUID = Field(default_factory=generate_id, sa_column=Column(UUIDBlob, primary_key=True))
     title: str = Field(nullable=False)
     short_description: str = Field(nullable=False)
     level: Optional[str] = Field(default=None)
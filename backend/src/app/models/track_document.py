@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, ForeignKey, Text
+from datetime import datetime
+from uuid import UUID
+from app.utils.model_helpers import UUIDBlob
+
+
+class TrackDetailDocument(SQLModel, table=True):
+    """Pre-assembled TrackReadWithResources JSON for one track (read model)."""
+    __tablename__ = "track_detail_documents"
+
+    track_id: UUID = Field(
+        sa_column=Column(UUIDBlob, ForeignKey("learning_tracks.id", ondelete="CASCADE"), primary_key=True)
+    )
+    schema_version: int = Field(nullable=False)
+    document: str = Field(sa_column=Column(Text, nullable=False))
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
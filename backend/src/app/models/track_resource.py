@@ -1,15 +1,16 @@
 from sqlmodel import SQLModel, Field
-from sqlalchemy import UniqueConstraint, Index
+from sqlalchemy import Column, ForeignKey, UniqueConstraint, Index
 from datetime import datetime
+from uuid import UUID
 
-from app.utils.model_helpers import generate_id
+from app.utils.model_helpers import generate_id, UUIDBlob
 
 class TrackResource(SQLModel, table=True):
     __tablename__ = "track_resources"
 
-    id: str = Field(default_factory=generate_id, primary_key=True)
-    track_id: str = Field(foreign_key="learning_tracks.id", nullable=False)
-    resource_id: str = Field(foreign_key="learning_resources.id", nullable=False)
+    id: UUID = Field(default_factory=generate_id, sa_column=Column(UUIDBlob, primary_key=True))
+    track_id: UUID = Field(sa_column=Column(UUIDBlob, ForeignKey("learning_tracks.id"), nullable=False))
+    resource_id: UUID = Field(sa_column=Column(UUIDBlob, ForeignKey("learning_resources.id"), nullable=False))
     position: int = Field(nullable=False)  # set explicitly from request order
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
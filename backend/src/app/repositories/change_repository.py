@@ -0,0 +1,62 @@
+"""Reads and compaction of the catalog_changes log written by catalog_version."""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import delete, exists, func, or_
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from app.models.catalog_change import CatalogChange
+
+
+def head(session: Session) -> int:
+    """Get the seq of the newest log entry (0 for an empty log)."""
+    return session.exec(select(func.coalesce(func.max(CatalogChange.seq), 0))).one()
+
+
+def list_changed_items(
+    session: Session,
+    since: int,
+    until: int,
+    collections: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> List[Tuple[str, UUID, int]]:
+    """
+    (collection, item id, latest seq) for every item with an entry in
+    (since, until], ordered by latest seq. Collection-wide entries are skipped.
+    """
+    latest = func.max(CatalogChange.seq).label("latest")
+    statement = (
+        select(CatalogChange.collection, CatalogChange.item_id, latest)
+        .where(CatalogChange.seq > since, CatalogChange.seq <= until, CatalogChange.item_id.is_not(None))
+        .group_by(CatalogChange.collection, CatalogChange.item_id)
+        .order_by(latest)
+    )
+    if collections:
+        statement = statement.where(CatalogChange.collection.in_(collections))
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [tuple(row) for row in session.exec(statement).all()]
+
+
+def compact(session: Session, before: datetime, commit: bool = True) -> int:
+    """
+    Delete entries older than `before` that no feed needs: collection-wide
+    entries and item entries superseded by a newer one for the same item.
+    Returns the number of entries deleted.
+    """
+    newer = aliased(CatalogChange)
+    superseded = exists().where(
+        newer.collection == CatalogChange.collection,
+        newer.item_id == CatalogChange.item_id,
+        newer.seq > CatalogChange.seq,
+    )
+    statement = delete(CatalogChange).where(
+        CatalogChange.created_at < before,
+        or_(CatalogChange.item_id.is_(None), superseded),
+    )
+    deleted = session.exec(statement).rowcount
+
+    if commit:
+        session.commit()
+    return deleted
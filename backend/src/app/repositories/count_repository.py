@@ -0,0 +1,100 @@
+"""Cached total counts for filtered catalog listings."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+from sqlmodel import Session, select, func
+from app.core import catalog_version
+from app.core.config import get_settings
+
+EXACT = "exact"
+ESTIMATE = "estimate"
+NONE = "none"
+COUNT_MODES = (EXACT, ESTIMATE, NONE)
+
+# Estimates never scan more than this many matching rows
+ESTIMATE_CAP = 1000
+
+
+class CountCache:
+    """Bounded LRU of (version, value, stored_at) keyed by filter signature."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int, allow_stale: bool = False) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_version, value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            if stored_version != version and not allow_stale:
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+count_cache = CountCache(_settings.COUNT_CACHE_SIZE, _settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def _normalized(values: Optional[List[str]]) -> Tuple[str, ...]:
+    return tuple(sorted(set(values or [])))
+
+
+def filter_signature(collection: str, search: Optional[str] = None, **filters: Optional[List[str]]) -> Tuple:
+    """Normalize listing filters into a hashable cache key."""
+    normalized_search = " ".join((search or "").lower().split())
+    return (
+        collection,
+        get_settings().SEARCH_BACKEND,
+        normalized_search,
+        tuple(sorted((name, _normalized(values)) for name, values in filters.items())),
+    )
+
+
+def count_filtered(session: Session, statement, collection: str, signature: Tuple, mode: str = EXACT) -> Optional[int]:
+    """
+    Count rows of a filtered select according to `mode`.
+
+    - exact: committed-version-fresh cached value, else a full COUNT (then cached)
+    - estimate: any cached value within the TTL, else a COUNT capped at ESTIMATE_CAP
+    - none: skip counting and return None
+    """
+    if mode == NONE:
+        return None
+
+    version = catalog_version.current(collection)
+    cached = count_cache.get(signature, version, allow_stale=(mode == ESTIMATE))
+    if cached is not None:
+        return cached
+
+    if mode == ESTIMATE:
+        capped = statement.limit(ESTIMATE_CAP + 1).subquery()
+        total = session.exec(select(func.count()).select_from(capped)).one()
+        if total <= ESTIMATE_CAP:
+            count_cache.put(signature, version, total)
+            return total
+        return ESTIMATE_CAP
+
+    total = session.exec(select(func.count()).select_from(statement.subquery())).one()
+    count_cache.put(signature, version, total)
+    return total
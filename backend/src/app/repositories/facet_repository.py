@@ -0,0 +1,88 @@
+"""Cached facet counts (per skill, level, ...) for filtered catalog listings."""
+
+from typing import Dict, List, Tuple, Type
+from sqlalchemy import func, literal, null, union_all
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.sql.expression import Select
+from app.core import catalog_version
+from app.core.config import get_settings
+from app.models.skill import Skill
+from app.repositories.count_repository import CountCache
+
+SKILLS = "skills"
+_TOTAL = "total"
+
+# (total, {facet: [(value, count), ...]})
+FacetCounts = Tuple[int, Dict[str, List[Tuple[str, int]]]]
+
+_settings = get_settings()
+facet_cache = CountCache(_settings.FACET_CACHE_SIZE, _settings.FACET_CACHE_TTL_SECONDS)
+
+
+def facet_counts(
+    session: Session,
+    statement: Select,
+    model: Type[SQLModel],
+    columns: Dict[str, object],
+    junction_model: Type[SQLModel],
+    item_id_column: str,
+    collection: str,
+    signature: Tuple,
+    skill_limit: int
+) -> FacetCounts:
+    """
+    Count the rows of a filtered select per value of each facet column, plus
+    the top `skill_limit` skills, in one statement.
+
+    The filtered set is materialized once as a CTE; each facet is a GROUP BY
+    over it (skills through the junction table) and the groups are combined
+    with UNION ALL. Values are ordered by count, then name. Results are cached
+    per filter signature until the collection's committed version changes.
+    """
+    key = (signature, skill_limit)
+    version = catalog_version.current(collection)
+    cached = facet_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    filtered = statement.with_only_columns(model.id, *columns.values()).cte("filtered").prefix_with("MATERIALIZED")
+
+    parts = [select(literal(_TOTAL).label("facet"), null().label("value"), func.count().label("n")).select_from(filtered)]
+    for name, column in columns.items():
+        value = filtered.c[column.key]
+        parts.append(
+            select(literal(name), value, func.count()).where(value.is_not(None)).group_by(value)
+        )
+
+    # Group on the junction's skill_id (covered by its index) and only look up
+    # names for the top rows; ties at the cut-off are broken by skill id
+    item_id = getattr(junction_model, item_id_column)
+    top_skills = (
+        select(junction_model.skill_id.label("skill_id"), func.count().label("n"))
+        .select_from(filtered)
+        .join(junction_model, item_id == filtered.c.id)
+        .group_by(junction_model.skill_id)
+        .order_by(func.count().desc(), junction_model.skill_id)
+        .limit(skill_limit)
+        .subquery()
+    )
+    parts.append(
+        select(literal(SKILLS), Skill.name, top_skills.c.n)
+        .select_from(top_skills)
+        .join(Skill, Skill.id == top_skills.c.skill_id)
+    )
+
+    total = 0
+    counts: Dict[str, List[Tuple[str, int]]] = {name: [] for name in [*columns, SKILLS]}
+    for facet, value, n in session.execute(union_all(*parts)).all():
+        if facet == _TOTAL:
+            total = n
+        else:
+            counts[facet].append((value, n))
+
+    for values in counts.values():
+        values.sort(key=lambda vn: (-vn[1], vn[0]))
+
+    result = (total, counts)
+    facet_cache.put(key, version, result)
+    return result
@@ -1,11 +1,20 @@
 """Base repository for managing skill relationships with learning items (resources, tracks)."""
 
-from typing import List, Dict, Type
+from typing import Iterable, List, Dict, Set, Tuple, Type
 from uuid import UUID
 from sqlmodel import Session, select, SQLModel
-from sqlalchemy import delete
+from sqlalchemy import delete, insert, tuple_
+from app.core import catalog_version
 from app.models.skill import Skill
-from app.utils.model_helpers import bind_values_clause, exec_sql
+
+# Keep IN lists below SQLite's default bound-variable limit (pairs bind two each)
+MAX_BATCH_SIZE = 900
+
+# Junction table -> catalog collection whose listings it affects
+COLLECTION_BY_TABLE = {
+    "resource_skills": catalog_version.RESOURCES,
+    "track_skills": catalog_version.TRACKS,
+}
 
 
 def list_skills_for_item(
@@ -19,37 +28,92 @@ def list_skills_for_item(
     stmt = (
         select(Skill)
         .join(junction_model, junction_model.skill_id == Skill.id)
-        .where(item_id_attr == item_id.hex)
+        .where(item_id_attr == item_id)
         .order_by(Skill.name)
     )
     return list(session.exec(stmt).all())
 
 
-def clear_item_skills(
+def list_skill_ids_for_items(
     session: Session,
     junction_model: Type[SQLModel],
     item_id_column: str,
-    item_id: UUID
-) -> None:
-    """Remove all skill associations for a learning item."""
+    item_ids: List[UUID]
+) -> Dict[UUID, Set[UUID]]:
+    """Get the current skill ids of many learning items (items without skills are absent)."""
     item_id_attr = getattr(junction_model, item_id_column)
-    session.exec(delete(junction_model).where(item_id_attr == item_id.hex))
+    skill_ids_by_item: Dict[UUID, Set[UUID]] = {}
 
+    for start in range(0, len(item_ids), MAX_BATCH_SIZE):
+        chunk = item_ids[start:start + MAX_BATCH_SIZE]
+        stmt = select(item_id_attr, junction_model.skill_id).where(item_id_attr.in_(chunk))
+        for item_id, skill_id in session.exec(stmt).all():
+            skill_ids_by_item.setdefault(item_id, set()).add(skill_id)
+
+    return skill_ids_by_item
+
+
+def _delete_pairs(session: Session, junction_model: Type[SQLModel], item_id_column: str, pairs: List[Tuple[UUID, UUID]]) -> None:
+    item_id_attr = getattr(junction_model, item_id_column)
+    batch = MAX_BATCH_SIZE // 2
+    for start in range(0, len(pairs), batch):
+        session.exec(
+            delete(junction_model).where(tuple_(item_id_attr, junction_model.skill_id).in_(pairs[start:start + batch]))
+        )
 
-def insert_item_skills_ignore(
+
+def replace_items_skills(
     session: Session,
-    table_name: str,
+    junction_model: Type[SQLModel],
     item_id_column: str,
-    item_id: UUID,
-    skill_ids: List[str]
-) -> None:
-    """Insert skill associations, ignoring duplicates."""
-    if not skill_ids:
-        return
+    skill_ids_by_item: Dict[UUID, Iterable[UUID]],
+    new_items: bool = False
+) -> List[UUID]:
+    """
+    Make each item's skill set exactly the given ids, writing only the difference.
+
+    Reads the current associations of all items in one pass, then deletes the
+    removed (item, skill) pairs and inserts the added ones as set-based
+    statements. Items whose set is unchanged are not written or marked
+    changed. Returns the ids of the items that changed.
+
+    `new_items` skips the read for items created in this transaction, which
+    have no associations yet.
+    """
+    if not skill_ids_by_item:
+        return []
+
+    current = {} if new_items else list_skill_ids_for_items(session, junction_model, item_id_column, list(skill_ids_by_item))
+
+    added: List[Tuple[UUID, UUID]] = []
+    removed: List[Tuple[UUID, UUID]] = []
+    changed: List[UUID] = []
+    for item_id, skill_ids in skill_ids_by_item.items():
+        wanted = list(dict.fromkeys(skill_ids))
+        existing = current.get(item_id, set())
+        if set(wanted) == existing:
+            continue
+        changed.append(item_id)
+        added.extend((item_id, sid) for sid in wanted if sid not in existing)
+        removed.extend((item_id, sid) for sid in existing.difference(wanted))
+
+    if removed:
+        _delete_pairs(session, junction_model, item_id_column, removed)
+    if added:
+        session.flush()  # a Core insert does not autoflush; the item rows may still be pending
+        session.execute(
+            insert(junction_model.__table__).prefix_with("OR IGNORE"),
+            [{item_id_column: item_id, "skill_id": sid} for item_id, sid in added],
+        )
 
-    rows_data = [{item_id_column: item_id.hex, "skill_id": sid} for sid in skill_ids]
-    values_clause, params = bind_values_clause([item_id_column, "skill_id"], rows_data)
-    exec_sql(session, f"INSERT OR IGNORE INTO {table_name} ({item_id_column}, skill_id) VALUES {values_clause}", **params)
+    collection = COLLECTION_BY_TABLE[junction_model.__tablename__]
+    if new_items:
+        # Nobody holds a version of an item that did not exist yet
+        catalog_version.mark_changed(session, collection)
+    else:
+        for item_id in changed:
+            catalog_version.mark_item_changed(session, collection, item_id)
+    return changed
 
 
 def list_skills_for_items(
@@ -57,25 +121,24 @@ def list_skills_for_items(
     junction_model: Type[SQLModel],
     item_id_column: str,
     item_ids: List[UUID]
-) -> Dict[str, List[str]]:
+) -> Dict[UUID, List[str]]:
     """Get skills for multiple learning items in one query."""
     if not item_ids:
         return {}
     
-    item_hex_ids = [iid.hex for iid in item_ids]
     item_id_attr = getattr(junction_model, item_id_column)
     
     stmt = (
         select(Skill.name, item_id_attr)
         .join(junction_model, junction_model.skill_id == Skill.id)
-        .where(item_id_attr.in_(item_hex_ids))
+        .where(item_id_attr.in_(item_ids))
         .order_by(item_id_attr, Skill.name)
     )
     
     results = session.exec(stmt).all()
     
     # Group skills by item_id
-    skills_by_item: Dict[str, List[str]] = {}
+    skills_by_item: Dict[UUID, List[str]] = {}
     for skill_name, item_id in results:
         if item_id not in skills_by_item:
             skills_by_item[item_id] = []
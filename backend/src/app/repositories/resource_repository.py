@@ -1,13 +1,48 @@
 from uuid import UUID
-from typing import List, Optional, Tuple, Dict
-from sqlmodel import Session, select, func
+from typing import Iterator, List, Optional, Tuple, Dict
+from sqlalchemy import String, bindparam, cast, func
+from sqlmodel import Session, select, insert
+from sqlmodel.sql.expression import Select
+from app.core.config import get_settings
 from app.models.resource import LearningResource
-from app.utils.model_helpers import dbid
+from app.repositories import search_repository, count_repository, facet_repository
+from app.utils.model_helpers import as_uuid
+from app.utils import pagination
+from app.core import catalog_version
+
+# Rows fetched per round trip when streaming full scans
+STREAM_CHUNK_SIZE = 500
+
+# Listing columns in ResourceRead order, for `as_rows` queries
+READ_COLUMNS = (
+    LearningResource.id,
+    LearningResource.title,
+    LearningResource.short_description,
+    LearningResource.url,
+    LearningResource.platform,
+    LearningResource.resource_type,
+    LearningResource.level,
+    LearningResource.estimated_time,
+    LearningResource.author,
+    LearningResource.image_url,
+    LearningResource.default_funding_type,
+    LearningResource.created_by_user_id,
+    LearningResource.created_at,
+    LearningResource.provider_metadata,
+)
+
+# Facet name -> column counted by `facet_counts` (skills are always included)
+FACET_COLUMNS = {
+    "levels": LearningResource.level,
+    "resource_types": LearningResource.resource_type,
+}
+
 
 
 def create(resource: LearningResource, session: Session, commit: bool = True) -> LearningResource:
     """Create a new learning resource."""
     session.add(resource)
+    catalog_version.mark_item_changed(session, catalog_version.RESOURCES, resource.id)
     session.flush()
 
     if commit:
@@ -19,7 +54,7 @@ def create(resource: LearningResource, session: Session, commit: bool = True) ->
 
 def get_by_id(resource_id: UUID, session: Session) -> Optional[LearningResource]:
     """Get a learning resource by ID."""
-    return session.get(LearningResource, dbid(resource_id))
+    return session.get(LearningResource, as_uuid(resource_id))
 
 def get_by_normalized_url(normalized_url: str, session: Session) -> Optional[LearningResource]:
     """Get a learning resource by normalized URL (dedupe key)."""
@@ -28,11 +63,24 @@ def get_by_normalized_url(normalized_url: str, session: Session) -> Optional[Lea
     statement = select(LearningResource).where(LearningResource.normalized_url == normalized_url)
     return session.exec(statement).first()
 
-def list_all(session: Session) -> List[LearningResource]:
-    """List all learning resources."""
-    statement = select(LearningResource)
-    results = session.exec(statement)
-    return list(results.all())
+def get_ids_by_normalized_urls(normalized_urls: List[str], session: Session) -> Dict[str, UUID]:
+    """Map the given normalized URLs that already exist to their resource ids."""
+    if not normalized_urls:
+        return {}
+    statement = select(LearningResource.normalized_url, LearningResource.id).where(
+        LearningResource.normalized_url.in_(normalized_urls)
+    )
+    return {url: resource_id for url, resource_id in session.exec(statement).all()}
+
+def bulk_insert(rows: List[Dict], session: Session) -> None:
+    """
+    Insert resource rows in one executemany call, bypassing the ORM unit of work.
+    The INSERT is compiled once and the driver reuses the prepared statement per row.
+    """
+    if not rows:
+        return
+    session.execute(insert(LearningResource.__table__), rows)
+    catalog_version.mark_items_created(session, catalog_version.RESOURCES, [row["id"] for row in rows])
 
 
 def get_by_ids(resource_ids: List[UUID], session: Session) -> Dict[UUID, LearningResource]:
@@ -40,11 +88,177 @@ def get_by_ids(resource_ids: List[UUID], session: Session) -> Dict[UUID, Learnin
     if not resource_ids:
         return {}
 
-    ids = [dbid(rid) for rid in resource_ids]
-    statement = select(LearningResource).where(LearningResource.id.in_(ids))
+    statement = select(LearningResource).where(LearningResource.id.in_(resource_ids))
 
     results = session.exec(statement).all()
-    return {UUID(r.id): r for r in results}
+    return {r.id: r for r in results}
+
+
+def get_rows_by_ids(resource_ids: List[UUID], session: Session) -> List:
+    """Get READ_COLUMNS row tuples for the given ids (missing ids are skipped)."""
+    if not resource_ids:
+        return []
+    statement = select(*READ_COLUMNS).where(LearningResource.id.in_(resource_ids))
+    return list(session.exec(statement).all())
+
+
+def iter_missing_provider_metadata(
+    session: Session,
+    retry_before: str,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[List[Tuple[UUID, str, str, int]]]:
+    """
+    Stream (id, url, normalized_url, failures) of resources without provider
+    metadata, or whose stored transient failure has a `retry_at` (ISO time)
+    before `retry_before`, in chunks.
+    """
+    metadata = LearningResource.provider_metadata
+    statement = (
+        select(
+            LearningResource.id,
+            LearningResource.url,
+            LearningResource.normalized_url,
+            func.coalesce(func.json_extract(metadata, "$.failures"), 0),
+        )
+        .where(
+            LearningResource.normalized_url.is_not(None),
+            cast(metadata, String).in_(["{}", "null"])
+            | metadata.is_(None)
+            | (func.json_extract(metadata, "$.retry_at") < retry_before),
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+    for chunk in session.exec(statement).partitions():
+        yield [tuple(row) for row in chunk]
+
+
+def update_provider_metadata(session: Session, updates: List[Tuple[UUID, str, Dict]], commit: bool = True) -> None:
+    """
+    Store fetched provider metadata, (id, normalized_url, metadata) per row,
+    in one executemany UPDATE. A row is only written (and marked changed)
+    while its normalized_url is still the one that was fetched.
+    """
+    if not updates:
+        return
+
+    table = LearningResource.__table__
+    session.execute(
+        table.update()
+        .where(table.c.id == bindparam("r_id"), table.c.normalized_url == bindparam("r_url"))
+        .values(provider_metadata=bindparam("metadata")),
+        [{"r_id": resource_id, "r_url": url, "metadata": metadata} for resource_id, url, metadata in updates],
+    )
+    # Only rows still at the fetched URL were written (the UPDATE holds the write lock, so this sees the same rows).
+    # Metadata is not part of filters, counts, facets or track summaries: only the items' versions move
+    fetched = {(resource_id, url) for resource_id, url, _ in updates}
+    statement = select(LearningResource.id, LearningResource.normalized_url).where(
+        LearningResource.id.in_([resource_id for resource_id, _ in fetched])
+    )
+    for resource_id, url in session.exec(statement).all():
+        if (resource_id, url) in fetched:
+            catalog_version.mark_item_touched(session, catalog_version.RESOURCES, resource_id)
+
+    if commit:
+        session.commit()
+
+
+def _filtered_statement(
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None
+) -> Tuple[Select, Optional[str]]:
+    """Build the filtered select for listings. Returns (statement, FTS match query)."""
+    use_fts = get_settings().SEARCH_BACKEND == "fts"
+    match_query = search_repository.build_match_query(search) if use_fts else None
+
+    statement = select(LearningResource)
+
+    if match_query:
+        statement = search_repository.apply_search(statement, LearningResource, match_query)
+    elif search and not use_fts:
+        statement = statement.where(
+            LearningResource.title.contains(search) |
+            LearningResource.short_description.contains(search) |
+            LearningResource.author.contains(search) |
+            LearningResource.platform.contains(search)
+        )
+    
+    if skill:
+        # Join with resource_skills and skills tables to filter by skill names
+        from app.models.skill import Skill, ResourceSkill
+        statement = statement.join(ResourceSkill, ResourceSkill.resource_id == LearningResource.id)
+        statement = statement.join(Skill, Skill.id == ResourceSkill.skill_id)
+        statement = statement.where(Skill.name.in_(skill))
+        statement = statement.distinct()
+    
+    if level:
+        statement = statement.where(LearningResource.level.in_(level))
+    
+    if resource_type:
+        statement = statement.where(LearningResource.resource_type.in_(resource_type))
+        
+    return statement, match_query
+
+
+def iter_filtered(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[List[LearningResource]]:
+    """
+    Stream filtered resources in (created_at, id) order as chunks of `chunk_size`.
+
+    Rows are fetched incrementally (yield_per) and each chunk is expunged
+    before the next is read, so full scans run in constant memory.
+    """
+    statement, _ = _filtered_statement(search, skill, level, resource_type)
+    statement = pagination.order_stable(statement, LearningResource).execution_options(yield_per=chunk_size)
+
+    for chunk in session.exec(statement).partitions():
+        yield chunk
+        for item in chunk:
+            session.expunge(item)
+
+
+def _count(
+    statement: Select,
+    session: Session,
+    search: Optional[str],
+    count: str,
+    **filters: Optional[List[str]]
+) -> Optional[int]:
+    signature = count_repository.filter_signature(catalog_version.RESOURCES, search, **filters)
+    return count_repository.count_filtered(session, statement, catalog_version.RESOURCES, signature, count)
+
+
+def facet_counts(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> facet_repository.FacetCounts:
+    """Count filtered resources per skill, level and resource type in one pass (cached)."""
+    from app.models.skill import ResourceSkill
+    statement, _ = _filtered_statement(search, skill, level, resource_type)
+    signature = count_repository.filter_signature(
+        catalog_version.RESOURCES, search, skill=skill, level=level, resource_type=resource_type
+    )
+    return facet_repository.facet_counts(
+        session, statement, LearningResource, FACET_COLUMNS, ResourceSkill, "resource_id",
+        catalog_version.RESOURCES, signature, skill_limit
+    )
+
+
+def _fetch(statement: Select, session: Session, as_rows: bool) -> List:
+    # session.exec() would unwrap a column select to its first column
+    result = session.execute(statement) if as_rows else session.exec(statement)
+    return list(result.all())
 
 
 def list_filtered(
@@ -54,57 +268,71 @@ def list_filtered(
     level: Optional[List[str]] = None,
     resource_type: Optional[List[str]] = None,
     page: int = 1,
-    page_size: int = 12
-) -> Tuple[List[LearningResource], int]:
-    """List learning resources with filtering and pagination."""
-    
-    def _apply_filters(statement):
-        """Apply all filters to a statement."""
-        # Apply filters
-        if search:
-            statement = statement.where(
-                LearningResource.title.contains(search) |
-                LearningResource.short_description.contains(search) |
-                LearningResource.author.contains(search) |
-                LearningResource.platform.contains(search)
-            )
-        
-        if skill:
-            # Join with resource_skills and skills tables to filter by skill names
-            from app.models.skill import Skill, ResourceSkill
-            statement = statement.join(ResourceSkill, ResourceSkill.resource_id == LearningResource.id)
-            statement = statement.join(Skill, Skill.id == ResourceSkill.skill_id)
-            statement = statement.where(Skill.name.in_(skill))
-            statement = statement.distinct()
-        
-        if level:
-            statement = statement.where(LearningResource.level.in_(level))
-        
-        if resource_type:
-            statement = statement.where(LearningResource.resource_type.in_(resource_type))
-            
-        return statement
-    
-    # Start with base query
-    statement = select(LearningResource)
-    statement = _apply_filters(statement)
+    page_size: int = 12,
+    count: str = count_repository.EXACT,
+    as_rows: bool = False
+) -> Tuple[List[LearningResource], Optional[int]]:
+    """List learning resources with filtering and pagination.
+
+    With the FTS backend, `search` matches word prefixes and results are
+    ordered by BM25 relevance; otherwise by (created_at, id).
+    With `as_rows`, returns READ_COLUMNS row tuples instead of ORM objects.
+    """
+    statement, match_query = _filtered_statement(search, skill, level, resource_type)
     
     # Get total count from the filtered query
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total = session.exec(count_statement).one()
+    total = _count(statement, session, search, count, skill=skill, level=level, resource_type=resource_type)
+
+    if as_rows:
+        statement = statement.with_only_columns(*READ_COLUMNS)
     
-    # Apply pagination to main query
+    # Apply ordering and pagination to main query
+    if match_query:
+        statement = search_repository.order_by_rank(statement, LearningResource)
+    statement = pagination.order_stable(statement, LearningResource)
     statement = statement.offset((page - 1) * page_size).limit(page_size)
     
     # Execute query
-    resources = session.exec(statement).all()
+    resources = _fetch(statement, session, as_rows)
     
-    return list(resources), total
+    return resources, total
+
+
+def list_filtered_keyset(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    cursor: Optional[pagination.Cursor] = None,
+    page_size: int = 12,
+    count: str = count_repository.EXACT,
+    as_rows: bool = False
+) -> Tuple[List[LearningResource], Optional[int], Optional[str], Optional[str]]:
+    """List learning resources after/before a cursor in (created_at, id) order.
+
+    With `as_rows`, returns READ_COLUMNS row tuples instead of ORM objects.
+
+    Returns:
+        Tuple of (resources list, total count, next cursor, prev cursor)
+    """
+    statement, _ = _filtered_statement(search, skill, level, resource_type)
+    total = _count(statement, session, search, count, skill=skill, level=level, resource_type=resource_type)
+
+    if as_rows:
+        statement = statement.with_only_columns(*READ_COLUMNS)
+
+    statement = pagination.apply_keyset(statement, LearningResource, cursor, page_size)
+    rows = _fetch(statement, session, as_rows)
+    resources, next_cursor, prev_cursor = pagination.finish_keyset(rows, cursor, page_size)
+
+    return resources, total, next_cursor, prev_cursor
 
 
 def update(resource: LearningResource, session: Session) -> LearningResource:
     """Update a learning resource."""
     session.add(resource)
+    catalog_version.mark_item_changed(session, catalog_version.RESOURCES, resource.id)
     session.commit()
     session.refresh(resource)
     return resource
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Repository for managing resource-skill relationships."""
 
-from typing import List, Dict
+from typing import Iterable, List, Dict, Set
 from uuid import UUID
 from sqlmodel import Session
 from app.models.skill import Skill, ResourceSkill
@@ -12,16 +12,20 @@ def list_skills_for_resource(session: Session, resource_id: UUID) -> List[Skill]
     return base.list_skills_for_item(session, ResourceSkill, "resource_id", resource_id)
 
 
-def clear_resource_skills(session: Session, resource_id: UUID) -> None:
-    """Remove all skill associations for a resource."""
-    base.clear_item_skills(session, ResourceSkill, "resource_id", resource_id)
+def list_skill_ids_for_resources(session: Session, resource_ids: List[UUID]) -> Dict[UUID, Set[UUID]]:
+    """Get the current skill ids of many resources."""
+    return base.list_skill_ids_for_items(session, ResourceSkill, "resource_id", resource_ids)
 
 
-def insert_resource_skills_ignore(session: Session, resource_id: UUID, skill_ids: List[str]) -> None:
-    """Insert resource-skill associations, ignoring duplicates."""
-    base.insert_item_skills_ignore(session, "resource_skills", "resource_id", resource_id, skill_ids)
+def replace_resources_skills(
+    session: Session,
+    skill_ids_by_resource: Dict[UUID, Iterable[UUID]],
+    new_items: bool = False
+) -> List[UUID]:
+    """Set the skills of many resources, writing only added and removed associations; returns the changed resources."""
+    return base.replace_items_skills(session, ResourceSkill, "resource_id", skill_ids_by_resource, new_items)
 
 
-def list_skills_for_resources(session: Session, resource_ids: List[UUID]) -> Dict[str, List[str]]:
+def list_skills_for_resources(session: Session, resource_ids: List[UUID]) -> Dict[UUID, List[str]]:
     """Get skills for multiple resources in one query."""
     return base.list_skills_for_items(session, ResourceSkill, "resource_id", resource_ids)
@@ -0,0 +1,66 @@
+"""Full-text search helpers over the FTS5 index (see app.core.search_index)."""
+
+import re
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlmodel import Session
+from sqlalchemy import column, literal_column, table
+from app.core.search_index import fts_table_name
+from app.utils.model_helpers import as_uuid, bind_in_clause, dbid, exec_sql
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+
+
+def build_match_query(search: Optional[str]) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    "pyth data" finds "Python for Data Science". Returns None when the input
+    has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(search or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def _fts_table(model):
+    return table(fts_table_name(model.__tablename__), column("id"), column("rank"))
+
+
+def apply_search(statement, model, match_query: str):
+    """Restrict a select() on `model` to FTS matches."""
+    fts = _fts_table(model)
+    return (
+        statement
+        .join(fts, fts.c.id == model.id)
+        .where(literal_column(fts.name).match(match_query))
+    )
+
+
+def order_by_rank(statement, model):
+    """Order a statement built with `apply_search` by BM25 relevance."""
+    return statement.order_by(_fts_table(model).c.rank)
+
+
+def get_snippets(session: Session, table_name: str, match_query: str, item_ids: List[UUID]) -> Dict[UUID, str]:
+    """Get a highlighted snippet of the best-matching column for each item."""
+    if not item_ids:
+        return {}
+
+    fts = fts_table_name(table_name)
+    placeholders, params = bind_in_clause("id", [dbid(iid) for iid in item_ids])
+    rows = exec_sql(session, f"""
+        SELECT id, snippet({fts}, -1, :open, :close, :ellipsis, :tokens)
+        FROM {fts}
+        WHERE {fts} MATCH :q AND id IN ({placeholders})
+    """, q=match_query, open=SNIPPET_OPEN, close=SNIPPET_CLOSE,
+        ellipsis=SNIPPET_ELLIPSIS, tokens=SNIPPET_TOKENS, **params).all()
+
+    return {as_uuid(r[0]): r[1] for r in rows}
@@ -1,7 +1,11 @@
 from typing import List
-from sqlmodel import Session
+from uuid import UUID
+from sqlmodel import Session, select
+from app.core import catalog_version
+from app.core.skill_index import skill_index, add_on_commit
+from app.core.skill_id_cache import skill_id_cache, put_on_commit
 from app.models.skill import Skill
-from app.utils.model_helpers import generate_id, bind_in_clause, bind_values_clause, exec_sql
+from app.utils.model_helpers import as_uuid, dbid, generate_id, bind_in_clause, bind_values_clause, exec_sql
 
 
 def search_skills(session: Session, query: str, limit: int = 20, offset: int = 0) -> List[Skill]:
@@ -15,7 +19,13 @@ def search_skills(session: Session, query: str, limit: int = 20, offset: int = 0
     3. Contains matches
     4. Then by length (shorter names first)
     5. Then alphabetically
+
+    Served from the in-memory skill index when it is loaded.
     """
+    catalog_version.sync()
+    if skill_index.loaded:
+        return [Skill(id=skill_id, name=name) for skill_id, name in skill_index.search(query, limit, offset)]
+
     q = (query or "").strip()
     
     if not q:
@@ -43,25 +53,49 @@ def search_skills(session: Session, query: str, limit: int = 20, offset: int = 0
             LIMIT :limit OFFSET :offset
         """, q=q, prefix=f"{q}%", contains=f"%{q}%", limit=limit, offset=offset).all()
 
-    return [Skill(id=r[0], name=r[1], created_at=r[2]) for r in rows]
+    return [Skill(id=as_uuid(r[0]), name=r[1], created_at=r[2]) for r in rows]
+
+
+def get_by_ids(session: Session, skill_ids: List[UUID]) -> List[Skill]:
+    """Get the skills with the given ids (missing ids are skipped)."""
+    if not skill_ids:
+        return []
+    return list(session.exec(select(Skill).where(Skill.id.in_(skill_ids))).all())
 
 
-def upsert_skills_by_names(session: Session, names: List[str]) -> List[str]:
+def upsert_skills_by_names(session: Session, names: List[str]) -> List[UUID]:
     """
     Ensure skills exist for each name and return their ids.
     NOTE: Uses SQLite INSERT OR IGNORE to avoid N+1 ORM lookups and handle conflicts safely.
+
+    Names already in the skill id cache skip the database entirely.
     """
     if not names:
         return []
 
+    id_by_name = skill_id_cache.get_many(names)
+    missing = [n for n in names if n not in id_by_name]
+    if not missing:
+        return [id_by_name[n] for n in names]
+
     # Batch insert with single statement
-    rows_data = [{"id": generate_id(), "name": n} for n in names]
+    rows_data = [{"id": dbid(generate_id()), "name": n} for n in missing]
     values_clause, insert_params = bind_values_clause(["id", "name"], rows_data)
-    exec_sql(session, f"INSERT OR IGNORE INTO skills (id, name) VALUES {values_clause}", **insert_params)
+    inserted = exec_sql(session, f"INSERT OR IGNORE INTO skills (id, name) VALUES {values_clause}", **insert_params)
 
     # Fetch ids in one query
-    placeholders, select_params = bind_in_clause("n", names)
+    placeholders, select_params = bind_in_clause("n", missing)
     rows = exec_sql(session, f"SELECT id, name FROM skills WHERE name IN ({placeholders})", **select_params).all()
 
-    id_by_name = {r[1]: r[0] for r in rows}
-    return [id_by_name[n] for n in names if n in id_by_name]
\ No newline at end of file
+    found = {r[1]: as_uuid(r[0]) for r in rows}
+    if inserted.rowcount:
+        # A stored id equal to the one we generated means this statement inserted it
+        generated = {row["name"]: row["id"] for row in rows_data}
+        for name, skill_id in found.items():
+            if skill_id.bytes == generated.get(name):
+                catalog_version.mark_item_changed(session, catalog_version.SKILLS, skill_id)
+    add_on_commit(session, [(sid, n) for n, sid in found.items()])
+    put_on_commit(session, found.items())
+
+    id_by_name.update(found)
+    return [id_by_name[n] for n in names if n in id_by_name]
@@ -0,0 +1,58 @@
+"""Repository for materialized track detail documents."""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlmodel import Session
+from app.utils.model_helpers import as_uuid, bind_values_clause, dbid, exec_sql
+
+# Rows per INSERT statement, well below SQLite's bound-variable limit
+UPSERT_CHUNK_SIZE = 200
+
+
+def get_document(session: Session, track_id: UUID, schema_version: int) -> Optional[str]:
+    """Get the stored detail JSON for a track, if current."""
+    row = exec_sql(
+        session,
+        "SELECT document FROM track_detail_documents WHERE track_id = :track_id AND schema_version = :v",
+        track_id=dbid(track_id), v=schema_version,
+    ).first()
+    return row[0] if row else None
+
+
+def upsert_documents(session: Session, documents: List[Tuple[UUID, str]], schema_version: int) -> None:
+    """Insert or replace (track_id, document JSON) rows."""
+    now = datetime.utcnow()
+
+    for start in range(0, len(documents), UPSERT_CHUNK_SIZE):
+        rows = [
+            {"track_id": dbid(track_id), "schema_version": schema_version, "document": doc, "updated_at": now}
+            for track_id, doc in documents[start:start + UPSERT_CHUNK_SIZE]
+        ]
+        columns = ["track_id", "schema_version", "document", "updated_at"]
+        values_clause, params = bind_values_clause(columns, rows)
+        exec_sql(
+            session,
+            f"INSERT OR REPLACE INTO track_detail_documents ({', '.join(columns)}) VALUES {values_clause}",
+            **params,
+        )
+
+
+def delete_documents(session: Session, track_ids: List[UUID]) -> None:
+    """Remove the documents of the given tracks."""
+    if not track_ids:
+        return
+    params = {f"id_{i}": dbid(track_id) for i, track_id in enumerate(track_ids)}
+    placeholders = ", ".join(f":{name}" for name in params)
+    exec_sql(session, f"DELETE FROM track_detail_documents WHERE track_id IN ({placeholders})", **params)
+
+
+def list_stale_track_ids(session: Session, schema_version: int) -> List[UUID]:
+    """Get tracks whose document is missing or built with another schema version."""
+    rows = exec_sql(session, """
+        SELECT t.id
+        FROM learning_tracks t
+        LEFT JOIN track_detail_documents d ON d.track_id = t.id AND d.schema_version = :v
+        WHERE d.track_id IS NULL
+    """, v=schema_version).all()
+    return [as_uuid(r[0]) for r in rows]
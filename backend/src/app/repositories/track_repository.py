@@ -1,17 +1,43 @@
 """Track repository for database operations on learning tracks."""
 
 from uuid import UUID
-from typing import List, Optional, Tuple, Dict
-from sqlmodel import Session, select, func
+from typing import Iterator, List, Optional, Tuple, Dict
+from sqlmodel import Session, select
+from sqlmodel.sql.expression import Select
+from app.core.config import get_settings
 from app.models.track import LearningTrack
 from app.models.skill import Skill, TrackSkill
-from app.utils.model_helpers import dbid
-from app.repositories import resource_repository, resource_skill_repository, track_skill_repository, track_resource_repository
+from app.utils.model_helpers import as_uuid
+from app.utils import pagination
+from app.core import catalog_version
+from app.repositories import resource_repository, resource_skill_repository, track_skill_repository, track_resource_repository, search_repository, count_repository, facet_repository
 from app.schemas.track import TrackNameItem
 
+# Rows fetched per round trip when streaming full scans
+STREAM_CHUNK_SIZE = 500
+
+# Listing columns in TrackRead order, for `as_rows` queries
+READ_COLUMNS = (
+    LearningTrack.id,
+    LearningTrack.title,
+    LearningTrack.short_description,
+    LearningTrack.level,
+    LearningTrack.estimated_time,
+    LearningTrack.image_url,
+    LearningTrack.created_by_user_id,
+    LearningTrack.created_at,
+)
+
+# Facet name -> column counted by `facet_counts` (skills are always included)
+FACET_COLUMNS = {
+    "levels": LearningTrack.level,
+}
+
+
 def create(track: LearningTrack, session: Session, commit: bool = True) -> LearningTrack:
     """Create a new learning track."""
     session.add(track)
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track.id)
     if commit:
         session.commit()
         session.refresh(track)
@@ -20,7 +46,15 @@ def create(track: LearningTrack, session: Session, commit: bool = True) -> Learn
 
 def get_by_id(track_id: UUID, session: Session) -> Optional[LearningTrack]:
     """Get a learning track by ID (metadata only)."""
-    return session.get(LearningTrack, dbid(track_id))
+    return session.get(LearningTrack, as_uuid(track_id))
+
+
+def get_by_ids(track_ids: List[UUID], session: Session) -> Dict[UUID, LearningTrack]:
+    """Get multiple tracks by IDs. Returns dict mapping id -> track."""
+    if not track_ids:
+        return {}
+    statement = select(LearningTrack).where(LearningTrack.id.in_(track_ids))
+    return {t.id: t for t in session.exec(statement).all()}
 
 
 def get_by_id_with_details(track_id: UUID, session: Session) -> Optional[Dict]:
@@ -31,7 +65,7 @@ def get_by_id_with_details(track_id: UUID, session: Session) -> Optional[Dict]:
     - skills: List of skill names for the track
     - resources: List of resources with their skills, ordered by position
     """
-    track = session.get(LearningTrack, dbid(track_id))
+    track = session.get(LearningTrack, as_uuid(track_id))
     if not track:
         return None
     
@@ -53,12 +87,12 @@ def get_by_id_with_details(track_id: UUID, session: Session) -> Optional[Dict]:
     
     # Build resources list with skills
     resources_with_skills = []
-    for resource_id, position in resource_ids_positions:
+    for resource_id, _ in resource_ids_positions:
         resource = resources_map.get(resource_id)
         if resource:
             resources_with_skills.append({
                 "resource": resource,
-                "position": position,
+                "position": len(resources_with_skills),  # rank; stored positions are sparse sort keys
                 "skills": resource_skills_map.get(resource_id, [])
             })
     
@@ -69,85 +103,181 @@ def get_by_id_with_details(track_id: UUID, session: Session) -> Optional[Dict]:
     }
 
 
-def list_all(session: Session) -> List[LearningTrack]:
-    """List all learning tracks."""
-    statement = select(LearningTrack)
-    results = session.exec(statement)
-    return list(results.all())
-
-
 def list_tracks_names(session: Session) -> List[TrackNameItem]:
     """List all tracks with just id and title (for dropdowns/autocomplete)."""
     statement = select(LearningTrack.id, LearningTrack.title).order_by(LearningTrack.title)
     results = session.exec(statement)
-    return [TrackNameItem(id=UUID(track_id), title=title) for track_id, title in results.all()]
+    return [TrackNameItem(id=track_id, title=title) for track_id, title in results.all()]
 
 
 def update(track: LearningTrack, session: Session) -> LearningTrack:
     """Update a learning track."""
     session.add(track)
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track.id)
     session.commit()
     session.refresh(track)
     return track
 
 
+def _filtered_statement(
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None
+) -> Tuple[Select, Optional[str]]:
+    """Build the filtered select for listings. Returns (statement, FTS match query)."""
+    use_fts = get_settings().SEARCH_BACKEND == "fts"
+    match_query = search_repository.build_match_query(search) if use_fts else None
+
+    statement = select(LearningTrack)
+
+    if match_query:
+        statement = search_repository.apply_search(statement, LearningTrack, match_query)
+    elif search and not use_fts:
+        statement = statement.where(
+            LearningTrack.title.contains(search) |
+            LearningTrack.short_description.contains(search) |
+            LearningTrack.created_by_user_id.contains(search) |
+            LearningTrack.level.contains(search)
+        )
+    
+    if skill:
+        statement = statement.join(TrackSkill, TrackSkill.track_id == LearningTrack.id)
+        statement = statement.join(Skill, Skill.id == TrackSkill.skill_id)
+        statement = statement.where(Skill.name.in_(skill))
+        statement = statement.distinct()
+    
+    if level:
+        statement = statement.where(LearningTrack.level.in_(level))
+        
+    return statement, match_query
+
+
+def iter_filtered(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[List[LearningTrack]]:
+    """
+    Stream filtered tracks in (created_at, id) order as chunks of `chunk_size`.
+
+    Rows are fetched incrementally (yield_per) and each chunk is expunged
+    before the next is read, so full scans run in constant memory.
+    """
+    statement, _ = _filtered_statement(search, skill, level)
+    statement = pagination.order_stable(statement, LearningTrack).execution_options(yield_per=chunk_size)
+
+    for chunk in session.exec(statement).partitions():
+        yield chunk
+        for item in chunk:
+            session.expunge(item)
+
+
+def _count(
+    statement: Select,
+    session: Session,
+    search: Optional[str],
+    count: str,
+    **filters: Optional[List[str]]
+) -> Optional[int]:
+    signature = count_repository.filter_signature(catalog_version.TRACKS, search, **filters)
+    return count_repository.count_filtered(session, statement, catalog_version.TRACKS, signature, count)
+
+
+def facet_counts(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> facet_repository.FacetCounts:
+    """Count filtered tracks per skill and level in one pass (cached)."""
+    statement, _ = _filtered_statement(search, skill, level)
+    signature = count_repository.filter_signature(catalog_version.TRACKS, search, skill=skill, level=level)
+    return facet_repository.facet_counts(
+        session, statement, LearningTrack, FACET_COLUMNS, TrackSkill, "track_id",
+        catalog_version.TRACKS, signature, skill_limit
+    )
+
+
+def _fetch(statement: Select, session: Session, as_rows: bool) -> List:
+    # session.exec() would unwrap a column select to its first column
+    result = session.execute(statement) if as_rows else session.exec(statement)
+    return list(result.all())
+
+
 def list_filtered(
     session: Session,
     search: Optional[str] = None,
     skill: Optional[List[str]] = None,
     level: Optional[List[str]] = None,
     page: int = 1,
-    page_size: int = 12
-) -> Tuple[List[LearningTrack], int]:
+    page_size: int = 12,
+    count: str = count_repository.EXACT,
+    as_rows: bool = False
+) -> Tuple[List[LearningTrack], Optional[int]]:
     """List learning tracks with filtering and pagination.
     
     Args:
         session: Database session
-        search: Search in title, short_description, created_by_user_id
+        search: Search in title, short_description, created_by_user_id, level
+            (word-prefix match ranked by BM25 with the FTS backend)
         skill: Filter by skill names (via track_skills junction)
         level: Filter by difficulty level
         page: Page number (1-indexed)
         page_size: Number of items per page
+        count: Total count mode ('exact', 'estimate' or 'none')
+        as_rows: Return READ_COLUMNS row tuples instead of ORM objects
     
     Returns:
-        Tuple of (tracks list, total count)
+        Tuple of (tracks list, total count or None when count='none')
     """
-    
-    def _apply_filters(statement):
-        """Apply all filters to a statement."""
-        nonlocal search, skill, level
-        
-        if search:
-            statement = statement.where(
-                LearningTrack.title.contains(search) |
-                LearningTrack.short_description.contains(search) |
-                LearningTrack.created_by_user_id.contains(search) |
-                LearningTrack.level.contains(search)
-            )
-        
-        if skill:
-            statement = statement.join(TrackSkill, TrackSkill.track_id == LearningTrack.id)
-            statement = statement.join(Skill, Skill.id == TrackSkill.skill_id)
-            statement = statement.where(Skill.name.in_(skill))
-            statement = statement.distinct()
-        
-        if level:
-            statement = statement.where(LearningTrack.level.in_(level))
-            
-        return statement
-    
-    # Start with base query
-    statement = select(LearningTrack)
-    statement = _apply_filters(statement)
+    statement, match_query = _filtered_statement(search, skill, level)
     
     # Get total count from the filtered query
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total = session.exec(count_statement).one()
+    total = _count(statement, session, search, count, skill=skill, level=level)
+
+    if as_rows:
+        statement = statement.with_only_columns(*READ_COLUMNS)
     
-    # Apply pagination to main query
+    # Apply ordering and pagination to main query
+    if match_query:
+        statement = search_repository.order_by_rank(statement, LearningTrack)
+    statement = pagination.order_stable(statement, LearningTrack)
     statement = statement.offset((page - 1) * page_size).limit(page_size)
     
     # Execute query
-    tracks = session.exec(statement).all()
+    tracks = _fetch(statement, session, as_rows)
     
-    return list(tracks), total
+    return tracks, total
+
+
+def list_filtered_keyset(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    cursor: Optional[pagination.Cursor] = None,
+    page_size: int = 12,
+    count: str = count_repository.EXACT,
+    as_rows: bool = False
+) -> Tuple[List[LearningTrack], Optional[int], Optional[str], Optional[str]]:
+    """List learning tracks after/before a cursor in (created_at, id) order.
+
+    With `as_rows`, returns READ_COLUMNS row tuples instead of ORM objects.
+    
+    Returns:
+        Tuple of (tracks list, total count, next cursor, prev cursor)
+    """
+    statement, _ = _filtered_statement(search, skill, level)
+    total = _count(statement, session, search, count, skill=skill, level=level)
+
+    if as_rows:
+        statement = statement.with_only_columns(*READ_COLUMNS)
+
+    statement = pagination.apply_keyset(statement, LearningTrack, cursor, page_size)
+    rows = _fetch(statement, session, as_rows)
+    tracks, next_cursor, prev_cursor = pagination.finish_keyset(rows, cursor, page_size)
+
+    return tracks, total, next_cursor, prev_cursor
@@ -1,11 +1,14 @@
 
 """Repository for managing track-resource relationships."""
 
-from typing import List, Tuple
+from datetime import datetime
+from typing import Dict, List, Tuple
 from uuid import UUID
+from sqlalchemy import bindparam, func, insert, update
 from sqlmodel import Session, select, delete
+from app.core import catalog_version
 from app.models.track_resource import TrackResource
-from app.utils.model_helpers import dbid
+from app.utils.model_helpers import generate_id
 
 
 def add_resource_to_track(
@@ -17,12 +20,13 @@ def add_resource_to_track(
 ) -> TrackResource:
     """Add a resource to a track at a specific position."""
     track_resource = TrackResource(
-        track_id=dbid(track_id),
-        resource_id=dbid(resource_id),
+        track_id=track_id,
+        resource_id=resource_id,
         position=position
     )
     session.add(track_resource)
     session.flush()
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
 
     if commit:
         session.commit()
@@ -38,11 +42,12 @@ def remove_resource_from_track(
 ) -> bool:
     """Remove a resource from a track. Returns True if removed."""
     stmt = delete(TrackResource).where(
-        TrackResource.track_id == dbid(track_id),
-        TrackResource.resource_id == dbid(resource_id)
+        TrackResource.track_id == track_id,
+        TrackResource.resource_id == resource_id
     )
     result = session.exec(stmt)
     session.flush()
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
 
     if commit:
         session.commit()
@@ -50,6 +55,93 @@ def remove_resource_from_track(
     return result.rowcount > 0
 
 
+def add_resources_to_track(
+    session: Session,
+    track_id: UUID,
+    positions: Dict[UUID, int],
+    commit: bool = True
+) -> None:
+    """Add resources to a track at the given positions in one executemany."""
+    if not positions:
+        return
+
+    # A Core insert does not autoflush; the track row may still be pending
+    session.flush()
+    now = datetime.utcnow()
+    session.execute(insert(TrackResource.__table__), [
+        {"id": generate_id(), "track_id": track_id, "resource_id": resource_id, "position": position, "created_at": now}
+        for resource_id, position in positions.items()
+    ])
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
+
+    if commit:
+        session.commit()
+
+
+def remove_resources_from_track(
+    session: Session,
+    track_id: UUID,
+    resource_ids: List[UUID],
+    commit: bool = True
+) -> int:
+    """Remove several resources from a track. Returns count of removed resources."""
+    if not resource_ids:
+        return 0
+
+    stmt = delete(TrackResource).where(
+        TrackResource.track_id == track_id,
+        TrackResource.resource_id.in_(resource_ids)
+    )
+    result = session.exec(stmt)
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
+
+    if commit:
+        session.commit()
+
+    return result.rowcount
+
+
+def move_track_resources(
+    session: Session,
+    track_id: UUID,
+    positions: Dict[UUID, int],
+    commit: bool = True
+) -> None:
+    """
+    Give resources already on a track new positions.
+
+    uq_track_position is checked row by row, so when several rows move they
+    are first parked above every current and target position (one UPDATE)
+    and then written to their targets; no intermediate state collides.
+    """
+    if not positions:
+        return
+
+    table = TrackResource.__table__
+    if len(positions) > 1:
+        span = (
+            select(func.max(func.max(TrackResource.position), max(positions.values())) - func.min(TrackResource.position) + 1)
+            .where(TrackResource.track_id == track_id)
+            .scalar_subquery()
+        )
+        session.execute(
+            update(table)
+            .where(table.c.track_id == track_id, table.c.resource_id.in_(list(positions)))
+            .values(position=table.c.position + span)
+        )
+
+    session.execute(
+        update(table)
+        .where(table.c.track_id == bindparam("t_id"), table.c.resource_id == bindparam("r_id"))
+        .values(position=bindparam("new_position")),
+        [{"t_id": track_id, "r_id": resource_id, "new_position": position} for resource_id, position in positions.items()],
+    )
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
+
+    if commit:
+        session.commit()
+
+
 def get_track_resources(
     session: Session,
     track_id: UUID
@@ -57,12 +149,10 @@ def get_track_resources(
     """Get all resource IDs for a track with their positions."""
     stmt = (
         select(TrackResource.resource_id, TrackResource.position)
-        .where(TrackResource.track_id == dbid(track_id))
+        .where(TrackResource.track_id == track_id)
         .order_by(TrackResource.position)
     )
-    results = session.exec(stmt).all()
-    # Convert hex strings back to UUID objects
-    return [(UUID(resource_id), position) for resource_id, position in results]
+    return [(resource_id, position) for resource_id, position in session.exec(stmt).all()]
 
 
 def clear_track_resources(
@@ -71,9 +161,10 @@ def clear_track_resources(
     commit: bool = True
 ) -> int:
     """Remove all resources from a track. Returns count of removed resources."""
-    stmt = delete(TrackResource).where(TrackResource.track_id == dbid(track_id))
+    stmt = delete(TrackResource).where(TrackResource.track_id == track_id)
     result = session.exec(stmt)
     session.flush()
+    catalog_version.mark_item_changed(session, catalog_version.TRACKS, track_id)
 
     if commit:
         session.commit()
@@ -87,8 +178,20 @@ def get_tracks_for_resource(
 ) -> List[Tuple[UUID, int]]:
     """Get all tracks that contain a resource with their positions."""
     stmt = select(TrackResource.track_id, TrackResource.position).where(
-        TrackResource.resource_id == dbid(resource_id)
+        TrackResource.resource_id == resource_id
     )
-    results = session.exec(stmt).all()
-    # Convert hex strings back to UUID objects
-    return [(UUID(track_id), position) for track_id, position in results]
+    return [(track_id, position) for track_id, position in session.exec(stmt).all()]
+
+
+def get_track_ids_for_resources(
+    session: Session,
+    resource_ids: List[UUID]
+) -> List[UUID]:
+    """Get the distinct tracks that contain any of the given resources."""
+    if not resource_ids:
+        return []
+
+    stmt = select(TrackResource.track_id).where(
+        TrackResource.resource_id.in_(resource_ids)
+    ).distinct()
+    return list(session.exec(stmt).all())
@@ -0,0 +1,22 @@
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+from typing import Any, Dict, Literal, Optional
+from uuid import UUID
+
+
+class ChangeEntry(TypedDict):
+    """One changed item: its current state (upsert) or its removal (delete)."""
+    op: Literal["upsert", "delete"]
+    collection: str
+    id: UUID
+    item: Optional[Dict[str, Any]]  # Same fields as the collection's listing items; None for deletes
+
+
+class ChangeFeedEnd(TypedDict):
+    """Last line of a change feed."""
+    next: str  # Token to pass as `since` on the next call
+    more: bool  # True when `limit` cut the feed short; call again right away
+
+
+change_entry_adapter = TypeAdapter(ChangeEntry)
+change_feed_end_adapter = TypeAdapter(ChangeFeedEnd)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class ResourceFacetsResponse(BaseModel):
+    total: int  # Resources matching the filters
+    skills: List[FacetValue]  # Top skills only (skill_limit), by count
+    levels: List[FacetValue]
+    resource_types: List[FacetValue]
+
+
+class TrackFacetsResponse(BaseModel):
+    total: int  # Tracks matching the filters
+    skills: List[FacetValue]  # Top skills only (skill_limit), by count
+    levels: List[FacetValue]
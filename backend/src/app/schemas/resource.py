@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing_extensions import TypedDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List, Dict
@@ -35,11 +36,35 @@ class ResourceRead(BaseModel):
     created_by_user_id: str  # UUID hex string
     created_at: datetime
     provider_metadata: Dict
+    snippet: Optional[str] = None  # Highlighted search match, only when requested
     
     class Config:
         from_attributes = True
 
 
+class ResourceReadRow(TypedDict):
+    """ResourceRead as a plain dict, for listings serialized without model validation.
+
+    Keys must be inserted in this order; they are serialized in insertion order.
+    """
+    id: UUID
+    title: str
+    short_description: str
+    url: str
+    platform: str
+    resource_type: str
+    level: Optional[str]
+    estimated_time: Optional[str]
+    skills: List[str]
+    author: Optional[str]
+    image_url: str
+    default_funding_type: str
+    created_by_user_id: str
+    created_at: datetime
+    provider_metadata: Dict
+    snippet: Optional[str]
+
+
 class ResourceUpdate(BaseModel):
     title: Optional[str] = None
     short_description: Optional[str] = None
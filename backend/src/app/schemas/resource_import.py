@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ResourceImportError(BaseModel):
+    line: int  # 1-based line number in the NDJSON input
+    error: str
+    existing_resource_id: Optional[str] = None  # Set for duplicates of a stored resource
+
+
+class ResourceImportResponse(BaseModel):
+    lines: int  # Non-blank lines read
+    imported: int
+    failed: int
+    errors: List[ResourceImportError]  # Capped; `failed` holds the full count
+    elapsed_seconds: float
+    rows_per_second: float
@@ -2,13 +2,14 @@ from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List, Literal, Union
+from typing_extensions import TypedDict
 from app.utils.enums import DifficultyLevel
 from app.schemas.resource import ResourceCreate
 
 
 class ExistingResourceRef(BaseModel):
     kind: Literal["existing"] = "existing"
-    resource_id: str
+    resource_id: UUID
     position: int
 
 
@@ -76,11 +77,29 @@ class TrackRead(BaseModel):
     image_url: Optional[str] = None
     created_by_user_id: str
     created_at: datetime
+    snippet: Optional[str] = None  # Highlighted search match, only when requested
 
     class Config:
         from_attributes = True
 
 
+class TrackReadRow(TypedDict):
+    """TrackRead as a plain dict, for listings serialized without model validation.
+
+    Keys must be inserted in this order; they are serialized in insertion order.
+    """
+    id: UUID
+    title: str
+    short_description: str
+    level: Optional[str]
+    skills: List[str]
+    estimated_time: Optional[str]
+    image_url: Optional[str]
+    created_by_user_id: str
+    created_at: datetime
+    snippet: Optional[str]
+
+
 class TrackReadWithResources(TrackRead):
     """Track with full details including resources."""
     resources: List[ResourceSummary] = Field(default_factory=list, min_length=1)
\ No newline at end of file
@@ -1,10 +1,28 @@
-from pydantic import BaseModel
-from typing import List
-from app.schemas.track import TrackRead
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+from typing import List, Optional
+from app.schemas.track import TrackRead, TrackReadRow
 
 class TrackListResponse(BaseModel):
     items: List[TrackRead]
-    total: int
+    total: Optional[int] = None  # None when count='none'; approximate when count='estimate'
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Set in cursor mode only
+    prev_cursor: Optional[str] = None
+
+
+class TrackListPage(TypedDict):
+    """TrackListResponse as a plain dict (same keys, same order)."""
+    items: List[TrackReadRow]
+    total: Optional[int]
+    page: int
+    page_size: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+# Built once: serializes trusted rows straight to JSON bytes, no validation pass
+track_list_adapter = TypeAdapter(TrackListPage)
@@ -0,0 +1,151 @@
+"""Incremental change feed over the catalog_changes log (see catalog_version).
+
+A client keeps a mirror of the catalog by taking the current token (call
+without `since`), loading the full listings, then polling with
+`since=<token>`. Every item changed after the token is sent once, with its
+current state (upsert) or as a delete when its row no longer exists, in the
+order of its last change; the final line carries the next token.
+
+The log only grows by one entry per write, and compaction drops entries
+that a newer entry for the same item supersedes, so it never changes what a
+feed returns and tokens stay valid indefinitely.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+from sqlmodel import Session
+from app.core import catalog_version
+from app.core.config import get_settings
+from app.core.db import engine, read_engine
+from app.repositories import change_repository, skill_repository, track_repository, track_skill_repository
+from app.schemas.change import ChangeEntry, change_entry_adapter, change_feed_end_adapter
+from app.schemas.track import TrackRead
+from app.services import resource_service
+
+logger = logging.getLogger(__name__)
+
+# Changed items loaded and encoded per round trip while streaming
+STREAM_CHUNK_SIZE = 500
+
+# Listing-only fields left out of feed items
+_EXCLUDED_FIELDS = {"snippet"}
+
+
+def _encode_token(seq: int) -> str:
+    raw = json.dumps({"s": seq}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> int:
+    try:
+        seq = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))["s"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid change token")
+    if not isinstance(seq, int) or seq < 0:
+        raise HTTPException(status_code=400, detail="Invalid change token")
+    return seq
+
+
+def _load_resources(session: Session, ids: List[UUID]) -> Dict[UUID, Dict]:
+    rows = resource_service.get_read_rows(ids, session)
+    return {row["id"]: {k: v for k, v in row.items() if k not in _EXCLUDED_FIELDS} for row in rows}
+
+
+def _load_tracks(session: Session, ids: List[UUID]) -> Dict[UUID, Dict]:
+    tracks = track_repository.get_by_ids(ids, session)
+    skills_by_id = track_skill_repository.list_skills_for_tracks(session, list(tracks))
+    items = {}
+    for track_id, track in tracks.items():
+        read = TrackRead.model_validate(track)
+        read.skills = skills_by_id.get(track_id, [])
+        items[track_id] = read.model_dump(exclude=_EXCLUDED_FIELDS)
+    return items
+
+
+def _load_skills(session: Session, ids: List[UUID]) -> Dict[UUID, Dict]:
+    return {s.id: {"id": s.id, "name": s.name} for s in skill_repository.get_by_ids(session, ids)}
+
+
+_LOADERS: Dict[str, Callable[[Session, List[UUID]], Dict[UUID, Dict]]] = {
+    catalog_version.RESOURCES: _load_resources,
+    catalog_version.TRACKS: _load_tracks,
+    catalog_version.SKILLS: _load_skills,
+}
+
+
+def _encode_chunk(session: Session, changed: List[Tuple[str, UUID, int]]) -> bytes:
+    ids_by_collection: Dict[str, List[UUID]] = {}
+    for collection, item_id, _ in changed:
+        ids_by_collection.setdefault(collection, []).append(item_id)
+    items = {
+        collection: _LOADERS[collection](session, ids)
+        for collection, ids in ids_by_collection.items()
+        if collection in _LOADERS
+    }
+
+    lines = []
+    for collection, item_id, _ in changed:
+        if collection not in items:
+            continue
+        item = items[collection].get(item_id)
+        entry: ChangeEntry = {
+            "op": "upsert" if item is not None else "delete",
+            "collection": collection,
+            "id": item_id,
+            "item": item,
+        }
+        lines.append(change_entry_adapter.dump_json(entry) + b"\n")
+    return b"".join(lines)
+
+
+def _stream(since: Optional[int], collections: Optional[List[str]], limit: int) -> Iterator[bytes]:
+    # The stream outlives the request handler, so it owns its read session
+    with Session(read_engine) as session:
+        until = change_repository.head(session)
+        more = False
+        if since is not None:
+            changed = change_repository.list_changed_items(session, since, until, collections, limit + 1)
+            more = len(changed) > limit
+            changed = changed[:limit]
+            for start in range(0, len(changed), STREAM_CHUNK_SIZE):
+                yield _encode_chunk(session, changed[start:start + STREAM_CHUNK_SIZE])
+            if more:
+                until = changed[-1][2]
+        yield change_feed_end_adapter.dump_json({"next": _encode_token(until), "more": more}) + b"\n"
+
+
+def stream_changes(since: Optional[str], collections: Optional[List[str]] = None, limit: int = 10000) -> Iterator[bytes]:
+    """
+    Yield NDJSON change entries after the `since` token, then the next token.
+    Without `since`, only the current token is sent.
+    """
+    # Validate before the response starts; the stream itself cannot fail with a 400
+    return _stream(_decode_token(since) if since is not None else None, collections, limit)
+
+
+def compact_changes(session: Session) -> int:
+    """Drop superseded log entries older than the retention window; returns how many."""
+    before = datetime.utcnow() - timedelta(seconds=get_settings().CHANGE_LOG_RETENTION_SECONDS)
+    return change_repository.compact(session, before)
+
+
+def _compact() -> None:
+    with Session(engine) as session:
+        compact_changes(session)
+
+
+async def compact_periodically() -> None:
+    """Compact the change log every CHANGE_LOG_COMPACT_INTERVAL_SECONDS (a lifespan background task)."""
+    interval = get_settings().CHANGE_LOG_COMPACT_INTERVAL_SECONDS
+    while interval:
+        try:
+            await asyncio.to_thread(_compact)
+        except Exception:
+            logger.exception("Change log compaction failed")
+        await asyncio.sleep(interval)
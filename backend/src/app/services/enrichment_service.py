@@ -0,0 +1,506 @@
+"""Background enrichment of resources with metadata from their provider pages.
+
+New resources are queued once the creating session commits, so
+`create_resource` never waits on the network. A pool of asyncio workers
+fetches each page through a pluggable `Fetcher` (stdlib urllib in a thread
+by default) with at most ENRICHMENT_PER_HOST_LIMIT requests in flight per
+host. Network errors, 429 and 5xx responses are retried with exponential
+backoff and jitter, honouring Retry-After. Parsed metadata is cached per
+normalized_url, and results are written in batches (one executemany UPDATE
+per ENRICHMENT_BATCH_SIZE rows or ENRICHMENT_FLUSH_INTERVAL_SECONDS).
+
+The default fetcher only talks to public addresses: the host is resolved
+before the request and on every redirect, and the connected peer is checked
+again (so DNS rebinding cannot slip through). Loopback, private, link-local
+(cloud metadata) and other non-global addresses are refused unless the
+hostname is listed in ENRICHMENT_ALLOWED_HOSTS.
+
+Permanent failures (4xx other than 429, unsupported or blocked URLs) are stored as
+{"error": ...} and not fetched again. Transient ones (network errors,
+timeouts, 429, 5xx) that outlast the in-process retries are stored with a
+failure count and a `retry_at`, doubling from
+ENRICHMENT_RETRY_FAILED_AFTER_SECONDS, and picked up again by the periodic
+backfill until ENRICHMENT_MAX_FAILURES is reached.
+
+Off by default: it makes outbound requests to user-supplied URLs.
+"""
+
+import asyncio
+import http.client
+import ipaddress
+import logging
+import random
+import socket
+import urllib.error
+import urllib.request
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AbstractSet, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from uuid import UUID
+from sqlalchemy import event
+from sqlmodel import Session
+from app.core.config import get_settings
+from app.core.db import engine
+from app.repositories import resource_repository
+from app.repositories.count_repository import CountCache
+from app.utils.provider_metadata import parse_provider_metadata
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "WebAcademyBot/1.0 (provider metadata)"
+MAX_PAGE_BYTES = 1024 * 1024
+
+_RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+_MAX_RETRY_AFTER_SECONDS = 60.0
+_PENDING_KEY = "enrichment_pending"
+
+
+
+class Job(NamedTuple):
+    resource_id: UUID
+    url: str
+    normalized_url: str
+    failures: int = 0  # Transient failures recorded by earlier runs
+
+
+@dataclass
+class FetchResponse:
+    status: int
+    body: str = ""
+    retry_after: Optional[float] = None  # Seconds, from a Retry-After header
+
+
+# Fetches one page; raises BlockedURLError for refused targets, anything else on network errors
+Fetcher = Callable[[str], Awaitable[FetchResponse]]
+
+
+class BlockedURLError(ValueError):
+    """The URL (or a redirect) points at a non-public address or an unsupported scheme."""
+
+
+def _check_address(address: str) -> None:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if not ip.is_global or ip.is_multicast:
+        raise BlockedURLError(f"blocked address {ip}")
+
+
+def _check_url(url: str, allowed_hosts: AbstractSet[str]) -> None:
+    """Refuse non-http(s) URLs and hosts that resolve to any non-public address."""
+    try:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port
+    except ValueError as exc:
+        raise BlockedURLError(f"invalid URL: {exc}") from None
+    if parts.scheme not in ("http", "https"):
+        raise BlockedURLError("unsupported URL scheme")
+    if not host:
+        raise BlockedURLError("invalid URL: no host")
+    if host in allowed_hosts:
+        return
+    try:
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        return  # Fails again on connect, as a (retried) network error
+    for *_, sockaddr in addresses:
+        _check_address(sockaddr[0])
+
+
+class _GuardedConnection:
+    """Checks the connected peer, closing the gap between resolving and connecting."""
+    allowed_hosts: AbstractSet[str] = frozenset()
+
+    def connect(self) -> None:
+        super().connect()
+        if self.host.lower() not in self.allowed_hosts:
+            try:
+                _check_address(self.sock.getpeername()[0])
+            except BlockedURLError:
+                self.close()
+                raise
+
+
+class _GuardedHTTPConnection(_GuardedConnection, http.client.HTTPConnection):
+    pass
+
+
+class _GuardedHTTPSConnection(_GuardedConnection, http.client.HTTPSConnection):
+    pass
+
+
+def _connection_factory(connection_class: type, allowed_hosts: AbstractSet[str]) -> Callable:
+    def connect(host: str, **kwargs):
+        connection = connection_class(host, **kwargs)
+        connection.allowed_hosts = allowed_hosts
+        return connection
+    return connect
+
+
+class _GuardedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, allowed_hosts: AbstractSet[str]):
+        super().__init__()
+        self._connection = _connection_factory(_GuardedHTTPConnection, allowed_hosts)
+
+    def http_open(self, req):
+        return self.do_open(self._connection, req)
+
+
+class _GuardedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, allowed_hosts: AbstractSet[str]):
+        super().__init__()
+        self._connection = _connection_factory(_GuardedHTTPSConnection, allowed_hosts)
+
+    def https_open(self, req):
+        return self.do_open(self._connection, req, context=self._context)
+
+
+class _GuardedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def __init__(self, allowed_hosts: AbstractSet[str]):
+        super().__init__()
+        self.allowed_hosts = allowed_hosts
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_url(newurl, self.allowed_hosts)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _guarded_opener(allowed_hosts: AbstractSet[str]) -> urllib.request.OpenerDirector:
+    # No ProxyHandler from the environment: a proxy would connect on our behalf, past the peer check
+    return urllib.request.build_opener(
+        urllib.request.ProxyHandler({}),
+        _GuardedHTTPHandler(allowed_hosts),
+        _GuardedHTTPSHandler(allowed_hosts),
+        _GuardedRedirectHandler(allowed_hosts),
+    )
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+
+
+def _urllib_get(opener: urllib.request.OpenerDirector, url: str, timeout: float, allowed_hosts: AbstractSet[str]) -> FetchResponse:
+    _check_url(url, allowed_hosts)
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+    try:
+        with opener.open(request, timeout=timeout) as response:
+            charset = response.headers.get_content_charset() or "utf-8"
+            return FetchResponse(response.status, response.read(MAX_PAGE_BYTES).decode(charset, errors="replace"))
+    except urllib.error.HTTPError as exc:
+        return FetchResponse(exc.code, retry_after=_retry_after(exc.headers.get("Retry-After")))
+
+
+def urllib_fetcher(timeout: float, allowed_hosts: AbstractSet[str] = frozenset()) -> Fetcher:
+    """
+    Default fetcher: a blocking urllib GET run in a worker thread, refusing
+    non-public addresses except for hostnames in `allowed_hosts`.
+    """
+    allowed_hosts = frozenset(host.lower() for host in allowed_hosts)
+    opener = _guarded_opener(allowed_hosts)
+
+    async def fetch(url: str) -> FetchResponse:
+        return await asyncio.to_thread(_urllib_get, opener, url, timeout, allowed_hosts)
+    return fetch
+
+
+@dataclass
+class EnrichmentStats:
+    submitted: int = 0
+    dropped: int = 0  # Queue full; picked up by the next startup backfill
+    fetches: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    failed: int = 0
+    retry_later: int = 0  # Transient failures stored with a retry_at
+    written: int = 0
+    write_batches: int = 0
+
+
+class EnrichmentPool:
+    """Asyncio workers that fetch, parse and store provider metadata for queued resources."""
+
+    def __init__(
+        self,
+        fetcher: Fetcher,
+        workers: int = 8,
+        per_host_limit: int = 2,
+        max_attempts: int = 3,
+        backoff_seconds: float = 0.5,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        retry_failed_after_seconds: float = 3600.0,
+        max_failures: int = 5,
+        cache: Optional[CountCache] = None
+    ):
+        self.fetcher = fetcher
+        self.workers = workers
+        self.per_host_limit = per_host_limit
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retry_failed_after_seconds = retry_failed_after_seconds
+        self.max_failures = max_failures
+        # Bounded TTL LRU keyed by normalized_url; entries are unversioned (version 0)
+        self.cache = cache or CountCache(10000, 86400.0)
+        self.stats = EnrichmentStats()
+        self.queue: "asyncio.Queue[Job]" = asyncio.Queue(queue_size)
+        # Host -> [semaphore, holders + waiters]; entries are dropped when idle, so only hosts in use are kept
+        self._hosts: Dict[str, list] = {}
+        self._results: List[Tuple[UUID, str, Dict]] = []
+        # (id, normalized_url) queued or fetched but not yet written, so backfills do not queue them twice
+        self._pending: Set[Tuple[UUID, str]] = set()
+        self._flush_now = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the workers and the batch writer on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._write_periodically()))
+
+    async def stop(self) -> None:
+        """Cancel the workers and write what has been fetched so far."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush()
+
+    def submit(self, jobs: Iterable[Job]) -> None:
+        """Queue jobs from any thread; jobs that do not fit are dropped."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._enqueue, list(jobs))
+
+    async def put(self, job: Job) -> bool:
+        """Queue a job, waiting for room (for backfills); False if it is already pending."""
+        job = Job(*job)
+        key = (job.resource_id, job.normalized_url)
+        if key in self._pending:
+            return False
+        self._pending.add(key)
+        await self.queue.put(job)
+        self.stats.submitted += 1
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued job is processed and written."""
+        await self.queue.join()
+        await self._flush()
+
+    def _enqueue(self, jobs: List[Job]) -> None:
+        for job in (Job(*job) for job in jobs):
+            key = (job.resource_id, job.normalized_url)
+            if key in self._pending:
+                continue
+            try:
+                self.queue.put_nowait(job)
+                self._pending.add(key)
+                self.stats.submitted += 1
+            except asyncio.QueueFull:
+                self.stats.dropped += 1
+
+    async def _work(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._enrich(job)
+            except Exception:
+                self._pending.discard((job.resource_id, job.normalized_url))
+                logger.exception("Enrichment of %s failed", job.url)
+            finally:
+                self.queue.task_done()
+
+    async def _enrich(self, job: Job) -> None:
+        metadata = self.cache.get(job.normalized_url, 0)
+        if metadata is not None:
+            self.stats.cache_hits += 1
+        else:
+            metadata, transient = await self._fetch_metadata(job.url)
+            now = datetime.utcnow()
+            metadata["fetched_at"] = now.isoformat(timespec="seconds")
+            if transient:
+                metadata["failures"] = job.failures + 1
+                if metadata["failures"] < self.max_failures:
+                    delay = self.retry_failed_after_seconds * 2 ** job.failures
+                    metadata["retry_at"] = (now + timedelta(seconds=delay)).isoformat(timespec="seconds")
+                    self.stats.retry_later += 1
+            elif "error" not in metadata:
+                self.cache.put(job.normalized_url, 0, metadata)
+
+        self._results.append((job.resource_id, job.normalized_url, metadata))
+        if len(self._results) >= self.batch_size:
+            self._flush_now.set()
+
+    async def _fetch_metadata(self, url: str) -> Tuple[Dict, bool]:
+        """Fetch and parse one page; returns (metadata or {"error": ...}, whether the error is transient)."""
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            self.stats.failed += 1
+            return {"error": "unsupported URL scheme"}, False
+
+        host = parts.hostname or ""
+        error, retry_after = "", None
+        for attempt in range(self.max_attempts):
+            if attempt:
+                # Back off without holding the host's slot
+                self.stats.retries += 1
+                delay = self.backoff_seconds * 2 ** (attempt - 1) + random.uniform(0, self.backoff_seconds)
+                await asyncio.sleep(max(delay, min(retry_after or 0, _MAX_RETRY_AFTER_SECONDS)))
+
+            async with self._host_slot(host):
+                self.stats.fetches += 1
+                try:
+                    response = await self.fetcher(url)
+                except BlockedURLError as exc:
+                    self.stats.failed += 1
+                    return {"error": str(exc)}, False
+                except Exception as exc:  # network errors and timeouts are retried
+                    error, retry_after = f"{type(exc).__name__}: {exc}"[:200], None
+                    continue
+
+            if 200 <= response.status < 300:
+                return await asyncio.to_thread(parse_provider_metadata, response.body), False
+            error, retry_after = f"HTTP {response.status}", response.retry_after
+            if response.status not in _RETRY_STATUSES:
+                self.stats.failed += 1
+                return {"error": error}, False
+
+        self.stats.failed += 1
+        return {"error": error}, True
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str):
+        """Hold one of the host's `per_host_limit` slots."""
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(self.per_host_limit), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._hosts[host]
+
+    async def _write_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self._flush()
+            except Exception:
+                logger.exception("Writing provider metadata failed")
+
+    async def _flush(self) -> None:
+        batch, self._results = self._results, []
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(_write, batch)
+        finally:
+            # Written or not, the rows are up to the next backfill from here
+            self._pending.difference_update((resource_id, url) for resource_id, url, _ in batch)
+        self.stats.written += len(batch)
+        self.stats.write_batches += 1
+
+
+def _write(batch: List[Tuple[UUID, str, Dict]]) -> None:
+    with Session(engine) as session:
+        resource_repository.update_provider_metadata(session, batch)
+
+
+def _read_backfill_jobs() -> List[Job]:
+    retry_before = datetime.utcnow().isoformat(timespec="seconds")
+    with Session(engine) as session:
+        return [
+            Job(*row)
+            for chunk in resource_repository.iter_missing_provider_metadata(session, retry_before)
+            for row in chunk
+        ]
+
+
+async def backfill(pool: "EnrichmentPool") -> int:
+    """Queue resources without provider metadata or due for a retry; returns how many were queued."""
+    jobs = await asyncio.to_thread(_read_backfill_jobs)
+    queued = 0
+    for job in jobs:
+        queued += await pool.put(job)
+    return queued
+
+
+async def backfill_periodically(pool: "EnrichmentPool", interval_seconds: float, immediately: bool = True) -> None:
+    """Run `backfill` now (if `immediately`) and then every `interval_seconds` (0 = no repeats); a lifespan task."""
+    run = immediately
+    while True:
+        if run:
+            try:
+                await backfill(pool)
+            except Exception:
+                logger.exception("Provider metadata backfill failed")
+        if not interval_seconds:
+            return
+        await asyncio.sleep(interval_seconds)
+        run = True
+
+
+_pool: Optional[EnrichmentPool] = None
+
+
+def start(fetcher: Optional[Fetcher] = None) -> EnrichmentPool:
+    """Start the process-wide pool on the running loop (from the app lifespan)."""
+    global _pool
+    settings = get_settings()
+    _pool = EnrichmentPool(
+        fetcher or urllib_fetcher(
+            settings.ENRICHMENT_FETCH_TIMEOUT_SECONDS,
+            {host.strip() for host in settings.ENRICHMENT_ALLOWED_HOSTS.split(",") if host.strip()},
+        ),
+        workers=settings.ENRICHMENT_WORKERS,
+        per_host_limit=settings.ENRICHMENT_PER_HOST_LIMIT,
+        max_attempts=settings.ENRICHMENT_MAX_ATTEMPTS,
+        backoff_seconds=settings.ENRICHMENT_BACKOFF_SECONDS,
+        queue_size=settings.ENRICHMENT_QUEUE_SIZE,
+        batch_size=settings.ENRICHMENT_BATCH_SIZE,
+        flush_interval_seconds=settings.ENRICHMENT_FLUSH_INTERVAL_SECONDS,
+        retry_failed_after_seconds=settings.ENRICHMENT_RETRY_FAILED_AFTER_SECONDS,
+        max_failures=settings.ENRICHMENT_MAX_FAILURES,
+        cache=CountCache(settings.ENRICHMENT_CACHE_SIZE, settings.ENRICHMENT_CACHE_TTL_SECONDS),
+    )
+    _pool.start()
+    return _pool
+
+
+async def stop() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
+
+
+def enrich_on_commit(session: Session, jobs: Iterable[Job]) -> None:
+    """Queue resources for enrichment once the session commits (no-op when the pool is off)."""
+    if _pool is not None:
+        session.info.setdefault(_PENDING_KEY, []).extend(jobs)
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_pending(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and _pool is not None:
+        _pool.submit(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
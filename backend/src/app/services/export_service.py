@@ -0,0 +1,104 @@
+"""Streaming catalog export as NDJSON or CSV.
+
+Rows are read in chunks through the repositories' `iter_filtered` generators
+and skills are loaded with one query per chunk, so an export holds at most
+one chunk in memory regardless of catalog size.
+"""
+
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from sqlmodel import Session
+from app.core.db import read_engine
+from app.repositories import resource_repository, resource_skill_repository, track_repository, track_skill_repository
+from app.schemas.resource import ResourceRead
+from app.schemas.track import TrackRead
+
+NDJSON = "ndjson"
+CSV = "csv"
+EXPORT_FORMATS = (NDJSON, CSV)
+
+MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+# Listing-only fields left out of exports
+_EXCLUDED_FIELDS = {"snippet"}
+
+
+def _csv_columns(schema) -> List[str]:
+    return [name for name in schema.model_fields if name not in _EXCLUDED_FIELDS]
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+def _encode_chunk(items: List[BaseModel], fmt: str, columns: List[str]) -> str:
+    if fmt == NDJSON:
+        return "".join(item.model_dump_json(exclude=_EXCLUDED_FIELDS) + "\n" for item in items)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for item in items:
+        data = item.model_dump(mode="json")
+        writer.writerow([_csv_value(data[c]) for c in columns])
+    return buffer.getvalue()
+
+
+def _stream(
+    chunks: Callable[[Session], Iterator[List]],
+    list_skills: Callable[[Session, List[UUID]], Dict[UUID, List[str]]],
+    schema,
+    fmt: str
+) -> Iterator[str]:
+    columns = _csv_columns(schema)
+    if fmt == CSV:
+        yield ",".join(columns) + "\r\n"
+
+    # The stream outlives the request handler, so it owns its read session
+    with Session(read_engine) as session:
+        for chunk in chunks(session):
+            skills_by_id = list_skills(session, [item.id for item in chunk])
+            items = []
+            for item in chunk:
+                read = schema.model_validate(item)
+                read.skills = skills_by_id.get(item.id, [])
+                items.append(read)
+            yield _encode_chunk(items, fmt, columns)
+
+
+def export_resources(
+    fmt: str = NDJSON,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None
+) -> Iterator[str]:
+    """Yield the filtered resource catalog, one encoded chunk at a time."""
+    return _stream(
+        lambda session: resource_repository.iter_filtered(session, search, skill, level, resource_type),
+        resource_skill_repository.list_skills_for_resources,
+        ResourceRead,
+        fmt,
+    )
+
+
+def export_tracks(
+    fmt: str = NDJSON,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None
+) -> Iterator[str]:
+    """Yield the filtered track catalog (metadata only), one encoded chunk at a time."""
+    return _stream(
+        lambda session: track_repository.iter_filtered(session, search, skill, level),
+        track_skill_repository.list_skills_for_tracks,
+        TrackRead,
+        fmt,
+    )
@@ -0,0 +1,157 @@
+"""Bulk import of learning resources from NDJSON (one ResourceCreate object per line).
+
+Lines are validated one by one, then written in batches: URLs are deduped
+against the store with one IN-query per batch, skills are upserted once per
+batch, and resources plus their skill links go in with multi-row INSERTs.
+Each batch is its own transaction, so a failing batch does not undo the
+batches before it.
+"""
+
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+from app.models.skill import Skill
+from app.schemas.resource import ResourceCreate
+from app.schemas.resource_import import ResourceImportError, ResourceImportResponse
+from app.repositories import resource_repository
+from app.services import enrichment_service, resource_service, skill_service
+from app.utils.normalizers import normalize_url
+from app.utils import validators
+
+IMPORT_BATCH_SIZE = 1000
+
+# Per-line errors kept in the response; the failed count is always complete
+MAX_REPORTED_ERRORS = 1000
+
+
+class _ImportResult:
+    def __init__(self):
+        self.lines = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[ResourceImportError] = []
+
+    def fail(self, line: int, error: str, existing_resource_id: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ResourceImportError(line=line, error=error, existing_resource_id=existing_resource_id))
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return exc.detail if isinstance(exc.detail, str) else json.dumps(exc.detail)
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+            for e in exc.errors()
+        )
+    return str(exc)
+
+
+def _skill_names(names: List[str]) -> List[str]:
+    return list(dict.fromkeys(n for n in (Skill.normalize_name(n) for n in names) if n))
+
+
+def _parse_line(raw: str, created_by_user_id: Optional[str]) -> Tuple[Dict, List[str]]:
+    """Validate one NDJSON line into an insert row plus normalized skill names."""
+    data = ResourceCreate.model_validate_json(raw)
+
+    normalized_url = normalize_url((data.url or "").strip())
+    if not normalized_url:
+        raise HTTPException(status_code=400, detail="Invalid URL")
+    validators.validate_url(normalized_url)
+
+    user_id = created_by_user_id or (data.created_by_user_id.hex if data.created_by_user_id else resource_service.SYSTEM_USER_ID)
+    return resource_service.new_resource_row(data, normalized_url, user_id), _skill_names(data.skills)
+
+
+def _write_batch(batch: List[Tuple[int, Dict, List[str]]], session: Session, result: _ImportResult) -> None:
+    """Dedupe, then insert one batch of parsed lines in a single transaction."""
+    existing = resource_repository.get_ids_by_normalized_urls([row["normalized_url"] for _, row, _ in batch], session)
+
+    first_line: Dict[str, int] = {}
+    accepted: List[Tuple[int, Dict, List[str]]] = []
+    for line_no, row, names in batch:
+        url = row["normalized_url"]
+        if url in existing:
+            result.fail(line_no, "resource_already_exists", existing[url].hex)
+        elif url in first_line:
+            result.fail(line_no, f"duplicate of line {first_line[url]}")
+        else:
+            first_line[url] = line_no
+            accepted.append((line_no, row, names))
+
+    if not accepted:
+        return
+
+    try:
+        resource_repository.bulk_insert([row for _, row, _ in accepted], session)
+        skill_service.set_resources_skills(
+            session, {row["id"]: row_names for _, row, row_names in accepted if row_names},
+            commit=False, new_items=True
+        )
+        enrichment_service.enrich_on_commit(session, [(row["id"], row["url"], row["normalized_url"]) for _, row, _ in accepted])
+        session.commit()
+    except SQLAlchemyError as exc:
+        session.rollback()
+        for line_no, _, _ in accepted:
+            result.fail(line_no, f"batch failed: {exc.__class__.__name__}")
+        return
+
+    result.imported += len(accepted)
+
+
+def import_resources(
+    lines: Iterable[Union[str, bytes]],
+    session: Session,
+    created_by_user_id: Optional[str] = None,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> ResourceImportResponse:
+    """Import NDJSON lines; invalid or duplicate lines are reported, not fatal."""
+    started = time.perf_counter()
+    result = _ImportResult()
+    batch: List[Tuple[int, Dict, List[str]]] = []
+
+    for line_no, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        result.lines += 1
+
+        try:
+            row, names = _parse_line(raw, created_by_user_id)
+        except (ValidationError, HTTPException) as exc:
+            result.fail(line_no, _error_message(exc))
+            continue
+
+        batch.append((line_no, row, names))
+        if len(batch) >= batch_size:
+            _write_batch(batch, session, result)
+            batch = []
+
+    if batch:
+        _write_batch(batch, session, result)
+
+    elapsed = time.perf_counter() - started
+    return ResourceImportResponse(
+        lines=result.lines,
+        imported=result.imported,
+        failed=result.failed,
+        errors=sorted(result.errors, key=lambda e: e.line),
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(result.imported / elapsed, 1) if elapsed > 0 else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    # python -m app.services.resource_import_service catalog.ndjson
+    import sys
+    from app.core.db import create_db_and_tables, engine
+
+    create_db_and_tables()
+    with open(sys.argv[1], encoding="utf-8") as f, Session(engine) as cli_session:
+        report = import_resources(f, cli_session)
+    print(report.model_dump_json(indent=2))
@@ -1,14 +1,20 @@
+from datetime import datetime
 from uuid import UUID
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from sqlmodel import Session
 from fastapi import HTTPException
 from app.models.resource import LearningResource
-from app.schemas.resource import ResourceCreate, ResourceRead, ResourceUpdate, ResourceLookupResponse
-from app.repositories import resource_repository, resource_skill_repository
-from app.services.skill_service import set_resource_skills
+from app.schemas.resource import ResourceCreate, ResourceRead, ResourceReadRow, ResourceUpdate, ResourceLookupResponse
+from app.schemas.facet import FacetValue, ResourceFacetsResponse
+from app.repositories import resource_repository, search_repository, count_repository
+from app.services.skill_service import set_resource_skills, set_resources_skills
+from app.services import enrichment_service, skill_loader
 from app.utils.normalizers import normalize_url
-from app.utils import validators
+from app.utils import validators, pagination
 from app.utils.defaults import get_default_resource_image_url
+from app.utils.model_helpers import generate_id
+
+SYSTEM_USER_ID = "00000000000000000000000000000000"
 
 def _normalize_and_validate_url(raw_url: str) -> str:
     raw_url = (raw_url or "").strip()
@@ -25,8 +31,37 @@ def _normalize_and_validate_url(raw_url: str) -> str:
 
 def _get_resource_skills(resource_id: UUID, session: Session) -> List[str]:
     """Get the skills for a resource."""
-    skills = resource_skill_repository.list_skills_for_resource(session, resource_id)
-    return [s.name for s in skills]
+    return skill_loader.resource_skills(session).load(resource_id)
+
+
+def _construct_read_rows(rows: List, session: Session) -> List[ResourceReadRow]:
+    """
+    Build listing rows from `resource_repository.READ_COLUMNS` tuples with one
+    skills query. Column values come from the DB already typed, so no model
+    validation runs; the route serializes them with `resource_list_adapter`.
+    """
+    skills_by_id = skill_loader.resource_skills(session).load_many(r.id for r in rows)
+    return [
+        {
+            "id": r.id,
+            "title": r.title,
+            "short_description": r.short_description,
+            "url": r.url,
+            "platform": r.platform,
+            "resource_type": r.resource_type,
+            "level": r.level,
+            "estimated_time": r.estimated_time,
+            "skills": skills_by_id[r.id],
+            "author": r.author,
+            "image_url": r.image_url,
+            "default_funding_type": r.default_funding_type,
+            "created_by_user_id": r.created_by_user_id,
+            "created_at": r.created_at,
+            "provider_metadata": r.provider_metadata if r.provider_metadata is not None else {},
+            "snippet": None,
+        }
+        for r in rows
+    ]
 
 
 def _get_resource_by_id(resource_id: UUID, session: Session) -> LearningResource:
@@ -45,7 +80,7 @@ def _check_resource_not_exist(normalized_url: str, session: Session):
     if resource:
         raise HTTPException(
             status_code=409,
-            detail={"error": "resource_already_exists", "existing_resource_id": resource.id},
+            detail={"error": "resource_already_exists", "existing_resource_id": resource.id.hex},
         )
     
     return resource
@@ -57,6 +92,17 @@ def _construct_read_resource(resource: LearningResource, skills: List[str]) -> R
     return result
 
 
+def _attach_snippets(rows: List[ResourceReadRow], search: Optional[str], session: Session) -> None:
+    """Fill in highlighted search snippets for a page of listing rows."""
+    match_query = search_repository.build_match_query(search)
+    if not match_query:
+        return
+
+    snippets = search_repository.get_snippets(session, "learning_resources", match_query, [r["id"] for r in rows])
+    for r in rows:
+        r["snippet"] = snippets.get(r["id"])
+
+
 def lookup_resource_by_url(url: str, session: Session) -> ResourceLookupResponse:
     """Lookup a resource by URL to check for duplicates."""
     normalized_url = _normalize_and_validate_url(url)
@@ -66,7 +112,7 @@ def lookup_resource_by_url(url: str, session: Session) -> ResourceLookupResponse
         return ResourceLookupResponse(exists=False, normalized_url=normalized_url, resource=None)
     
     # Get skills for the resource
-    skills = _get_resource_skills(UUID(resource.id), session)
+    skills = _get_resource_skills(resource.id, session)
     resource_read = _construct_read_resource(resource, skills)
     
     return ResourceLookupResponse(
@@ -76,6 +122,61 @@ def lookup_resource_by_url(url: str, session: Session) -> ResourceLookupResponse
     )
 
 
+def new_resource_row(data: ResourceCreate, normalized_url: str, created_by_user_id: str) -> Dict:
+    """Validate a ResourceCreate and build its insert row (for bulk inserts)."""
+    validators.validate_platform(data.platform)
+    validators.validate_resource_type(data.resource_type)
+    validators.validate_difficulty_level(data.level)
+    validators.validate_funding_type(data.default_funding_type)
+
+    return {
+        "id": generate_id(),
+        "title": data.title,
+        "short_description": data.short_description,
+        "url": data.url,
+        "normalized_url": normalized_url,
+        "platform": data.platform,
+        "resource_type": data.resource_type,
+        "level": data.level,
+        "estimated_time": data.estimated_time,
+        "author": data.author,
+        "image_url": get_default_resource_image_url(data.image_url),
+        "default_funding_type": data.default_funding_type,
+        "created_by_user_id": created_by_user_id,
+        "created_at": datetime.utcnow(),
+        "provider_metadata": {},
+    }
+
+
+def create_resources(items: List[ResourceCreate], session: Session, created_by_user_id: str) -> List[UUID]:
+    """
+    Create many resources in the current transaction; returns one id per item.
+
+    All items are validated before anything is written. URLs are deduped
+    with one query: an item whose URL already exists (or repeats an earlier
+    item) gets the existing id instead of a 409. Rows and skill links go in
+    with bulk inserts.
+    """
+    normalized_urls = [_normalize_and_validate_url(data.url) for data in items]
+    rows = [new_resource_row(data, url, created_by_user_id) for data, url in zip(items, normalized_urls)]
+
+    id_by_url = resource_repository.get_ids_by_normalized_urls(list(dict.fromkeys(normalized_urls)), session)
+    new_rows = []
+    skills_by_id = {}
+    for data, row in zip(items, rows):
+        if row["normalized_url"] not in id_by_url:
+            id_by_url[row["normalized_url"]] = row["id"]
+            new_rows.append(row)
+            if data.skills:
+                skills_by_id[row["id"]] = data.skills
+
+    resource_repository.bulk_insert(new_rows, session)
+    set_resources_skills(session, skills_by_id, commit=False, new_items=True)
+    enrichment_service.enrich_on_commit(session, [(row["id"], row["url"], row["normalized_url"]) for row in new_rows])
+
+    return [id_by_url[url] for url in normalized_urls]
+
+
 def create_resource(data: ResourceCreate, session: Session, commit: bool = True) -> ResourceRead:
     """Create a new learning resource with validation."""
     # Normalize and validate URL
@@ -110,7 +211,7 @@ def create_resource(data: ResourceCreate, session: Session, commit: bool = True)
         author=data.author,
         image_url=image_url,
         default_funding_type=data.default_funding_type,
-        created_by_user_id=data.created_by_user_id or "00000000000000000000000000000000",
+        created_by_user_id=data.created_by_user_id or SYSTEM_USER_ID,
     )
     
     # Save to database
@@ -118,14 +219,17 @@ def create_resource(data: ResourceCreate, session: Session, commit: bool = True)
     
     # Set skills if provided
     if data.skills:
-        set_resource_skills(session, UUID(created_resource.id), data.skills, commit=False)
+        set_resource_skills(session, created_resource.id, data.skills, commit=False)
+
+    # Fetch provider metadata in the background once committed
+    enrichment_service.enrich_on_commit(session, [(created_resource.id, created_resource.url, normalized_url)])
     
     # Commit if requested
     if commit:
         session.commit()
     
     # Get skills for response
-    skills = _get_resource_skills(UUID(created_resource.id), session)
+    skills = _get_resource_skills(created_resource.id, session)
     
     return _construct_read_resource(created_resource, skills)
 
@@ -134,7 +238,12 @@ def get_resource(resource_id: UUID, session: Session) -> ResourceRead:
     """Get a learning resource by ID."""
 
     resource = _get_resource_by_id(resource_id, session)
-    return _construct_read_resource(resource, _get_resource_skills(UUID(resource.id), session))
+    return _construct_read_resource(resource, _get_resource_skills(resource.id, session))
+
+
+def get_read_rows(resource_ids: List[UUID], session: Session) -> List[ResourceReadRow]:
+    """Get listing rows for the given resource ids (missing ids are skipped)."""
+    return _construct_read_rows(resource_repository.get_rows_by_ids(resource_ids, session), session)
 
 
 def list_resources(
@@ -144,8 +253,10 @@ def list_resources(
     level: Optional[List[str]] = None,
     resource_type: Optional[List[str]] = None,
     page: int = 1,
-    page_size: int = 12
-) -> Tuple[List[ResourceRead], int]:
+    page_size: int = 12,
+    highlight: bool = False,
+    count: str = count_repository.EXACT
+) -> Tuple[List[ResourceReadRow], Optional[int]]:
 
     """List learning resources with filtering and pagination."""
     # Get filtered resources from repository
@@ -156,22 +267,73 @@ def list_resources(
         level=level,
         resource_type=resource_type,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        count=count,
+        as_rows=True
     )
     
-    # Get skills for each resource and construct response
-    result = []
-    for r in resources:
-        try:
-            skills = _get_resource_skills(UUID(r.id), session)
-            result.append(_construct_read_resource(r, skills))
-        except Exception as e:
-            # If skills fail, return resource without skills
-            result.append(_construct_read_resource(r, []))
-    
+    # Get skills for the whole page in one query and construct response
+    result = _construct_read_rows(resources, session)
+    if highlight:
+        _attach_snippets(result, search, session)
+
     return result, total
 
 
+def list_resources_keyset(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    cursor: str = "",
+    page_size: int = 12,
+    highlight: bool = False,
+    count: str = count_repository.EXACT
+) -> Tuple[List[ResourceReadRow], Optional[int], Optional[str], Optional[str]]:
+    """List learning resources with cursor pagination (empty cursor = first page)."""
+    resources, total, next_cursor, prev_cursor = resource_repository.list_filtered_keyset(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        resource_type=resource_type,
+        cursor=pagination.decode_cursor(cursor),
+        page_size=page_size,
+        count=count,
+        as_rows=True
+    )
+
+    result = _construct_read_rows(resources, session)
+    if highlight:
+        _attach_snippets(result, search, session)
+
+    return result, total, next_cursor, prev_cursor
+
+
+def get_facets(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    resource_type: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> ResourceFacetsResponse:
+    """Count the filtered resources per skill, level and resource type."""
+    total, counts = resource_repository.facet_counts(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        resource_type=resource_type,
+        skill_limit=skill_limit
+    )
+    return ResourceFacetsResponse(
+        total=total,
+        **{name: [FacetValue(value=v, count=n) for v, n in values] for name, values in counts.items()}
+    )
+
+
 def update_resource(resource_id: UUID, data: ResourceUpdate, session: Session) -> ResourceRead:
     """Update a learning resource."""
     # Get existing resource
@@ -181,7 +343,13 @@ def update_resource(resource_id: UUID, data: ResourceUpdate, session: Session) -
     update_data = data.model_dump(exclude_unset=True)
     
     if "url" in update_data:
-        _validate_url(update_data["url"])
+        normalized_url = _normalize_and_validate_url(update_data["url"])
+        if normalized_url != resource.normalized_url:
+            _check_resource_not_exist(normalized_url, session)
+            # Metadata belongs to the old page; refetch it
+            update_data["provider_metadata"] = {}
+            enrichment_service.enrich_on_commit(session, [(resource_id, update_data["url"], normalized_url)])
+        update_data["normalized_url"] = normalized_url
     
     if "platform" in update_data:
         validators.validate_platform(update_data["platform"])
@@ -197,7 +365,7 @@ def update_resource(resource_id: UUID, data: ResourceUpdate, session: Session) -
 
     # Handle skills update if provided
     if "skills" in update_data:
-        skill_service.set_resource_skills(session, resource_id, update_data["skills"])
+        set_resource_skills(session, resource_id, update_data["skills"], commit=False)
         # Remove skills from update_data to avoid setting on resource model
         del update_data["skills"]
 
@@ -206,7 +374,7 @@ def update_resource(resource_id: UUID, data: ResourceUpdate, session: Session) -
         setattr(resource, key, value)
     
     # Save via repository
-    updated_resource = resource_repository.update(resource, session)
+    resource_repository.update(resource, session)
     
     # Return as ResourceRead with skills populated
     return get_resource(resource_id, session)
@@ -0,0 +1,62 @@
+"""Request-scoped batch loader for learning item skill names.
+
+Loaders live in ``session.info`` so every service call made with the same
+session (i.e. within one request) shares the cache, and each page of items
+costs a single skills query instead of one per item.
+"""
+
+from typing import Callable, Dict, Iterable, List
+from uuid import UUID
+from sqlmodel import Session
+from app.repositories import resource_skill_repository, track_skill_repository
+
+# Keep IN lists below SQLite's default bound-variable limit on full-table loads
+MAX_BATCH_SIZE = 900
+
+
+class SkillLoader:
+    """Batch-load and cache skill names for one kind of learning item."""
+
+    def __init__(self, session: Session, list_many: Callable[[Session, List[UUID]], Dict[UUID, List[str]]]):
+        self._session = session
+        self._list_many = list_many
+        self._cache: Dict[UUID, List[str]] = {}
+
+    def load_many(self, item_ids: Iterable[UUID]) -> Dict[UUID, List[str]]:
+        """Get skills for many items, fetching all missing ones in one query."""
+        ids = list(dict.fromkeys(item_ids))
+        missing = [iid for iid in ids if iid not in self._cache]
+
+        for start in range(0, len(missing), MAX_BATCH_SIZE):
+            chunk = missing[start:start + MAX_BATCH_SIZE]
+            skills_by_id = self._list_many(self._session, chunk)
+            for iid in chunk:
+                self._cache[iid] = skills_by_id.get(iid, [])
+
+        return {iid: self._cache[iid] for iid in ids}
+
+    def load(self, item_id: UUID) -> List[str]:
+        """Get skills for a single item."""
+        return self.load_many([item_id])[item_id]
+
+    def invalidate(self, item_id: UUID) -> None:
+        """Drop a cached entry after its skills were rewritten."""
+        self._cache.pop(item_id, None)
+
+
+def _get_loader(session: Session, key: str, list_many) -> SkillLoader:
+    loader = session.info.get(key)
+    if loader is None:
+        loader = SkillLoader(session, list_many)
+        session.info[key] = loader
+    return loader
+
+
+def resource_skills(session: Session) -> SkillLoader:
+    """Get the resource skill loader bound to this session."""
+    return _get_loader(session, "resource_skill_loader", resource_skill_repository.list_skills_for_resources)
+
+
+def track_skills(session: Session) -> SkillLoader:
+    """Get the track skill loader bound to this session."""
+    return _get_loader(session, "track_skill_loader", track_skill_repository.list_skills_for_tracks)
@@ -1,12 +1,14 @@
 """Skill service for managing skills and learning item-skill relationships."""
 
-from typing import List
+from typing import Callable, Dict, List
 from uuid import UUID
 from sqlmodel import Session
 from app.repositories import skill_repository, resource_skill_repository, track_skill_repository
 from app.models.skill import Skill
+from app.services import skill_loader
 
-def _normalize_and_dedupe(names: List[str]) -> List[str]:
+def normalize_names(names: List[str]) -> List[str]:
+    """Normalize skill names and drop empty and repeated ones (first occurrence wins)."""
     seen = set()
     out = []
 
@@ -18,31 +20,66 @@ def _normalize_and_dedupe(names: List[str]) -> List[str]:
 
     return out
 
-def set_resource_skills(session: Session, resource_id: UUID, skill_names: List[str], commit: bool = True) -> None:
-    """Set skills for a resource (replace semantics)."""
-    names = _normalize_and_dedupe(skill_names)
 
-    resource_skill_repository.clear_resource_skills(session, resource_id)
+def _replace_skills(
+    session: Session,
+    skill_names_by_item: Dict[UUID, List[str]],
+    replace: Callable[[Session, Dict[UUID, List[UUID]], bool], List[UUID]],
+    loader: skill_loader.SkillLoader,
+    commit: bool,
+    new_items: bool
+) -> None:
+    """Upsert every name once, then apply only the per-item difference."""
+    names_by_item = {item_id: normalize_names(names) for item_id, names in skill_names_by_item.items()}
+    all_names = list(dict.fromkeys(n for names in names_by_item.values() for n in names))
+    id_by_name = dict(zip(all_names, skill_repository.upsert_skills_by_names(session, all_names)))
 
-    if names:
-        skill_ids = skill_repository.upsert_skills_by_names(session, names)
-        resource_skill_repository.insert_resource_skills_ignore(session, resource_id, skill_ids)
+    changed = replace(session, {item_id: [id_by_name[n] for n in names] for item_id, names in names_by_item.items()}, new_items)
 
+    for item_id in changed:
+        loader.invalidate(item_id)
     session.flush()
     if commit:
         session.commit()
 
 
+def set_resource_skills(session: Session, resource_id: UUID, skill_names: List[str], commit: bool = True) -> None:
+    """Set skills for a resource (replace semantics)."""
+    set_resources_skills(session, {resource_id: skill_names}, commit=commit)
+
+
+def set_resources_skills(
+    session: Session,
+    skill_names_by_resource: Dict[UUID, List[str]],
+    commit: bool = True,
+    new_items: bool = False
+) -> None:
+    """
+    Set skills for many resources in one transaction (replace semantics).
+    Pass `new_items=True` for resources created in the same transaction.
+    """
+    _replace_skills(
+        session, skill_names_by_resource, resource_skill_repository.replace_resources_skills,
+        skill_loader.resource_skills(session), commit, new_items
+    )
+
+
 def set_track_skills(session: Session, track_id: UUID, skill_names: List[str], commit: bool = True) -> None:
     """Set skills for a track (replace semantics)."""
-    names = _normalize_and_dedupe(skill_names)
-
-    track_skill_repository.clear_track_skills(session, track_id)
+    set_tracks_skills(session, {track_id: skill_names}, commit=commit)
 
-    if names:
-        skill_ids = skill_repository.upsert_skills_by_names(session, names)
-        track_skill_repository.insert_track_skills_ignore(session, track_id, skill_ids)
 
-    session.flush()
-    if commit:
-        session.commit()
+def set_tracks_skills(
+    session: Session,
+    skill_names_by_track: Dict[UUID, List[str]],
+    commit: bool = True,
+    new_items: bool = False
+) -> None:
+    """
+    Set skills for many tracks in one transaction (replace semantics).
+    Pass `new_items=True` for tracks created in the same transaction.
+    """
+    _replace_skills(
+        session, skill_names_by_track, track_skill_repository.replace_tracks_skills,
+        skill_loader.track_skills(session), commit, new_items
+    )
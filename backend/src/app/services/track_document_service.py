@@ -0,0 +1,80 @@
+"""Materialized track detail documents.
+
+The assembled `TrackReadWithResources` JSON of each track is stored in
+`track_detail_documents` so the detail endpoint is a single primary-key read.
+Documents are rebuilt inside the writing transaction, just before it commits,
+for every track whose row, `track_resources` rows or skills changed, and for
+every track containing a changed resource.
+"""
+
+from typing import Iterable, List, Optional, Set
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlmodel import Session
+from app.core import catalog_version
+from app.repositories import track_document_repository, track_resource_repository
+from app.services import track_service
+
+# Bump when TrackReadWithResources changes shape; stale documents are then rebuilt
+DOCUMENT_SCHEMA_VERSION = 2
+
+_REBUILDING_KEY = "track_documents_rebuilding"
+
+
+def get_document(track_id: UUID, session: Session) -> Optional[str]:
+    """Get the stored detail JSON for a track (None if not materialized)."""
+    return track_document_repository.get_document(session, track_id, DOCUMENT_SCHEMA_VERSION)
+
+
+def rebuild_documents(track_ids: Iterable[UUID], session: Session) -> None:
+    """Rebuild the documents of the given tracks; documents of deleted tracks are dropped."""
+    documents = []
+    missing = []
+
+    for track_id in track_ids:
+        try:
+            track = track_service.get_track_with_resources(track_id, session)
+        except HTTPException:
+            missing.append(track_id)
+            continue
+        documents.append((track_id, track.model_dump_json()))
+
+    track_document_repository.upsert_documents(session, documents, DOCUMENT_SCHEMA_VERSION)
+    track_document_repository.delete_documents(session, missing)
+
+
+def backfill_documents(session: Session) -> int:
+    """Build documents for tracks that have none (or an outdated one)."""
+    track_ids = track_document_repository.list_stale_track_ids(session, DOCUMENT_SCHEMA_VERSION)
+    if track_ids:
+        rebuild_documents(track_ids, session)
+        session.commit()
+    return len(track_ids)
+
+
+def _affected_track_ids(session: Session) -> List[UUID]:
+    track_ids: Set[UUID] = set()
+    resource_ids: List[UUID] = []
+
+    for collection, item_id in catalog_version.pending_items(session):
+        if collection == catalog_version.TRACKS:
+            track_ids.add(item_id)
+        elif collection == catalog_version.RESOURCES:
+            resource_ids.append(item_id)
+
+    track_ids.update(track_resource_repository.get_track_ids_for_resources(session, resource_ids))
+    return list(track_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_pending(session) -> None:
+    if session.info.get(_REBUILDING_KEY) or not catalog_version.pending_items(session):
+        return
+
+    session.info[_REBUILDING_KEY] = True
+    try:
+        session.flush()
+        rebuild_documents(_affected_track_ids(session), session)
+    finally:
+        session.info.pop(_REBUILDING_KEY, None)
@@ -1,18 +1,21 @@
 """Track service for managing learning tracks."""
 
 from uuid import UUID
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 from sqlmodel import Session
 from fastapi import HTTPException
 from app.models.track import LearningTrack
 from app.schemas.track import (
-    TrackCreate, TrackRead, TrackReadWithResources, TrackNameItem,
+    TrackCreate, TrackUpdate, TrackRead, TrackReadRow, TrackReadWithResources, TrackNameItem,
     ResourceSummary, TrackResourceItem
 )
-from app.repositories import track_repository, resource_repository, track_skill_repository, track_resource_repository
-from app.services import skill_service, resource_service
+from app.schemas.facet import FacetValue, TrackFacetsResponse
+from app.repositories import track_repository, resource_repository, track_resource_repository, search_repository, count_repository
+from app.services import skill_service, resource_service, skill_loader
 from app.utils.validators import validate_difficulty_level
+from app.utils import pagination
 from app.utils.defaults import get_default_track_image_url
+from app.utils.ordering import plan_reorder, spaced_positions
 
 def _validate_track_data(data: TrackCreate):
     validate_difficulty_level(data.level)
@@ -36,8 +39,7 @@ def _get_track_by_id(track_id: UUID, session: Session) -> LearningTrack:
 
 def _get_track_skills(track_id: UUID, session: Session) -> List[str]:
     """Get the skills for a track."""
-    skills = track_skill_repository.list_skills_for_track(session, track_id)
-    return [s.name for s in skills]
+    return skill_loader.track_skills(session).load(track_id)
 
 
 def _get_track_resources(track_id: UUID, session: Session) -> List[ResourceSummary]:
@@ -47,10 +49,11 @@ def _get_track_resources(track_id: UUID, session: Session) -> List[ResourceSumma
     # Unpack into separate lists
     resource_ids = [resource_id for resource_id, _ in resource_ids_positions]
     resources = resource_repository.get_by_ids(resource_ids, session)
+    skills_by_id = skill_loader.resource_skills(session).load_many(resource_ids)
 
-    # Convert resources to ResourceSummary format
+    # Stored positions are sparse sort keys; clients get the 0-based rank
     resources_summary = []
-    for resource_id, position in resource_ids_positions:
+    for resource_id, _ in resource_ids_positions:
         resource = resources.get(resource_id)
         if resource:
             resources_summary.append(ResourceSummary(
@@ -63,7 +66,8 @@ def _get_track_resources(track_id: UUID, session: Session) -> List[ResourceSumma
                 level=resource.level,
                 estimated_time=resource.estimated_time,
                 image_url=resource.image_url,
-                position=position
+                skills=skills_by_id[resource_id],
+                position=len(resources_summary)
             ))
 
     return resources_summary
@@ -76,57 +80,108 @@ def _construct_read_track(track: LearningTrack, skills: List[str]) -> TrackRead:
     return result
 
 
-def _add_track_resource(session: Session, track_id: UUID, resource_id: UUID, position: int) -> None:
-    """Add a resource to a track at a specific position."""
-    track_resource_repository.add_resource_to_track(session, track_id, resource_id, position, commit=False)
+def _construct_read_rows(rows: List, session: Session) -> List[TrackReadRow]:
+    """
+    Build listing rows from `track_repository.READ_COLUMNS` tuples with one
+    skills query. Column values come from the DB already typed, so no model
+    validation runs; the route serializes them with `track_list_adapter`.
+    """
+    skills_by_id = skill_loader.track_skills(session).load_many(r.id for r in rows)
+    return [
+        {
+            "id": r.id,
+            "title": r.title,
+            "short_description": r.short_description,
+            "level": r.level,
+            "skills": skills_by_id[r.id],
+            "estimated_time": r.estimated_time,
+            "image_url": r.image_url,
+            "created_by_user_id": r.created_by_user_id,
+            "created_at": r.created_at,
+            "snippet": None,
+        }
+        for r in rows
+    ]
 
 
-def _create_track_resource(resource_data, session: Session) -> UUID:
-    """Create a new resource or return existing one if it already exists."""
-    try:
-        created_resource = resource_service.create_resource(resource_data, session, commit=False)
-        return created_resource.id
-    except HTTPException as e:
-        # If resource already exists (409), use the existing resource
-        if e.status_code == 409 and isinstance(e.detail, dict):
-            return UUID(str(e.detail.get("existing_resource_id")))
-        raise
+def _attach_snippets(rows: List[TrackReadRow], search: Optional[str], session: Session) -> None:
+    """Fill in highlighted search snippets for a page of listing rows."""
+    match_query = search_repository.build_match_query(search)
+    if not match_query:
+        return
 
+    snippets = search_repository.get_snippets(session, "learning_tracks", match_query, [r["id"] for r in rows])
+    for r in rows:
+        r["snippet"] = snippets.get(r["id"])
 
-def _process_track_resources(
+
+def _in_track_order(resources: List[TrackResourceItem]) -> List[TrackResourceItem]:
+    """Order items by their requested position (ties keep request order)."""
+    return [item for _, item in sorted(enumerate(resources), key=lambda i_item: (i_item[1].position, i_item[0]))]
+
+
+def _resolve_track_resource_ids(
+    session: Session,
+    resources: List[TrackResourceItem],
+    known_ids: Set[UUID],
+    created_by_user_id: str
+) -> List[UUID]:
+    """
+    Resource ids in track order. Existing refs not in `known_ids` are checked
+    with one query; new resources are created in bulk (an already-stored URL
+    resolves to its resource).
+    """
+    ordered = _in_track_order(resources)
+    referenced = [item.resource_id for item in ordered if item.kind == "existing"]
+    found = resource_repository.get_by_ids([rid for rid in referenced if rid not in known_ids], session)
+    for item, resource_id in zip((item for item in ordered if item.kind == "existing"), referenced):
+        if resource_id not in known_ids and resource_id not in found:
+            raise HTTPException(status_code=404, detail=f"Resource {item.resource_id} not found")
+
+    new_items = [item.resource for item in ordered if item.kind == "new"]
+    created = iter(resource_service.create_resources(new_items, session, created_by_user_id))
+    existing = iter(referenced)
+    resource_ids = [next(existing) if item.kind == "existing" else next(created) for item in ordered]
+
+    seen: Set[UUID] = set()
+    for resource_id in resource_ids:
+        if resource_id in seen:
+            raise HTTPException(status_code=400, detail=f"Resource {resource_id} appears more than once in the track")
+        seen.add(resource_id)
+
+    return resource_ids
+
+
+def _update_track_resources(
     session: Session,
     track_id: UUID,
     resources: List[TrackResourceItem],
     created_by_user_id: str
 ) -> None:
-    """Process track resources - handle both existing and new resources."""
-    for item in resources:
-        if (item.kind == "existing"):
-            # Existing resource - just link it
-            resource_id = item.resource_id
-            resource = resource_repository.get_by_id(UUID(resource_id), session)
-            if not resource:
-                raise HTTPException(status_code=404, detail=f"Resource {resource_id} not found")
-            
-            _add_track_resource(session, track_id, resource_id, item.position)
-            
-        elif (item.kind == "new"):
-            # New resource - create it first, then link
-            resource_data = item.resource
-            resource_data.created_by_user_id = created_by_user_id
-            resource_id = _create_track_resource(resource_data, session)
-            _add_track_resource(session, track_id, resource_id, item.position)
+    """Diff the requested resources against the stored ones and write only the changes."""
+    current = track_resource_repository.get_track_resources(session, track_id)
+    desired = _resolve_track_resource_ids(session, resources, {rid for rid, _ in current}, created_by_user_id)
+
+    plan = plan_reorder(current, desired)
+    track_resource_repository.remove_resources_from_track(session, track_id, plan.removed, commit=False)
+    track_resource_repository.move_track_resources(session, track_id, plan.moved, commit=False)
+    track_resource_repository.add_resources_to_track(session, track_id, plan.added, commit=False)
 
 
 def create_track(data: TrackCreate, session: Session, created_by_user_id: str = None) -> TrackRead:
-    """Create a new learning track with validation."""
+    """
+    Create a new learning track with validation.
+
+    Resources are resolved and written in bulk; the response is built from
+    the values written rather than read back.
+    """
     
     _validate_track_data(data)
     
     image_url = get_default_track_image_url(data.image_url)
     
     # Set default user ID if not provided
-    user_id = created_by_user_id or "00000000000000000000000000000000"
+    user_id = created_by_user_id or resource_service.SYSTEM_USER_ID
     
     # Create SQLModel instance
     track = LearningTrack(
@@ -140,19 +195,57 @@ def create_track(data: TrackCreate, session: Session, created_by_user_id: str =
     
     # Save via repository
     created_track = track_repository.create(track, session, commit=False)
-    track_id_uuid = UUID(created_track.id)
+    track_id_uuid = created_track.id
 
-    # Handle skills if provided
-    if data.skills:
-        skill_service.set_track_skills(session, track_id_uuid, data.skills, commit=False)
-    
-    # Handle resources if provided
-    if data.resources:
-        _process_track_resources(session, track_id_uuid, data.resources, user_id)
-        
+    skill_service.set_tracks_skills(session, {track_id_uuid: data.skills}, commit=False, new_items=True)
+
+    resource_ids = _resolve_track_resource_ids(session, data.resources, set(), user_id)
+    track_resource_repository.add_resources_to_track(
+        session, track_id_uuid, dict(zip(resource_ids, spaced_positions(len(resource_ids)))), commit=False
+    )
+
+    # Skills come back sorted by name, like the skill loader returns them
+    result = _construct_read_track(created_track, sorted(skill_service.normalize_names(data.skills)))
     session.commit()
     
-    return get_track(track_id_uuid, session)
+    return result
+
+
+def update_track(track_id: UUID, data: TrackUpdate, session: Session, updated_by_user_id: str = None) -> TrackRead:
+    """
+    Update a learning track. Only the fields present in the request change;
+    `resources` replaces the track's resource list (order by position), with
+    only the added, removed and moved rows written.
+    """
+    track = _get_track_by_id(track_id, session)
+    fields = data.model_fields_set
+
+    validate_difficulty_level(data.level)
+    if "title" in fields and not data.title:
+        raise HTTPException(status_code=400, detail="Track title is required")
+    if "short_description" in fields and not data.short_description:
+        raise HTTPException(status_code=400, detail="Track description is required")
+    if "skills" in fields and not data.skills:
+        raise HTTPException(status_code=400, detail="Track must have at least one skill")
+    if "resources" in fields and not data.resources:
+        raise HTTPException(status_code=400, detail="Track must have at least one resource")
+
+    if "skills" in fields:
+        skill_service.set_track_skills(session, track_id, data.skills, commit=False)
+
+    if "resources" in fields:
+        user_id = updated_by_user_id or track.created_by_user_id
+        _update_track_resources(session, track_id, data.resources, user_id)
+
+    for key in ("title", "short_description", "level", "estimated_time"):
+        if key in fields:
+            setattr(track, key, getattr(data, key))
+    if "image_url" in fields:
+        track.image_url = get_default_track_image_url(data.image_url)
+
+    track_repository.update(track, session)
+
+    return get_track(track_id, session)
 
 
 def get_track(track_id: UUID, session: Session) -> TrackRead:
@@ -171,26 +264,16 @@ def get_track_with_resources(track_id: UUID, session: Session) -> TrackReadWithR
 
     return result
 
-def get_tracks(session: Session) -> List[TrackRead]:
-    """Get all learning tracks."""
-    tracks = track_repository.list_all(session)
-    result = []
-    for track in tracks:
-        skills = _get_track_skills(UUID(track.id), session)
-        track_read = TrackRead.model_validate(track)
-        track_read.skills = skills
-        result.append(track_read)
-    return result
-
-
 def list_tracks(
     session: Session,
     search: Optional[str] = None,
     skill: Optional[List[str]] = None,
     level: Optional[List[str]] = None,
     page: int = 1,
-    page_size: int = 12
-) -> Tuple[List[TrackRead], int]:
+    page_size: int = 12,
+    highlight: bool = False,
+    count: str = count_repository.EXACT
+) -> Tuple[List[TrackReadRow], Optional[int]]:
     """List learning tracks with filtering and pagination."""
     tracks, total = track_repository.list_filtered(
         session=session,
@@ -198,19 +281,68 @@ def list_tracks(
         skill=skill,
         level=level,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        count=count,
+        as_rows=True
     )
     
-    result = []
-    for track in tracks:
-        skills = _get_track_skills(UUID(track.id), session)
-        track_read = TrackRead.model_validate(track)
-        track_read.skills = skills
-        result.append(track_read)
-    
+    result = _construct_read_rows(tracks, session)
+    if highlight:
+        _attach_snippets(result, search, session)
+
     return result, total
 
 
+def list_tracks_keyset(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    cursor: str = "",
+    page_size: int = 12,
+    highlight: bool = False,
+    count: str = count_repository.EXACT
+) -> Tuple[List[TrackReadRow], Optional[int], Optional[str], Optional[str]]:
+    """List learning tracks with cursor pagination (empty cursor = first page)."""
+    tracks, total, next_cursor, prev_cursor = track_repository.list_filtered_keyset(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        cursor=pagination.decode_cursor(cursor),
+        page_size=page_size,
+        count=count,
+        as_rows=True
+    )
+
+    result = _construct_read_rows(tracks, session)
+    if highlight:
+        _attach_snippets(result, search, session)
+
+    return result, total, next_cursor, prev_cursor
+
+
+def get_facets(
+    session: Session,
+    search: Optional[str] = None,
+    skill: Optional[List[str]] = None,
+    level: Optional[List[str]] = None,
+    skill_limit: int = 50
+) -> TrackFacetsResponse:
+    """Count the filtered tracks per skill and level."""
+    total, counts = track_repository.facet_counts(
+        session=session,
+        search=search,
+        skill=skill,
+        level=level,
+        skill_limit=skill_limit
+    )
+    return TrackFacetsResponse(
+        total=total,
+        **{name: [FacetValue(value=v, count=n) for v, n in values] for name, values in counts.items()}
+    )
+
+
 def get_tracks_names(session: Session) -> List[TrackNameItem]:
     """Get all tracks with just id and title (for dropdowns/autocomplete)."""
     return track_repository.list_tracks_names(session)
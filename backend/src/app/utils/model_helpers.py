@@ -1,15 +1,41 @@
 import uuid
 from typing import List, Dict, Tuple, Any, Union
-from sqlalchemy import text
+from sqlalchemy import LargeBinary, text
+from sqlalchemy.types import TypeDecorator
 from sqlmodel import Session
 
-def dbid(x: Union[uuid.UUID, str]) -> str:
+IdLike = Union[uuid.UUID, str, bytes]
+
+
+def as_uuid(x: IdLike) -> uuid.UUID:
+    """Coerce a UUID, its hex/dashed string, or its 16 raw bytes to a UUID."""
     if isinstance(x, uuid.UUID):
-        return x.hex
-    return x
+        return x
+    if isinstance(x, (bytes, bytearray, memoryview)):
+        return uuid.UUID(bytes=bytes(x))
+    return uuid.UUID(x)
+
+
+def dbid(x: IdLike) -> bytes:
+    """Storage form of an id (16-byte BLOB), for raw SQL parameters."""
+    return as_uuid(x).bytes
+
+
+def generate_id() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+class UUIDBlob(TypeDecorator):
+    """UUID stored as a 16-byte BLOB; binds UUIDs (or hex strings) and loads uuid.UUID."""
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else dbid(value)
 
-def generate_id() -> str:
-    return uuid.uuid4().hex  # 32-char hex
+    def process_result_value(self, value, dialect):
+        return None if value is None else uuid.UUID(bytes=value)
 
 
 def bind_in_clause(prefix: str, values: List[Any]) -> Tuple[str, Dict[str, Any]]:
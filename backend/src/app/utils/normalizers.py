@@ -1,15 +1,63 @@
-from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+"""URL canonicalization used as the resource dedupe key.
+
+Rules are precompiled once; results are memoized in a bounded LRU since the
+same URLs are normalized repeatedly (lookup, then create; bulk imports).
+
+Canonical form:
+- scheme added if missing, scheme and host lower-cased, default ports dropped
+- repeated slashes collapsed, trailing slash removed (except the root path)
+- fragment dropped
+- tracking params removed (utm_*, TRACKING_KEYS, plus per-host HOST_TRACKING_KEYS)
+- remaining params sorted by (key, value)
+"""
+
 import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 TRACKING_KEYS = {
     "gclid", "fbclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "spm"
 }
 
-def normalize_url(raw: str) -> str:
-    s = (raw or "").strip()
-    if not s:
-        return ""
+# Affiliate/referral params that do not identify the course (lower-cased keys).
+# Matched against the host and each parent domain, e.g. www.udemy.com -> udemy.com
+HOST_TRACKING_KEYS: Dict[str, FrozenSet[str]] = {
+    "udemy.com": frozenset({"couponcode", "ranmid", "raneaid", "ransiteid", "lsnpubid", "referralcode"}),
+    "coursera.org": frozenset({"irclickid", "irgwc", "siteid", "ranmid", "raneaid", "ransiteid", "trk", "trk_location"}),
+}
+
+NORMALIZE_CACHE_SIZE = 8192
+
+_DEFAULT_PORT_RE = re.compile(r":(?:80|443)$")
+_MULTI_SLASH_RE = re.compile(r"/{2,}")
+
+_NO_HOST_KEYS: FrozenSet[str] = frozenset()
+
+
+def _host_tracking_keys(netloc: str) -> FrozenSet[str]:
+    host = netloc.rsplit("@", 1)[-1].split(":", 1)[0]
+    while host:
+        keys = HOST_TRACKING_KEYS.get(host)
+        if keys is not None:
+            return keys
+        _, _, host = host.partition(".")
+    return _NO_HOST_KEYS
+
+
+def _clean_query(query: str, host_keys: FrozenSet[str]) -> str:
+    q = []
+    for k, v in parse_qsl(query, keep_blank_values=True):
+        kl = k.lower()
+        if kl.startswith("utm_") or kl in TRACKING_KEYS or kl in host_keys:
+            continue
+        q.append((k, v))
+    q.sort()
+    return urlencode(q, doseq=True)
+
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(s: str) -> str:
     # Add scheme if missing
     if "://" not in s:
         s = "https://" + s
@@ -17,29 +65,35 @@ def normalize_url(raw: str) -> str:
     parts = urlsplit(s)
 
     scheme = (parts.scheme or "https").lower()
-    netloc = (parts.netloc or "").lower()
-
-    # Remove default ports
-    netloc = re.sub(r":80$", "", netloc)
-    netloc = re.sub(r":443$", "", netloc)
+    netloc = _DEFAULT_PORT_RE.sub("", (parts.netloc or "").lower())
 
     # Path cleanup
     path = parts.path or "/"
-    path = re.sub(r"/{2,}", "/", path)
+    if "//" in path:
+        path = _MULTI_SLASH_RE.sub("/", path)
     if path != "/" and path.endswith("/"):
         path = path[:-1]
 
-    # Drop fragment
-    fragment = ""
+    query = _clean_query(parts.query, _host_tracking_keys(netloc)) if parts.query else ""
+
+    # Fragment is always dropped
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def normalize_url(raw: str) -> str:
+    s = (raw or "").strip()
+    if not s:
+        return ""
+    return _normalize(s)
 
-    # Query: remove tracking params + sort
-    q = []
-    for k, v in parse_qsl(parts.query, keep_blank_values=True):
-        kl = k.lower()
-        if kl.startswith("utm_") or kl in TRACKING_KEYS:
-            continue
-        q.append((k, v))
-    q.sort(key=lambda kv: (kv[0], kv[1]))
-    query = urlencode(q, doseq=True)
 
-    return urlunsplit((scheme, netloc, path, query, fragment))
+def normalize_many(raws: Iterable[str]) -> List[str]:
+    """Normalize a batch of URLs, computing each distinct input once."""
+    results: Dict[str, str] = {}
+    out = []
+    for raw in raws:
+        normalized = results.get(raw)
+        if normalized is None:
+            normalized = results[raw] = normalize_url(raw)
+        out.append(normalized)
+    return out
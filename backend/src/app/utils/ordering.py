@@ -0,0 +1,122 @@
+"""Minimal-write reordering of position-keyed lists (e.g. the resources of a track).
+
+Stored positions are sparse sort keys, not ranks: items are spaced
+POSITION_GAP apart, so a moved or inserted item usually takes an integer
+between its new neighbours and nothing else is rewritten. The items that
+keep their relative order (a longest increasing subsequence of the current
+order) stay where they are. When a gap is exhausted the window around it
+is widened, one neighbour at a time, until its items can be respaced.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+POSITION_GAP = 1024
+
+
+@dataclass
+class ReorderPlan:
+    """Writes that turn the current list into the desired one."""
+    removed: List[Hashable] = field(default_factory=list)
+    moved: Dict[Hashable, int] = field(default_factory=dict)  # existing item -> new position
+    added: Dict[Hashable, int] = field(default_factory=dict)  # new item -> position
+
+    @property
+    def writes(self) -> int:
+        return len(self.removed) + len(self.moved) + len(self.added)
+
+
+def spaced_positions(count: int, gap: int = POSITION_GAP) -> List[int]:
+    """Positions for a freshly written list of `count` items."""
+    return [i * gap for i in range(count)]
+
+
+def _longest_increasing(sequence: Sequence[int]) -> List[int]:
+    """Indexes into `sequence` of one longest strictly increasing subsequence."""
+    tails: List[int] = []  # tails[k] = index of the smallest tail of an increasing run of length k + 1
+    tail_values: List[int] = []
+    previous: List[Optional[int]] = [None] * len(sequence)
+
+    for i, value in enumerate(sequence):
+        k = bisect_left(tail_values, value)
+        previous[i] = tails[k - 1] if k else None
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[k] = i
+            tail_values[k] = value
+
+    result: List[int] = []
+    i = tails[-1] if tails else None
+    while i is not None:
+        result.append(i)
+        i = previous[i]
+    return result[::-1]
+
+
+def _fill(low: Optional[int], high: Optional[int], count: int, gap: int) -> Optional[List[int]]:
+    """`count` increasing integers strictly between low and high (None = open end)."""
+    if low is None and high is None:
+        return spaced_positions(count, gap)
+    if high is None:
+        return [low + gap * (i + 1) for i in range(count)]
+    if low is None:
+        return [high - gap * (count - i) for i in range(count)]
+
+    step = min((high - low) // (count + 1), gap)
+    if step < 1:
+        return None
+    return [low + step * (i + 1) for i in range(count)]
+
+
+def plan_reorder(current: Sequence[Tuple[Hashable, int]], desired: Sequence[Hashable], gap: int = POSITION_GAP) -> ReorderPlan:
+    """
+    Plan the deletes, position updates and inserts that turn `current`
+    ((item, position) pairs) into the order `desired` (distinct items).
+
+    The returned positions are unique among the items that remain.
+    """
+    current = sorted(current, key=lambda item_position: item_position[1])
+    position_of = dict(current)
+    rank = {item: i for i, item in enumerate(desired)}
+
+    plan = ReorderPlan(removed=[item for item, _ in current if item not in rank])
+
+    kept = [item for item, _ in current if item in rank]
+    anchored = {kept[i] for i in _longest_increasing([rank[item] for item in kept])}
+
+    # Resolved position per desired slot; runs of None are filled between their neighbours
+    slots: List[Optional[int]] = [position_of[item] if item in anchored else None for item in desired]
+    i = 0
+    while i < len(slots):
+        if slots[i] is not None:
+            i += 1
+            continue
+        start = end = i
+        while end < len(slots) and slots[end] is None:
+            end += 1
+
+        widen_left = True
+        while True:
+            filled = _fill(slots[start - 1] if start else None, slots[end] if end < len(slots) else None, end - start, gap)
+            if filled is not None:
+                break
+            if (widen_left and start) or end == len(slots):
+                start -= 1
+            else:
+                end += 1
+                while end < len(slots) and slots[end] is None:
+                    end += 1
+            widen_left = not widen_left
+
+        slots[start:end] = filled
+        i = end
+
+    for item, position in zip(desired, slots):
+        if item not in position_of:
+            plan.added[item] = position
+        elif position != position_of[item]:
+            plan.moved[item] = position
+    return plan
@@ -0,0 +1,91 @@
+"""Keyset (cursor) pagination over a stable (created_at, id) ordering."""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position of a row in the (created_at, id) ordering plus paging direction."""
+    created_at: datetime
+    id: UUID
+    direction: str = NEXT
+
+
+def encode_cursor(row: Any, direction: str) -> str:
+    """Encode a row's sort key as an opaque URL-safe token."""
+    payload = {"c": row.created_at.isoformat(), "i": row.id.hex, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Optional[Cursor]:
+    """Decode a cursor token. An empty token means the first page."""
+    if not token:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        cursor = Cursor(
+            created_at=datetime.fromisoformat(payload["c"]),
+            id=UUID(str(payload["i"])),
+            direction=payload.get("d", NEXT),
+        )
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor.direction not in (NEXT, PREV):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return cursor
+
+
+def order_stable(statement, model):
+    """Order by (created_at, id) ascending, the canonical listing order."""
+    return statement.order_by(model.created_at, model.id)
+
+
+def apply_keyset(statement, model, cursor: Optional[Cursor], page_size: int):
+    """
+    Seek past the cursor and fetch one extra row to detect another page.
+
+    Backwards pages are queried in descending order; use `finish_keyset`
+    to restore the canonical order and build the neighbouring cursors.
+    """
+    key = tuple_(model.created_at, model.id)
+
+    if cursor is None:
+        statement = statement.order_by(model.created_at, model.id)
+    elif cursor.direction == NEXT:
+        statement = statement.where(key > (cursor.created_at, cursor.id))
+        statement = statement.order_by(model.created_at, model.id)
+    else:
+        statement = statement.where(key < (cursor.created_at, cursor.id))
+        statement = statement.order_by(model.created_at.desc(), model.id.desc())
+
+    return statement.limit(page_size + 1)
+
+
+def finish_keyset(rows: List[Any], cursor: Optional[Cursor], page_size: int) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """Trim the look-ahead row and return (rows, next_cursor, prev_cursor)."""
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if cursor is not None and cursor.direction == PREV:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    next_cursor = encode_cursor(rows[-1], NEXT) if rows and has_next else None
+    prev_cursor = encode_cursor(rows[0], PREV) if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
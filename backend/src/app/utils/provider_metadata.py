@@ -0,0 +1,121 @@
+"""Extract course metadata (title, duration, instructor, rating) from a provider page.
+
+Reads schema.org JSON-LD blocks first (Course, VideoObject, Product, ...,
+including `@graph` lists), then Open Graph / standard <meta> tags, then
+<title>. Only fields that were found are returned.
+"""
+
+import json
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Optional
+
+_TITLE_META = ("og:title", "twitter:title")
+_DURATION_META = ("duration", "video:duration", "og:video:duration")
+_INSTRUCTOR_META = ("author", "article:author")
+_JSON_LD_INSTRUCTOR_KEYS = ("instructor", "author", "creator")
+_JSON_LD_DURATION_KEYS = ("timeRequired", "duration")
+
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.json_ld: List[str] = []
+        self.title = ""
+        self._in_title = False
+        self._in_json_ld = False
+        self._script: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or attrs.get("itemprop") or "").lower()
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self._in_json_ld = True
+            self._script = []
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script" and self._in_json_ld:
+            self._in_json_ld = False
+            self.json_ld.append("".join(self._script))
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._in_json_ld:
+            self._script.append(data)
+
+
+def _json_ld_objects(blocks: List[str]) -> Iterator[Dict]:
+    pending: List[Any] = []
+    for block in blocks:
+        try:
+            pending.append(json.loads(block))
+        except ValueError:
+            continue
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            pending.extend(node)
+        elif isinstance(node, dict):
+            yield node
+            pending.extend(node.get("@graph", []))
+
+
+def _person_name(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        names = [name for name in (_person_name(v) for v in value) if name]
+        return ", ".join(names) or None
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_provider_metadata(html: str) -> Dict[str, Any]:
+    """Metadata found in an HTML page: title, duration, instructor, rating, rating_count."""
+    parser = _PageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:  # html.parser is lenient, but never let one bad page fail enrichment
+        pass
+
+    found: Dict[str, Any] = {}
+    for node in _json_ld_objects(parser.json_ld):
+        if "title" not in found and isinstance(node.get("name"), str) and node.get("@type") not in ("Person", "Organization"):
+            found["title"] = node["name"].strip()
+        for key in _JSON_LD_DURATION_KEYS:
+            if "duration" not in found and isinstance(node.get(key), str):
+                found["duration"] = node[key].strip()
+        for key in _JSON_LD_INSTRUCTOR_KEYS:
+            name = _person_name(node.get(key))
+            if "instructor" not in found and name:
+                found["instructor"] = name
+        rating = node.get("aggregateRating")
+        if "rating" not in found and isinstance(rating, dict) and _number(rating.get("ratingValue")) is not None:
+            found["rating"] = _number(rating.get("ratingValue"))
+            count = _number(rating.get("ratingCount") or rating.get("reviewCount"))
+            if count is not None:
+                found["rating_count"] = int(count)
+
+    meta = parser.meta
+    for field, keys in (("title", _TITLE_META), ("duration", _DURATION_META), ("instructor", _INSTRUCTOR_META)):
+        for key in keys:
+            if field not in found and meta.get(key):
+                found[field] = meta[key]
+    if "title" not in found and parser.title.strip():
+        found["title"] = " ".join(parser.title.split())
+    return found
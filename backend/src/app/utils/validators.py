@@ -1,11 +1,21 @@
+from functools import lru_cache
 from fastapi import HTTPException
 from pydantic import HttpUrl, ValidationError
+from app.utils.normalizers import NORMALIZE_CACHE_SIZE
 
-def validate_url(url: str) -> None:
-    """Validate that the URL is valid (canonical form)."""
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _is_valid_url(url: str) -> bool:
     try:
         HttpUrl(url)
     except ValidationError:
+        return False
+    return True
+
+
+def validate_url(url: str) -> None:
+    """Validate that the URL is valid (canonical form)."""
+    if not _is_valid_url(url):
         raise HTTPException(status_code=400, detail="Invalid URL format")
 
 
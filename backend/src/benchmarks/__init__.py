@@ -0,0 +1,13 @@
+"""Benchmark and load-test suite for the WebAcademy API.
+
+Run from backend/src:
+
+    python -m benchmarks run [SUITE ...] [--quick] [--out results.json]
+    python -m benchmarks compare baseline.json results.json [--threshold 0.1]
+    python -m benchmarks generate --resources 20000 --tracks 2000 --skills 5000 --db bench.db
+
+Every suite runs in its own subprocess because the app reads its settings
+(database URL, search backend, async routes, SQLite pragmas) at import time.
+Datasets are generated once per size and seed, cached, and copied for each
+run so write benchmarks never leak into the next one.
+"""
@@ -0,0 +1,185 @@
+"""Synthetic catalog generator.
+
+Builds a database with N resources, M tracks and K skills whose fan-out looks
+like a real catalog: a few skills are attached to most resources (Zipf
+weights), resources carry 1-6 skills, tracks hold 3-25 resources and 1-4
+skills. Rows go through the app's own tables and triggers, so the FTS index
+and track detail documents are built exactly as in production.
+"""
+
+import itertools
+import random
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+
+PLATFORMS = ["Udemy", "Coursera", "Other"]
+PLATFORM_HOSTS = {"Udemy": "www.udemy.com", "Coursera": "www.coursera.org", "Other": "learn.example.com"}
+RESOURCE_TYPES = ["Course", "Project", "Book", "Article & Blog", "Video & Talk"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+FUNDING_TYPES = ["gift_code", "reimbursement", "virtual_card", "org_subscription"]
+
+TECHNOLOGIES = [
+    "Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "Kotlin", "Swift", "C++", "C#",
+    "SQL", "PostgreSQL", "SQLite", "Redis", "Kafka", "Docker", "Kubernetes", "Terraform", "AWS",
+    "Azure", "GCP", "React", "Vue", "Angular", "Django", "FastAPI", "Flask", "Spring", "GraphQL",
+    "Linux", "Git", "Pandas", "NumPy", "PyTorch", "TensorFlow", "Spark", "Airflow", "dbt",
+]
+TOPICS = [
+    "Fundamentals", "Testing", "Performance", "Security", "Design Patterns", "Data Modeling",
+    "Concurrency", "Observability", "Deployment", "Architecture", "Debugging", "Machine Learning",
+    "Data Engineering", "APIs", "Networking", "Accessibility", "Refactoring", "Scalability",
+]
+QUALIFIERS = ["Advanced", "Applied", "Practical", "Modern", "Distributed", "Cloud", "Async", "Functional"]
+TITLE_PATTERNS = [
+    "{tech} {topic}", "Mastering {tech} {topic}", "{topic} with {tech}", "The {tech} Handbook",
+    "{tech} for {level}s", "Hands-on {tech}: {topic}", "{qualifier} {tech}",
+]
+AUTHORS = ["Ada Park", "Sam Rivera", "Noor Haddad", "Lee Chen", "Maria Rossi", "Tomas Novak", None]
+DURATIONS = ["1h", "3h", "6h", "12h", "2 weeks", "1 month", None]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and seed of a synthetic catalog."""
+    resources: int = 20000
+    tracks: int = 2000
+    skills: int = 5000
+    seed: int = 42
+
+    @property
+    def name(self) -> str:
+        return f"r{self.resources}-t{self.tracks}-s{self.skills}-seed{self.seed}"
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def skill_names(count: int) -> List[str]:
+    """Deterministic, unique and plausible skill names."""
+    combos = itertools.chain(
+        TECHNOLOGIES,
+        (f"{tech} {topic}" for topic in TOPICS for tech in TECHNOLOGIES),
+        (f"{q} {tech} {topic}" for q in QUALIFIERS for topic in TOPICS for tech in TECHNOLOGIES),
+    )
+    names = list(itertools.islice(combos, count))
+    names.extend(f"{TECHNOLOGIES[i % len(TECHNOLOGIES)]} Skill {i}" for i in range(len(names), count))
+    return names
+
+
+def _title(rng: random.Random) -> str:
+    return rng.choice(TITLE_PATTERNS).format(
+        tech=rng.choice(TECHNOLOGIES), topic=rng.choice(TOPICS),
+        level=rng.choice(LEVELS), qualifier=rng.choice(QUALIFIERS),
+    )
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def _pick_distinct(rng: random.Random, population: List, cum_weights: List[float], k: int) -> List:
+    picked = {}
+    while len(picked) < min(k, len(population)):
+        item = rng.choices(population, cum_weights=cum_weights)[0]
+        picked[item] = None
+    return list(picked)
+
+
+def _insert(session, model, rows: List[Dict], chunk_size: int = 5000) -> None:
+    statement = insert(model.__table__)
+    for start in range(0, len(rows), chunk_size):
+        session.execute(statement, rows[start:start + chunk_size])
+
+
+def generate(spec: DatasetSpec) -> Dict[str, int]:
+    """Fill the configured (empty) database with a synthetic catalog; returns row counts."""
+    from sqlmodel import Session
+    from app.core.db import create_db_and_tables, engine
+    from app.models.resource import LearningResource
+    from app.models.track import LearningTrack
+    from app.models.track_resource import TrackResource
+    from app.models.skill import Skill, ResourceSkill, TrackSkill
+    from app.services import track_document_service
+    from app.utils.normalizers import normalize_url
+    from app.utils.ordering import spaced_positions
+
+    rng = random.Random(spec.seed)
+    base_time = datetime(2024, 1, 1)
+    create_db_and_tables()
+
+    skills = [{"id": uuid.UUID(int=rng.getrandbits(128), version=4), "name": name, "created_at": base_time}
+              for name in skill_names(spec.skills)]
+    skill_ids = [s["id"] for s in skills]
+    skill_weights = _zipf_weights(len(skill_ids))
+
+    resources, resource_skills = [], []
+    for i in range(spec.resources):
+        platform = rng.choice(PLATFORMS)
+        url = f"https://{PLATFORM_HOSTS[platform]}/course/{i}-{rng.getrandbits(24):06x}/?utm_source=bench"
+        resource_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        resources.append({
+            "id": resource_id,
+            "title": _title(rng),
+            "short_description": f"{rng.choice(TOPICS)} in {rng.choice(TECHNOLOGIES)} for working engineers.",
+            "url": url,
+            "normalized_url": normalize_url(url),
+            "platform": platform,
+            "resource_type": rng.choice(RESOURCE_TYPES),
+            "level": rng.choice(LEVELS),
+            "estimated_time": rng.choice(DURATIONS),
+            "author": rng.choice(AUTHORS),
+            "image_url": "",
+            "default_funding_type": rng.choice(FUNDING_TYPES),
+            "created_by_user_id": "bench",
+            "created_at": base_time + timedelta(seconds=i),
+            "provider_metadata": {},
+        })
+        for skill_id in _pick_distinct(rng, skill_ids, skill_weights, rng.randint(1, 6)):
+            resource_skills.append({"resource_id": resource_id, "skill_id": skill_id})
+
+    resource_ids = [r["id"] for r in resources]
+    tracks, track_resources, track_skills = [], [], []
+    for i in range(spec.tracks):
+        track_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        tracks.append({
+            "id": track_id,
+            "title": f"{_title(rng)} Track",
+            "short_description": f"A guided path through {rng.choice(TOPICS).lower()}.",
+            "level": rng.choice(LEVELS),
+            "estimated_time": rng.choice(DURATIONS),
+            "image_url": "",
+            "created_by_user_id": "bench",
+            "created_at": base_time + timedelta(seconds=i),
+        })
+        members = rng.sample(resource_ids, min(rng.randint(3, 25), len(resource_ids)))
+        for position, resource_id in zip(spaced_positions(len(members)), members):
+            track_resources.append({
+                "id": uuid.UUID(int=rng.getrandbits(128), version=4), "track_id": track_id,
+                "resource_id": resource_id, "position": position, "created_at": base_time,
+            })
+        for skill_id in _pick_distinct(rng, skill_ids, skill_weights, rng.randint(1, 4)):
+            track_skills.append({"track_id": track_id, "skill_id": skill_id})
+
+    with Session(engine) as session:
+        _insert(session, Skill, skills)
+        _insert(session, LearningResource, resources)
+        _insert(session, ResourceSkill, resource_skills)
+        _insert(session, LearningTrack, tracks)
+        _insert(session, TrackResource, track_resources)
+        _insert(session, TrackSkill, track_skills)
+        session.commit()
+
+        track_document_service.backfill_documents(session)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+        connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    return {
+        "skills": len(skills), "resources": len(resources), "resource_skills": len(resource_skills),
+        "tracks": len(tracks), "track_resources": len(track_resources), "track_skills": len(track_skills),
+    }
@@ -0,0 +1,358 @@
+"""In-process ASGI load driver.
+
+Requests are handed straight to the ASGI app (no sockets, no HTTP client
+library), so the numbers cover routing, validation, the service layer and
+SQLite, but not the network stack. Concurrency comes from asyncio tasks; sync
+routes still run on Starlette's threadpool exactly as under uvicorn.
+"""
+
+import asyncio
+import json
+import random
+import re
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.stats import summarize
+
+Query = Sequence[Tuple[str, str]]
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Query = ()
+    body: bytes = b""
+    content_type: Optional[str] = None
+    headers: Sequence[Tuple[str, str]] = ()
+
+
+class ASGIClient:
+    """Minimal HTTP/1.1 client speaking ASGI to an app object."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def send(self, request: Request) -> Tuple[int, int]:
+        """Run one request through the app; returns (status, response body bytes)."""
+        status, _, body = await self._exchange(request, keep=False)
+        return status, body
+
+    async def fetch(self, request: Request) -> Tuple[int, Dict[str, str], bytes]:
+        """Run one request through the app; returns (status, response headers, body)."""
+        return await self._exchange(request, keep=True)
+
+    async def _exchange(self, request: Request, keep: bool):
+        headers = [(b"host", b"bench"), (b"content-length", str(len(request.body)).encode())]
+        if request.content_type:
+            headers.append((b"content-type", request.content_type.encode()))
+        headers += [(name.lower().encode(), value.encode()) for name, value in request.headers]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": request.path,
+            "raw_path": request.path.encode(),
+            "query_string": urlencode(list(request.query)).encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "state": {},
+        }
+
+        done = asyncio.Event()
+        body_sent = False
+        result = {"status": 0, "headers": {}, "bytes": 0}
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": request.body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                result["status"] = message["status"]
+                if keep:
+                    result["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                result["bytes"] += len(message.get("body", b""))
+                if keep:
+                    chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        return result["status"], result["headers"], b"".join(chunks) if keep else result["bytes"]
+
+
+@dataclass
+class Samples:
+    """Real ids and values from the benchmark database, used to build requests."""
+    resource_ids: List[str]
+    track_ids: List[str]
+    skills: List[str]
+    urls: List[str]
+    words: List[str]
+
+    @classmethod
+    def load(cls, db_path: str, limit: int = 2000, seed: int = 7) -> "Samples":
+        connection = sqlite3.connect(db_path)
+        try:
+            rows = connection.execute("SELECT id, url FROM learning_resources ORDER BY random() LIMIT ?", (limit,)).fetchall()
+            tracks = connection.execute("SELECT id FROM learning_tracks ORDER BY random() LIMIT ?", (limit,)).fetchall()
+            # Popular skills first: filters on them match many rows, the interesting case
+            skills = connection.execute(
+                "SELECT s.name FROM skills s JOIN resource_skills rs ON rs.skill_id = s.id "
+                "GROUP BY s.id ORDER BY count(*) DESC LIMIT 50"
+            ).fetchall()
+        finally:
+            connection.close()
+
+        return cls(
+            resource_ids=[str(uuid.UUID(bytes=r[0])) for r in rows],
+            track_ids=[str(uuid.UUID(bytes=t[0])) for t in tracks],
+            skills=[s[0] for s in skills],
+            urls=[r[1] for r in rows],
+            words=["python", "kubernetes", "testing", "react", "data", "security", "performance", "sql"],
+        )
+
+
+def _new_resource(tag: str) -> Dict:
+    return {
+        "title": f"Bench resource {tag}",
+        "short_description": "Created by the load driver",
+        "url": f"https://bench.example.com/{tag}",
+        "platform": "Other",
+        "resource_type": "Course",
+        "level": "Beginner",
+        "skills": ["Python", f"Bench {tag[:4]}"],
+        "default_funding_type": "gift_code",
+    }
+
+
+def _multipart(filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/x-ndjson\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+# name -> builder(samples, rng, i). Covers every route in app.api.routes plus /health.
+RouteBuilder = Callable[[Samples, random.Random, int], Request]
+
+
+def _json(method: str, path: str, payload: Dict) -> Request:
+    return Request(method, path, body=json.dumps(payload).encode(), content_type="application/json")
+
+
+def _import_request(s: Samples, r: random.Random, i: int) -> Request:
+    run = uuid.uuid4().hex
+    lines = "\n".join(json.dumps(_new_resource(f"import-{run}-{n}")) for n in range(20))
+    body, content_type = _multipart("bench.ndjson", lines.encode())
+    return Request("POST", "/api/resources/import", body=body, content_type=content_type)
+
+
+def _create_track_request(s: Samples, r: random.Random, i: int) -> Request:
+    members = r.sample(s.resource_ids, min(8, len(s.resource_ids)))
+    return _json("POST", "/api/tracks/", {
+        "title": f"Bench track {uuid.uuid4().hex}",
+        "short_description": "Created by the load driver",
+        "level": "Beginner",
+        "skills": r.sample(s.skills, min(2, len(s.skills))),
+        "resources": [
+            {"kind": "existing", "resource_id": rid, "position": n} for n, rid in enumerate(members, start=1)
+        ] + [{"kind": "new", "resource": _new_resource(uuid.uuid4().hex), "position": len(members) + 1}],
+    })
+
+
+ROUTES: Dict[str, RouteBuilder] = {
+    "GET /health": lambda s, r, i: Request("GET", "/health"),
+    "GET /api/resources/": lambda s, r, i: Request("GET", "/api/resources/", [("page", str(1 + i % 5))]),
+    "GET /api/resources/?search": lambda s, r, i: Request(
+        "GET", "/api/resources/", [("search", r.choice(s.words)), ("highlight", "true")]),
+    "GET /api/resources/?skill": lambda s, r, i: Request("GET", "/api/resources/", [("skill", r.choice(s.skills))]),
+    "GET /api/resources/?cursor": lambda s, r, i: Request(
+        "GET", "/api/resources/", [("cursor", ""), ("count", "none"), ("level", "Beginner")]),
+    "GET /api/resources/export": lambda s, r, i: Request(
+        "GET", "/api/resources/export", [("format", "ndjson" if i % 2 else "csv"), ("skill", r.choice(s.skills))]),
+    "GET /api/resources/facets": lambda s, r, i: Request(
+        "GET", "/api/resources/facets", [("search", r.choice(s.words))] if i % 2 else [("skill", r.choice(s.skills))]),
+    "GET /api/resources/lookup": lambda s, r, i: Request("GET", "/api/resources/lookup", [("url", r.choice(s.urls))]),
+    "GET /api/resources/{id}": lambda s, r, i: Request("GET", f"/api/resources/{r.choice(s.resource_ids)}"),
+    "POST /api/resources/": lambda s, r, i: _json("POST", "/api/resources/", _new_resource(uuid.uuid4().hex)),
+    "POST /api/resources/import": _import_request,
+    "PATCH /api/resources/{id}": lambda s, r, i: _json(
+        "PATCH", f"/api/resources/{r.choice(s.resource_ids)}", {"title": f"Renamed {i}"}),
+    "GET /api/skills/": lambda s, r, i: Request("GET", "/api/skills/", [("query", r.choice(s.words)[:1 + i % 4])]),
+    "GET /api/tracks/": lambda s, r, i: Request("GET", "/api/tracks/", [("page", str(1 + i % 5))]),
+    "GET /api/tracks/?search": lambda s, r, i: Request("GET", "/api/tracks/", [("search", r.choice(s.words))]),
+    "GET /api/tracks/export": lambda s, r, i: Request("GET", "/api/tracks/export", [("level", "Advanced")]),
+    "GET /api/tracks/facets": lambda s, r, i: Request("GET", "/api/tracks/facets", [("search", r.choice(s.words))]),
+    "GET /api/tracks/names": lambda s, r, i: Request("GET", "/api/tracks/names"),
+    "GET /api/tracks/{id}": lambda s, r, i: Request("GET", f"/api/tracks/{r.choice(s.track_ids)}"),
+    "GET /api/tracks/{id}/details": lambda s, r, i: Request("GET", f"/api/tracks/{r.choice(s.track_ids)}/details"),
+    "POST /api/tracks/": _create_track_request,
+    "PATCH /api/tracks/{id}": lambda s, r, i: _json(
+        "PATCH", f"/api/tracks/{r.choice(s.track_ids)}", {"title": f"Renamed {i}", "level": "Advanced"}),
+}
+
+# Expensive routes get fewer iterations so a full run stays in minutes
+HEAVY_ROUTES = {"GET /api/resources/export", "GET /api/tracks/export", "POST /api/resources/import", "GET /api/tracks/names"}
+
+# Read-heavy traffic shape used for whole-app comparisons (weights sum to 100)
+MIXED_READS: Dict[str, int] = {
+    "GET /api/resources/": 20,
+    "GET /api/resources/?search": 15,
+    "GET /api/resources/?skill": 10,
+    "GET /api/resources/{id}": 20,
+    "GET /api/resources/lookup": 5,
+    "GET /api/skills/": 10,
+    "GET /api/tracks/": 5,
+    "GET /api/tracks/{id}": 5,
+    "GET /api/tracks/{id}/details": 10,
+}
+
+# Same reads plus a steady trickle of writes (lock contention, commit cost)
+MIXED_READ_WRITE: Dict[str, int] = {
+    **MIXED_READS,
+    "POST /api/resources/": 5,
+    "PATCH /api/resources/{id}": 5,
+}
+
+
+# Spike of expensive searches and details over cheap routes, for admission control
+SEARCH_SPIKE: Dict[str, int] = {
+    "GET /api/resources/?search": 30,
+    "GET /api/tracks/?search": 10,
+    "GET /api/tracks/{id}/details": 20,
+    "GET /health": 20,
+    "GET /api/skills/": 20,
+}
+
+# Listings whose statement count must not grow with the page size (batched skill hydration)
+PAGED_LISTINGS = [
+    "GET /api/resources/",
+    "GET /api/resources/?skill",
+    "GET /api/resources/?cursor",
+    "GET /api/tracks/",
+    "GET /api/tracks/?search",
+]
+
+_QUERY_COUNT_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+async def _drive(client: ASGIClient, requests: List[Tuple[str, Request]], concurrency: int) -> Dict:
+    durations: Dict[str, List[float]] = {}
+    statuses: Dict[str, Dict[str, int]] = {}
+    queue = iter(requests)
+
+    async def worker():
+        for name, request in queue:
+            started = time.perf_counter()
+            status, _ = await client.send(request)
+            durations.setdefault(name, []).append(time.perf_counter() - started)
+            counts = statuses.setdefault(name, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    everything = [d for values in durations.values() for d in values]
+    return {
+        "total": summarize(everything, elapsed),
+        "routes": {
+            name: {**summarize(values, elapsed), "status": statuses[name]} for name, values in sorted(durations.items())
+        },
+    }
+
+
+async def _with_app(app, body):
+    # The app's own lifespan: tables, skill index, track documents
+    async with app.router.lifespan_context(app):
+        return await body(ASGIClient(app))
+
+
+def run_routes(app, samples: Samples, iterations: int, concurrency: int = 1,
+               routes: Optional[List[str]] = None, seed: int = 1) -> Dict:
+    """Hit each route `iterations` times in turn; per-route latency and req/s."""
+    rng = random.Random(seed)
+
+    async def body(client):
+        results = {}
+        for name in routes or list(ROUTES):
+            count = max(2, iterations // 10) if name in HEAVY_ROUTES else iterations
+            warmup = [(name, ROUTES[name](samples, rng, count + i)) for i in range(3)]
+            batch = [(name, ROUTES[name](samples, rng, i)) for i in range(count)]
+            await _drive(client, warmup, 1)  # warm caches and pools
+            result = await _drive(client, batch, concurrency)
+            results[name] = {**result["total"], "status": result["routes"][name]["status"]}
+        return results
+
+    return asyncio.run(_with_app(app, body))
+
+
+def run_query_counts(app, samples: Samples, page_sizes: Sequence[int] = (10, 100), seed: int = 1) -> Dict:
+    """
+    Statements per request for each paged listing at each page size, read
+    from the SQL profiler's Server-Timing entry (after one warm-up request
+    per size, so cached counts do not skew it). Raises if any listing's
+    count differs between page sizes.
+    """
+    async def body(client):
+        results, grown = {}, []
+        for name in PAGED_LISTINGS:
+            request = ROUTES[name](samples, random.Random(seed), 0)
+            result = {}
+            for size in page_sizes:
+                sized = replace(request, query=[*request.query, ("page_size", str(size))])
+                await client.send(sized)
+                status, headers, payload = await client.fetch(sized)
+                match = _QUERY_COUNT_RE.search(headers.get("server-timing", ""))
+                if status != 200 or not match:
+                    raise RuntimeError(f"{name} page_size={size}: status {status}, no SQL profile")
+                result[f"queries_page_{size}"] = int(match.group(1))
+                result[f"items_page_{size}"] = len(json.loads(payload)["items"])
+            if len({result[f"queries_page_{size}"] for size in page_sizes}) > 1:
+                grown.append(name)
+            results[name] = result
+        if grown:
+            raise RuntimeError(f"query count grows with page size: {', '.join(grown)} ({results})")
+        return results
+
+    return asyncio.run(_with_app(app, body))
+
+
+def run_mix(app, samples: Samples, total_requests: int, concurrency: int,
+            mix: Optional[Dict[str, int]] = None, seed: int = 1) -> Dict:
+    """Send a weighted mix of routes with `concurrency` clients; overall and per-route stats."""
+    mix = mix or MIXED_READS
+    rng = random.Random(seed)
+    names = rng.choices(list(mix), weights=list(mix.values()), k=total_requests)
+    batch = [(name, ROUTES[name](samples, rng, i)) for i, name in enumerate(names)]
+
+    warmup = [(name, ROUTES[name](samples, rng, total_requests + i)) for i, name in enumerate(names[:concurrency])]
+
+    async def body(client):
+        await _drive(client, warmup, concurrency)
+        return await _drive(client, batch, concurrency)
+
+    return asyncio.run(_with_app(app, body))
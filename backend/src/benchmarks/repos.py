@@ -0,0 +1,174 @@
+"""Microbenchmarks for the repository layer.
+
+Each case gets a fresh Session per call. Writes that accept `commit=False`
+run inside a transaction that is rolled back; `update` functions always
+commit, which is harmless because every run works on a throwaway copy of
+the dataset.
+"""
+
+import random
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.load import Samples
+from benchmarks.stats import time_calls
+
+
+def _cases(samples: Samples) -> Dict[str, Callable]:
+    from sqlmodel import Session
+    from app.core.db import engine
+    from app.models.resource import LearningResource
+    from app.models.track import LearningTrack
+    from app.repositories import (
+        count_repository, facet_repository, resource_repository, resource_skill_repository, search_repository,
+        skill_repository, track_document_repository, track_repository, track_resource_repository,
+        track_skill_repository,
+    )
+    from app.services.track_document_service import DOCUMENT_SCHEMA_VERSION
+    from app.utils.normalizers import normalize_url
+
+    rng = random.Random(3)
+    resource_ids = [uuid.UUID(r) for r in samples.resource_ids]
+    track_ids = [uuid.UUID(t) for t in samples.track_ids]
+    normalized = [normalize_url(u) for u in samples.urls]
+    match = search_repository.build_match_query
+
+    def read(fn):
+        def call(i):
+            with Session(engine) as session:
+                return fn(session, i)
+        return call
+
+    def rolled_back(fn):
+        def call(i):
+            with Session(engine) as session:
+                fn(session, i)
+                session.rollback()
+        return call
+
+    def uncached(fn):
+        # Listing totals are cached per filter signature; measure the COUNT itself
+        def call(session, i):
+            count_repository.count_cache.clear()
+            return fn(session, i)
+        return call
+
+    def uncached_facets(fn):
+        def call(session, i):
+            facet_repository.facet_cache.clear()
+            return fn(session, i)
+        return call
+
+    def new_resource(i) -> LearningResource:
+        return LearningResource(
+            title=f"Bench {i}", short_description="bench", url=f"https://bench.example.com/{uuid.uuid4().hex}",
+            platform="Other", resource_type="Course", image_url="", default_funding_type="gift_code",
+            created_by_user_id="bench",
+        )
+
+    def new_track(i) -> LearningTrack:
+        return LearningTrack(title=f"Bench {i}", short_description="bench", image_url="", created_by_user_id="bench")
+
+    def update_resource(session, i):
+        resource = resource_repository.get_by_id(rng.choice(resource_ids), session)
+        resource.title = f"{resource.title.split(' #')[0]} #{i}"
+        resource_repository.update(resource, session)
+
+    def update_track(session, i):
+        track = track_repository.get_by_id(rng.choice(track_ids), session)
+        track.short_description = f"{track.short_description.split(' #')[0]} #{i}"
+        track_repository.update(track, session)
+
+    return {
+        # resources
+        "resource.create": rolled_back(lambda s, i: resource_repository.create(new_resource(i), s, commit=False)),
+        "resource.bulk_insert[100]": rolled_back(lambda s, i: resource_repository.bulk_insert(
+            [new_resource(i).model_dump() for _ in range(100)], s)),
+        "resource.get_by_id": read(lambda s, i: resource_repository.get_by_id(rng.choice(resource_ids), s)),
+        "resource.get_by_ids[50]": read(lambda s, i: resource_repository.get_by_ids(rng.sample(resource_ids, 50), s)),
+        "resource.get_by_normalized_url": read(lambda s, i: resource_repository.get_by_normalized_url(rng.choice(normalized), s)),
+        "resource.get_ids_by_normalized_urls[500]": read(lambda s, i: resource_repository.get_ids_by_normalized_urls(
+            rng.sample(normalized, min(500, len(normalized))), s)),
+        "resource.list_filtered": read(uncached(lambda s, i: resource_repository.list_filtered(s, page=1 + i % 10))),
+        "resource.list_filtered[search]": read(uncached(lambda s, i: resource_repository.list_filtered(
+            s, search=rng.choice(samples.words)))),
+        "resource.list_filtered[skill]": read(uncached(lambda s, i: resource_repository.list_filtered(
+            s, skill=[rng.choice(samples.skills)]))),
+        "resource.list_filtered[count=none]": read(lambda s, i: resource_repository.list_filtered(
+            s, level=["Beginner"], page=1 + i % 10, count=count_repository.NONE)),
+        "resource.list_filtered_keyset": read(lambda s, i: resource_repository.list_filtered_keyset(
+            s, level=["Beginner"], count=count_repository.NONE)),
+        "resource.iter_filtered[skill]": read(lambda s, i: sum(1 for _ in resource_repository.iter_filtered(
+            s, skill=[rng.choice(samples.skills)]))),
+        "resource.facet_counts": read(uncached_facets(lambda s, i: resource_repository.facet_counts(s))),
+        "resource.facet_counts[search]": read(uncached_facets(lambda s, i: resource_repository.facet_counts(
+            s, search=rng.choice(samples.words)))),
+        "resource.update": read(update_resource),
+        # resource skills
+        "resource_skill.list_skills_for_resource": read(lambda s, i: resource_skill_repository.list_skills_for_resource(
+            s, rng.choice(resource_ids))),
+        "resource_skill.list_skills_for_resources[50]": read(lambda s, i: resource_skill_repository.list_skills_for_resources(
+            s, rng.sample(resource_ids, 50))),
+        "resource_skill.replace_resources_skills[1]": rolled_back(lambda s, i: resource_skill_repository.replace_resources_skills(
+            s, {resource_ids[i % len(resource_ids)]: skill_repository.upsert_skills_by_names(s, samples.skills[:3])})),
+        "resource_skill.replace_resources_skills[50_unchanged]": rolled_back(lambda s, i: resource_skill_repository.replace_resources_skills(
+            s, resource_skill_repository.list_skill_ids_for_resources(s, rng.sample(resource_ids, 50)))),
+        "resource_skill.replace_resources_skills[50_changed]": rolled_back(lambda s, i: resource_skill_repository.replace_resources_skills(
+            s, {rid: [*sids][1:] for rid, sids in resource_skill_repository.list_skill_ids_for_resources(
+                s, rng.sample(resource_ids, 50)).items()})),
+        # skills
+        "skill.search_skills": read(lambda s, i: skill_repository.search_skills(s, rng.choice(samples.words)[:1 + i % 4])),
+        "skill.upsert_skills_by_names[existing]": rolled_back(lambda s, i: skill_repository.upsert_skills_by_names(
+            s, rng.sample(samples.skills, min(5, len(samples.skills))))),
+        "skill.upsert_skills_by_names[new]": rolled_back(lambda s, i: skill_repository.upsert_skills_by_names(
+            s, [f"Bench skill {uuid.uuid4().hex}" for _ in range(5)])),
+        # search
+        "search.get_snippets": read(lambda s, i: search_repository.get_snippets(
+            s, "learning_resources", match(rng.choice(samples.words)), rng.sample(resource_ids, 12))),
+        # tracks
+        "track.create": rolled_back(lambda s, i: track_repository.create(new_track(i), s, commit=False)),
+        "track.get_by_id": read(lambda s, i: track_repository.get_by_id(rng.choice(track_ids), s)),
+        "track.get_by_id_with_details": read(lambda s, i: track_repository.get_by_id_with_details(rng.choice(track_ids), s)),
+        "track.list_tracks_names": read(lambda s, i: track_repository.list_tracks_names(s)),
+        "track.list_filtered": read(uncached(lambda s, i: track_repository.list_filtered(s, page=1 + i % 10))),
+        "track.list_filtered[search]": read(uncached(lambda s, i: track_repository.list_filtered(
+            s, search=rng.choice(samples.words)))),
+        "track.list_filtered_keyset": read(lambda s, i: track_repository.list_filtered_keyset(
+            s, level=["Advanced"], count=count_repository.NONE)),
+        "track.facet_counts[search]": read(uncached_facets(lambda s, i: track_repository.facet_counts(
+            s, search=rng.choice(samples.words)))),
+        "track.update": read(update_track),
+        # track resources
+        "track_resource.get_track_resources": read(lambda s, i: track_resource_repository.get_track_resources(
+            s, rng.choice(track_ids))),
+        "track_resource.get_tracks_for_resource": read(lambda s, i: track_resource_repository.get_tracks_for_resource(
+            s, rng.choice(resource_ids))),
+        "track_resource.get_track_ids_for_resources[50]": read(lambda s, i: track_resource_repository.get_track_ids_for_resources(
+            s, rng.sample(resource_ids, 50))),
+        "track_resource.clear_and_add": rolled_back(lambda s, i: (
+            track_resource_repository.clear_track_resources(s, track_ids[i % len(track_ids)], commit=False),
+            [track_resource_repository.add_resource_to_track(s, track_ids[i % len(track_ids)], rid, n, commit=False)
+             for n, rid in enumerate(resource_ids[i:i + 10], start=1)],
+        )),
+        # track skills
+        "track_skill.list_skills_for_track": read(lambda s, i: track_skill_repository.list_skills_for_track(
+            s, rng.choice(track_ids))),
+        "track_skill.list_skills_for_tracks[50]": read(lambda s, i: track_skill_repository.list_skills_for_tracks(
+            s, rng.sample(track_ids, min(50, len(track_ids))))),
+        # track documents
+        "track_document.get_document": read(lambda s, i: track_document_repository.get_document(
+            s, rng.choice(track_ids), DOCUMENT_SCHEMA_VERSION)),
+        "track_document.list_stale_track_ids": read(lambda s, i: track_document_repository.list_stale_track_ids(
+            s, DOCUMENT_SCHEMA_VERSION)),
+    }
+
+
+def run(samples: Samples, iterations: int, only: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """Time every repository case (or those whose name starts with one of `only`)."""
+    results = {}
+    for name, call in _cases(samples).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        heavy = "iter_filtered" in name or "list_tracks_names" in name or "list_stale" in name
+        results[name] = time_calls(call, max(3, iterations // 10) if heavy else iterations)
+    return results
@@ -0,0 +1,641 @@
+"""Focused benchmarks that do not fit the route or repository sweeps.
+
+- import_throughput: NDJSON bulk import rows/s, including in-file and DB duplicates
+- url_normalization: canonicalization over a realistic URL corpus, cold and memoized
+- id_storage: 16-byte BLOB ids vs 32-character hex TEXT ids (size and join latency)
+- serialization: a resource listing page through pydantic models vs plain rows
+- track_reorder: diff-based track resource updates vs clear-and-rewrite on long tracks
+- coherence: stale reads in one app process after writes made through another
+- skill_upserts: resource creation with 10 skills each (skill name -> id cache)
+- enrichment: provider-metadata worker pool against local stub provider servers
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import sqlite3
+import time
+import uuid
+from typing import Dict, List
+
+from benchmarks.datagen import PLATFORM_HOSTS, TECHNOLOGIES
+from benchmarks.stats import time_calls
+
+
+def import_throughput(db_path: str, lines: int, batch_size: int, duplicate_ratio: float = 0.1) -> Dict:
+    """Import `lines` generated NDJSON rows, some of which repeat earlier or existing URLs."""
+    from sqlmodel import Session
+    from app.core.db import create_db_and_tables, engine
+    from app.services import resource_import_service
+
+    create_db_and_tables()
+    rng = random.Random(11)
+    connection = sqlite3.connect(db_path)
+    existing = [r[0] for r in connection.execute("SELECT url FROM learning_resources LIMIT 1000")]
+    connection.close()
+
+    run = uuid.uuid4().hex[:8]
+    payload: List[str] = []
+    for i in range(lines):
+        if existing and rng.random() < duplicate_ratio:
+            url = rng.choice(existing)
+        else:
+            url = f"https://{rng.choice(list(PLATFORM_HOSTS.values()))}/course/import-{run}-{i}?utm_medium=feed"
+        payload.append(json.dumps({
+            "title": f"Imported {rng.choice(TECHNOLOGIES)} course {i}",
+            "short_description": "Bulk imported",
+            "url": url,
+            "platform": "Other",
+            "resource_type": "Course",
+            "level": "Intermediate",
+            "skills": rng.sample(TECHNOLOGIES, 3),
+            "default_funding_type": "gift_code",
+        }))
+
+    with Session(engine) as session:
+        started = time.perf_counter()
+        result = resource_import_service.import_resources(payload, session, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "lines": result.lines,
+        "imported": result.imported,
+        "failed": result.failed,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(result.imported / elapsed, 1),
+        "lines_per_s": round(result.lines / elapsed, 1),
+    }
+
+
+def _url_corpus(size: int, distinct: int, seed: int = 5) -> List[str]:
+    rng = random.Random(seed)
+    hosts = ["www.udemy.com", "WWW.Coursera.org", "learn.example.com:443", "youtube.com", "blog.example.org"]
+    params = ["utm_source=newsletter", "couponCode=SPRING24", "ranMID=39197", "trk=feed", "fbclid=abc", "lang=en", "page=2"]
+    urls = []
+    for i in range(distinct):
+        query = "&".join(rng.sample(params, rng.randint(0, 3)))
+        path = "//".join(["course", f"{rng.choice(TECHNOLOGIES).lower()}-{i}"]) + ("/" if i % 3 else "")
+        urls.append(f"{rng.choice(['https://', 'http://', ''])}{rng.choice(hosts)}/{path}{'?' + query if query else ''}#intro")
+    # Real traffic repeats itself: the same URL is looked up, then created, then imported
+    return [urls[min(int(rng.paretovariate(1.2)) - 1, distinct - 1)] if i % 2 else urls[i % distinct] for i in range(size)]
+
+
+def url_normalization(corpus_size: int, distinct: int) -> Dict:
+    """Per-URL cost of normalize_url cold (cache cleared), warm, and normalize_many on the corpus."""
+    from app.utils import normalizers
+
+    corpus = _url_corpus(corpus_size, distinct)
+
+    def cold(i):
+        normalizers._normalize.cache_clear()
+        normalizers.normalize_url(corpus[i % len(corpus)])
+
+    def whole_corpus(fn):
+        normalizers._normalize.cache_clear()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        return {"elapsed_ms": round(elapsed * 1000, 3), "urls_per_s": round(len(corpus) / elapsed, 1)}
+
+    results = {
+        "cold": time_calls(cold, min(5000, corpus_size)),
+        "corpus_normalize_url": whole_corpus(lambda: [normalizers.normalize_url(u) for u in corpus]),
+        "corpus_normalize_many": whole_corpus(lambda: normalizers.normalize_many(corpus)),
+    }
+    results["warm"] = time_calls(lambda i: normalizers.normalize_url(corpus[i % len(corpus)]), min(5000, corpus_size))
+    results["cache"] = normalizers._normalize.cache_info()._asdict()
+    return results
+
+
+_ID_LAYOUT = """
+CREATE TABLE {p}_resources (id {t} PRIMARY KEY, title TEXT NOT NULL);
+CREATE TABLE {p}_skills (id {t} PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE {p}_resource_skills (resource_id {t} NOT NULL, skill_id {t} NOT NULL, PRIMARY KEY (resource_id, skill_id));
+CREATE INDEX {p}_resource_skills_skill_id ON {p}_resource_skills (skill_id);
+"""
+
+
+def _table_bytes(connection: sqlite3.Connection, prefix: str) -> Dict[str, int]:
+    sizes = dict(connection.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    tables = sum(sizes[f"{prefix}_{t}"] for t in ("resources", "skills", "resource_skills"))
+    indexes = sum(b for n, b in sizes.items() if n.startswith(f"sqlite_autoindex_{prefix}_") or n == f"{prefix}_resource_skills_skill_id")
+    return {"table_bytes": tables, "index_bytes": indexes, "total_bytes": tables + indexes}
+
+
+def id_storage(db_path: str, iterations: int) -> Dict:
+    """
+    Copy resources, skills and resource_skills into identical BLOB-id and TEXT-id
+    layouts, then compare their on-disk size and the latency of the joins the
+    listing and detail routes run.
+    """
+    connection = sqlite3.connect(db_path)
+    connection.create_function("hex_id", 1, lambda b: uuid.UUID(bytes=b).hex, deterministic=True)
+    for prefix, column_type, convert in (("bench_blob", "BLOB", "{}"), ("bench_text", "TEXT", "hex_id({})")):
+        connection.executescript(_ID_LAYOUT.format(p=prefix, t=column_type))
+        connection.execute(f"INSERT INTO {prefix}_resources SELECT {convert.format('id')}, title FROM learning_resources")
+        connection.execute(f"INSERT INTO {prefix}_skills SELECT {convert.format('id')}, name FROM skills")
+        connection.execute(
+            f"INSERT INTO {prefix}_resource_skills "
+            f"SELECT {convert.format('resource_id')}, {convert.format('skill_id')} FROM resource_skills"
+        )
+    connection.commit()
+    connection.execute("ANALYZE")
+
+    rng = random.Random(9)
+    skill_names = [r[0] for r in connection.execute(
+        "SELECT s.name FROM skills s JOIN resource_skills rs ON rs.skill_id = s.id GROUP BY s.id ORDER BY count(*) DESC LIMIT 20"
+    )]
+    blob_ids = [r[0] for r in connection.execute("SELECT id FROM learning_resources ORDER BY random() LIMIT 5000")]
+
+    results = {}
+    for prefix, to_param in (("bench_blob", lambda b: b), ("bench_text", lambda b: uuid.UUID(bytes=b).hex)):
+        by_skill = (
+            f"SELECT r.id, r.title FROM {prefix}_resources r "
+            f"JOIN {prefix}_resource_skills rs ON rs.resource_id = r.id "
+            f"JOIN {prefix}_skills s ON s.id = rs.skill_id WHERE s.name = ?"
+        )
+        skills_for_page = (
+            f"SELECT rs.resource_id, s.name FROM {prefix}_resource_skills rs "
+            f"JOIN {prefix}_skills s ON s.id = rs.skill_id WHERE rs.resource_id IN ({','.join('?' * 50)})"
+        )
+        results[prefix.removeprefix("bench_")] = {
+            **_table_bytes(connection, prefix),
+            "join_by_skill": time_calls(
+                lambda i: connection.execute(by_skill, (skill_names[i % len(skill_names)],)).fetchall(), iterations),
+            "skills_for_50_resources": time_calls(
+                lambda i: connection.execute(skills_for_page, [to_param(b) for b in rng.sample(blob_ids, 50)]).fetchall(),
+                iterations),
+        }
+
+    connection.close()
+    return results
+
+
+def serialization(db_path: str, iterations: int, page_size: int = 100) -> Dict:
+    """
+    Cost of turning one listing page into JSON bytes, before and after the
+    row fast path. `model_path` is what the route used to do: ORM objects,
+    ResourceRead.model_validate per row, then FastAPI's response_model
+    validation and JSON encoding. `row_path` builds dicts from column tuples
+    and serializes them with the precompiled adapter. `*_serialize_only`
+    excludes the query.
+    """
+    from pydantic import TypeAdapter
+    from sqlmodel import Session
+    from app.core.db import engine
+    from app.repositories import count_repository, resource_repository
+    from app.schemas.resource import ResourceRead
+    from app.schemas.resource_list import ResourceListResponse, resource_list_adapter
+    from app.services import resource_service, skill_loader
+
+    # What FastAPI does with a response_model: validate the return value, dump in JSON mode, json.dumps
+    response_field = TypeAdapter(ResourceListResponse)
+    connection = sqlite3.connect(db_path)
+    pages = connection.execute("SELECT count(*) FROM learning_resources").fetchone()[0] // page_size
+    connection.close()
+
+    def model_page(session, page):
+        resources, total = resource_repository.list_filtered(
+            session, page=page, page_size=page_size, count=count_repository.NONE)
+        skills = skill_loader.resource_skills(session).load_many(r.id for r in resources)
+        return resources, skills
+
+    def model_serialize(resources, skills) -> bytes:
+        items = []
+        for r in resources:
+            read = ResourceRead.model_validate(r)
+            read.skills = skills[r.id]
+            items.append(read)
+        response = ResourceListResponse(items=items, total=None, page=1, page_size=page_size)
+        content = response_field.dump_python(response_field.validate_python(response), mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def row_page(session, page):
+        resources, _ = resource_service.list_resources(
+            session, page=page, page_size=page_size, count=count_repository.NONE)
+        return resources
+
+    def row_serialize(rows) -> bytes:
+        return resource_list_adapter.dump_json({
+            "items": rows, "total": None, "page": 1, "page_size": page_size,
+            "total_pages": None, "next_cursor": None, "prev_cursor": None,
+        })
+
+    def page_of(i):
+        return 1 + i % max(pages, 1)
+
+    def timed(build):
+        def call(i):
+            with Session(engine) as session:
+                build(session, page_of(i))
+        return call
+
+    # Pre-fetched pages for the serialization-only timings
+    with Session(engine) as session:
+        model_pages = [model_page(session, page_of(i)) for i in range(min(iterations, pages))]
+        row_pages = [row_page(session, page_of(i)) for i in range(min(iterations, pages))]
+
+        assert json.loads(model_serialize(*model_pages[0])) == json.loads(row_serialize(row_pages[0]))
+
+    return {
+        "page_size": page_size,
+        "model_path": time_calls(timed(lambda s, page: model_serialize(*model_page(s, page))), iterations),
+        "row_path": time_calls(timed(lambda s, page: row_serialize(row_page(s, page))), iterations),
+        "model_serialize_only": time_calls(lambda i: model_serialize(*model_pages[i % len(model_pages)]), iterations),
+        "row_serialize_only": time_calls(lambda i: row_serialize(row_pages[i % len(row_pages)]), iterations),
+    }
+
+
+def track_reorder(db_path: str, iterations: int, track_length: int = 500) -> Dict:
+    """
+    Rewrite the resource list of a `track_length`-resource track. Each edit
+    runs through the diff (`diff`) and through clear-and-reinsert (`rewrite`)
+    in a rolled-back transaction; `*_rows` counts the track_resources rows
+    written per edit.
+    """
+    from sqlalchemy import event
+    from sqlmodel import Session
+    from app.core.db import engine
+    from app.models.track import LearningTrack
+    from app.repositories import track_repository, track_resource_repository
+    from app.schemas.track import ExistingResourceRef
+    from app.services import track_service
+    from app.utils.ordering import plan_reorder, spaced_positions
+
+    connection = sqlite3.connect(db_path)
+    resource_ids = [uuid.UUID(bytes=r[0]) for r in connection.execute(
+        "SELECT id FROM learning_resources ORDER BY random() LIMIT ?", (track_length + 50,))]
+    connection.close()
+    members, spare = resource_ids[:track_length], resource_ids[track_length:]
+
+    with Session(engine) as session:
+        track = track_repository.create(
+            LearningTrack(title="Reorder bench", short_description="", level="Beginner", image_url="", created_by_user_id="bench"),
+            session, commit=False)
+        track_id = track.id
+        track_resource_repository.add_resources_to_track(
+            session, track_id, dict(zip(members, spaced_positions(track_length))), commit=False)
+        session.commit()
+
+    rng = random.Random(21)
+
+    def move_one(order):
+        order = list(order)
+        order.insert(rng.randrange(len(order)), order.pop(rng.randrange(len(order))))
+        return order
+
+    def insert_one(order):
+        i = rng.randrange(len(order))
+        return order[:i] + [rng.choice(spare)] + order[i:]
+
+    def remove_one(order):
+        i = rng.randrange(len(order))
+        return order[:i] + order[i + 1:]
+
+    edits = {
+        "unchanged": list,
+        "move_one": move_one,
+        "insert_one": insert_one,
+        "remove_one": remove_one,
+        "swap_ends": lambda order: [order[-1], *order[1:-1], order[0]],
+        "reverse": lambda order: order[::-1],
+    }
+
+    rows = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(("INSERT INTO track_resources", "UPDATE track_resources", "DELETE FROM track_resources")):
+            rows.append(len(parameters) if executemany else 1)
+
+    def diff(session, order):
+        items = [ExistingResourceRef(resource_id=str(rid), position=p) for p, rid in enumerate(order)]
+        track_service._update_track_resources(session, track_id, items, "bench")
+
+    def rewrite(session, order):
+        track_resource_repository.clear_track_resources(session, track_id, commit=False)
+        track_resource_repository.add_resources_to_track(
+            session, track_id, dict(zip(order, spaced_positions(len(order)))), commit=False)
+
+    def timed(apply, edit):
+        def call(i):
+            with Session(engine) as session:
+                order = [rid for rid, _ in track_resource_repository.get_track_resources(session, track_id)]
+                apply(session, edit(order))
+                session.flush()
+                session.rollback()
+        return call
+
+    results = {"track_length": track_length}
+    try:
+        for name, edit in edits.items():
+            for variant, apply in (("diff", diff), ("rewrite", rewrite)):
+                rows.clear()
+                timing = time_calls(timed(apply, edit), iterations)
+                results.setdefault(name, {})[variant] = timing
+                results[name][f"{variant}_rows"] = round(sum(rows) / (iterations + 3), 1)  # time_calls warms up 3 times
+    finally:
+        event.remove(engine, "before_cursor_execute", count_rows)
+
+    current = list(zip(members, spaced_positions(track_length)))
+    results["plan_move_one"] = time_calls(lambda i: plan_reorder(current, move_one(members)), iterations)
+    return results
+
+
+def _coherence_peer(db_path: str, connection) -> None:
+    """One app process: serve requests received over `connection` until sent None."""
+    from benchmarks import env
+    env.configure(db_path)
+    from app.core import catalog_version
+    from app.main import app
+    from benchmarks.load import ASGIClient
+
+    async def serve():
+        async with app.router.lifespan_context(app):
+            client = ASGIClient(app)
+            connection.send("ready")
+            while (request := connection.recv()) is not None:
+                if request == "sync":
+                    connection.send(time_calls(lambda i: catalog_version.sync(), 2000))
+                    continue
+                status, headers, body = await client.fetch(request)
+                connection.send((status, headers.get("etag"), json.loads(body) if body else None))
+
+    asyncio.run(serve())
+
+
+def coherence(db_path: str, rounds: int, peers: int = 2) -> Dict:
+    """
+    Run `peers` app processes on one database. Each round the first process
+    writes (resource title, a new resource with a new skill, track title)
+    and every other process is then checked for stale reads: revalidating
+    the resource and track details with their old ETags, the cached listing
+    total and facet counts, and the skill typeahead. `stale` counts reads
+    that still showed the pre-write state (0 when processes stay coherent).
+    """
+    from benchmarks.load import Request, _json, _new_resource
+
+    connection = sqlite3.connect(db_path)
+    resource_ids = [str(uuid.UUID(bytes=r[0])) for r in connection.execute(
+        "SELECT id FROM learning_resources ORDER BY random() LIMIT ?", (rounds,))]
+    track_ids = [str(uuid.UUID(bytes=t[0])) for t in connection.execute(
+        "SELECT id FROM learning_tracks ORDER BY random() LIMIT ?", (rounds,))]
+    connection.close()
+
+    context = multiprocessing.get_context("spawn")
+    pipes, processes = [], []
+    for _ in range(peers):
+        parent, child = context.Pipe()
+        process = context.Process(target=_coherence_peer, args=(db_path, child), daemon=True)
+        process.start()
+        assert parent.recv() == "ready"  # one at a time: startup creates tables and backfills
+        pipes.append(parent)
+        processes.append(process)
+
+    def call(pipe, request: Request):
+        pipe.send(request)
+        return pipe.recv()
+
+    def write(request: Request):
+        status, _, body = call(writer, request)
+        if status >= 300:
+            raise RuntimeError(f"{request.method} {request.path} returned {status}: {body}")
+
+    def revalidate(pipe, path: str, etag: str):
+        return call(pipe, Request("GET", path, headers=[("If-None-Match", etag)]))
+
+    writer, readers = pipes[0], pipes[1:]
+    stale = {"resource": 0, "track_details": 0, "resource_total": 0, "resource_facets": 0, "skill_search": 0}
+    try:
+        for i in range(rounds):
+            tag = f"coherence-{i}-{uuid.uuid4().hex[:6]}"
+            rid, tid = resource_ids[i % len(resource_ids)], track_ids[i % len(track_ids)]
+            resource_path, details_path = f"/api/resources/{rid}", f"/api/tracks/{tid}/details"
+            skill = f"Coherence {tag}"
+
+            before = []
+            for reader in readers:
+                before.append({
+                    "resource": call(reader, Request("GET", resource_path))[1],
+                    "track_details": call(reader, Request("GET", details_path))[1],
+                    "resource_total": call(reader, Request("GET", "/api/resources/", (("page_size", "1"),)))[2]["total"],
+                    "resource_facets": call(reader, Request("GET", "/api/resources/facets"))[2]["total"],
+                })
+                call(reader, Request("GET", "/api/skills/", (("query", skill),)))
+
+            write(_json("PATCH", resource_path, {"title": tag}))
+            write(_json("POST", "/api/resources/", {**_new_resource(tag), "skills": [skill]}))
+            write(_json("PATCH", f"/api/tracks/{tid}", {"title": tag, "level": "Beginner"}))
+
+            for reader, seen in zip(readers, before):
+                status, _, body = revalidate(reader, resource_path, seen["resource"])
+                stale["resource"] += status != 200 or body["title"] != tag
+                status, _, body = revalidate(reader, details_path, seen["track_details"])
+                stale["track_details"] += status != 200 or body["title"] != tag
+                total = call(reader, Request("GET", "/api/resources/", (("page_size", "1"),)))[2]["total"]
+                stale["resource_total"] += total != seen["resource_total"] + 1
+                total = call(reader, Request("GET", "/api/resources/facets"))[2]["total"]
+                stale["resource_facets"] += total != seen["resource_facets"] + 1
+                names = call(reader, Request("GET", "/api/skills/", (("query", skill),)))[2]
+                stale["skill_search"] += skill.lower() not in [name.lower() for name in names]
+
+        sync_idle = call(readers[0], "sync")
+    finally:
+        for pipe in pipes:
+            pipe.send(None)
+        for process in processes:
+            process.join(timeout=30)
+
+    return {
+        "rounds": rounds,
+        "peers": peers,
+        "reads": rounds * (peers - 1) * len(stale),
+        "stale": {**stale, "total": sum(stale.values())},
+        "sync_idle": sync_idle,
+    }
+
+
+def skill_upserts(db_path: str, iterations: int, skills_per_resource: int = 10) -> Dict:
+    """
+    Create resources with `skills_per_resource` skills each through
+    resource_service.create_resource: all existing popular skills
+    (`existing`), or all but one existing and one new (`one_new`).
+    `*_upsert_statements` counts the skill INSERT / id lookup statements per
+    create.
+    """
+    from sqlalchemy import event
+    from sqlmodel import Session
+    from app.core.db import engine
+    from app.schemas.resource import ResourceCreate
+    from app.services import resource_service
+
+    connection = sqlite3.connect(db_path)
+    popular = [r[0] for r in connection.execute(
+        "SELECT s.name FROM skills s JOIN resource_skills rs ON rs.skill_id = s.id "
+        "GROUP BY s.id ORDER BY count(*) DESC LIMIT 50")]
+    connection.close()
+
+    rng = random.Random(17)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(("INSERT OR IGNORE INTO skills ", "SELECT id, name FROM skills WHERE name IN")):
+            statements.append(statement)
+
+    def create(new_skills: int):
+        def call(i):
+            skills = rng.sample(popular, skills_per_resource - new_skills)
+            tag = uuid.uuid4().hex  # time_calls repeats i for its warmup calls
+            skills += [f"Upsert bench {tag} {n}" for n in range(new_skills)]
+            data = ResourceCreate(
+                title=f"Skill upsert bench {i}", short_description="", url=f"https://bench.example.com/skills/{tag}",
+                platform="Other", resource_type="Course", level="Beginner", skills=skills, default_funding_type="gift_code")
+            with Session(engine) as session:
+                resource_service.create_resource(data, session)
+        return call
+
+    results = {"skills_per_resource": skills_per_resource}
+    try:
+        for name, new_skills in (("existing", 0), ("one_new", 1)):
+            statements.clear()
+            results[name] = time_calls(create(new_skills), iterations)
+            results[f"{name}_upsert_statements"] = round(len(statements) / (iterations + 3), 2)  # time_calls warms up 3 times
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statements)
+    return results
+
+
+_STUB_PAGE = """<html><head><title>Course {n} | Stub</title>
+<script type="application/ld+json">{{"@context": "https://schema.org", "@type": "Course", "name": "Stub course {n}",
+"timeRequired": "PT{hours}H", "instructor": {{"@type": "Person", "name": "Instructor {n}"}},
+"aggregateRating": {{"ratingValue": "4.{rating}", "ratingCount": "{n}"}}}}</script></head><body></body></html>"""
+
+
+def _stub_provider(host: str, delay_seconds: float, flaky_every: int):
+    """
+    Threaded HTTP server on `host` serving course pages. Every
+    `flaky_every`-th course answers its first request with 503 + Retry-After.
+    Tracks requests and the peak number of requests in flight.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+    state = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "failed_once": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            n = int(self.path.rsplit("/", 1)[-1])
+            with lock:
+                state["requests"] += 1
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                flaky = n % flaky_every == 0 and n not in state["failed_once"]
+                state["failed_once"].add(n)
+            time.sleep(delay_seconds)
+            with lock:
+                state["in_flight"] -= 1  # before responding: the client only sends its next request after reading this one
+
+            if flaky:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = _STUB_PAGE.format(n=n, hours=n % 40 + 1, rating=n % 10).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def enrichment(db_path: str, resources: int, workers: int, per_host_limit: int,
+               hosts: int = 3, delay_seconds: float = 0.02, flaky_every: int = 5) -> Dict:
+    """
+    Point `resources` rows at stub provider servers on `hosts` loopback
+    addresses (127.0.0.1, 127.0.0.2, ...; Linux routes all of 127/8), then
+    enrich them through enrichment_service.EnrichmentPool with the default
+    urllib fetcher. Reports throughput, retries, the peak concurrency each
+    stub saw (never above `per_host_limit`), write batches and filled rows.
+    The same jobs are then submitted again: `resubmit_fetches` should be 0,
+    every page coming from the normalized_url cache.
+    """
+    servers = [_stub_provider(f"127.0.0.{i + 1}", delay_seconds, flaky_every) for i in range(hosts)]
+    try:
+        connection = sqlite3.connect(db_path)
+        ids = [r[0] for r in connection.execute("SELECT id FROM learning_resources LIMIT ?", (resources,))]
+        jobs = []
+        for n, resource_id in enumerate(ids, start=1):
+            host, port = servers[n % hosts][0].server_address[:2]
+            url = f"http://{host}:{port}/course/{n}"
+            connection.execute(
+                "UPDATE learning_resources SET url = ?, normalized_url = ?, provider_metadata = '{}' WHERE id = ?",
+                (url, url, resource_id))
+            jobs.append((uuid.UUID(bytes=resource_id), url, url))
+        connection.commit()
+
+        from app.services import enrichment_service
+
+        async def run() -> Dict:
+            pool = enrichment_service.EnrichmentPool(
+                enrichment_service.urllib_fetcher(5.0, {s.server_address[0] for s, _ in servers}), workers=workers, per_host_limit=per_host_limit,
+                backoff_seconds=0.05, batch_size=100, flush_interval_seconds=0.2)
+            pool.start()
+            try:
+                started = time.perf_counter()
+                for job in jobs:
+                    await pool.put(job)
+                await pool.drain()
+                elapsed = time.perf_counter() - started
+                fetches = pool.stats.fetches
+                for job in jobs:
+                    await pool.put(job)
+                await pool.drain()
+                return {
+                    "elapsed_s": round(elapsed, 3),
+                    "resources_per_s": round(len(jobs) / elapsed, 1),
+                    "resubmit_fetches": pool.stats.fetches - fetches,
+                    "stats": vars(pool.stats),
+                }
+            finally:
+                await pool.stop()
+
+        result = asyncio.run(run())
+        filled = connection.execute(
+            "SELECT count(*) FROM learning_resources WHERE url LIKE 'http://127.0.0.%' "
+            "AND json_extract(provider_metadata, '$.title') IS NOT NULL").fetchone()[0]
+        connection.close()
+    finally:
+        for server, _ in servers:
+            server.shutdown()
+            server.server_close()
+
+    return {
+        "resources": len(jobs),
+        "workers": workers,
+        "per_host_limit": per_host_limit,
+        **result,
+        "filled": filled,
+        "max_in_flight_per_host": max(state["max_in_flight"] for _, state in servers),
+        "stub_requests": sum(state["requests"] for _, state in servers),
+    }
+
+
+def summarize_mix(result: Dict) -> Dict:
+    """Drop per-route detail from a mixed-load result, keeping totals and status counts."""
+    return {
+        "total": result["total"],
+        "status": {name: route["status"] for name, route in result["routes"].items()},
+        "routes_p99_ms": {name: route["p99_ms"] for name, route in result["routes"].items()},
+    }
+
@@ -0,0 +1,41 @@
+"""Latency summaries."""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """Summarize durations (seconds) as milliseconds; ops/s over `elapsed` wall time if given."""
+    values = sorted(durations)
+    total = elapsed if elapsed is not None else sum(values)
+    return {
+        "n": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 4),
+        "p95_ms": round(percentile(values, 95) * 1000, 4),
+        "p99_ms": round(percentile(values, 99) * 1000, 4),
+        "max_ms": round(values[-1] * 1000, 4) if values else 0.0,
+        "ops_per_s": round(len(values) / total, 1) if total > 0 else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[int], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """Call fn(i) `iterations` times after `warmup` untimed calls and summarize."""
+    for i in range(warmup):
+        fn(i)
+
+    durations = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        durations.append(time.perf_counter() - started)
+    return summarize(durations)
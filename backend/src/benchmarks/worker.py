@@ -0,0 +1,70 @@
+"""Subprocess entry point: run one benchmark task against one database.
+
+    python -m benchmarks.worker '{"task": "routes", "db": "/tmp/x.db", "env": {...}, "params": {...}}'
+
+Prints the task's result as one JSON line on stdout.
+"""
+
+import json
+import sys
+
+from benchmarks import env
+
+
+def _app():
+    from app.main import app
+    return app
+
+
+def run_task(task: str, db: str, params: dict):
+    from benchmarks import datagen, load, repos, scenarios
+
+    if task == "generate":
+        return datagen.generate(datagen.DatasetSpec(**params))
+    if task == "routes":
+        return load.run_routes(_app(), load.Samples.load(db), **params)
+    if task == "mix":
+        return scenarios.summarize_mix(load.run_mix(_app(), load.Samples.load(db), **params))
+    if task == "query_counts":
+        return load.run_query_counts(_app(), load.Samples.load(db), **params)
+    if task == "mix_routes":
+        return load.run_mix(_app(), load.Samples.load(db), **params)
+    if task == "repos":
+        # Same startup as the app (skill index, documents) without serving requests
+        import asyncio
+        app = _app()
+
+        async def startup():
+            async with app.router.lifespan_context(app):
+                pass
+
+        asyncio.run(startup())
+        return repos.run(load.Samples.load(db), **params)
+    if task == "import":
+        return scenarios.import_throughput(db, **params)
+    if task == "urls":
+        return scenarios.url_normalization(**params)
+    if task == "ids":
+        return scenarios.id_storage(db, **params)
+    if task == "serialization":
+        return scenarios.serialization(db, **params)
+    if task == "track_reorder":
+        return scenarios.track_reorder(db, **params)
+    if task == "coherence":
+        return scenarios.coherence(db, **params)
+    if task == "skill_upserts":
+        return scenarios.skill_upserts(db, **params)
+    if task == "enrichment":
+        return scenarios.enrichment(db, **params)
+    raise ValueError(f"Unknown benchmark task: {task}")
+
+
+def main(argv) -> None:
+    job = json.loads(argv[1])
+    env.configure(job["db"], job.get("env"))
+    result = run_task(job["task"], job["db"], job.get("params", {}))
+    sys.stdout.write(json.dumps(result, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv)